@@ -0,0 +1,5 @@
+import os
+
+# Benchmarks are expected to run headless, unless a video driver was explicitly requested
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
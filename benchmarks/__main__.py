@@ -0,0 +1,96 @@
+"""
+Run the benchmark suite and compare the results against a stored baseline.
+
+Each benchmark reports the time of a single call in nanoseconds. Results are saved
+as JSON, if a baseline is present, every benchmark slower than the baseline by more
+than the threshold is reported as a regression and the run fails.
+
+Since timings depend heavily on the machine, baselines aren't shared, create your own
+one with `--save-baseline` before making changes.
+"""
+import json
+import platform
+import re
+import sys
+from pathlib import Path
+
+import pygame
+
+from benchmarks.suite import BENCHMARKS, make_parser, measure
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_OUTPUT = Path("benchmark_results.json")
+
+
+def run(pattern: str, repeat: int, min_time: float) -> dict[str, float]:
+    """Run all benchmarks matching given regex pattern, returning the results in ns per call."""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if not re.search(pattern, name):
+            continue
+        results[name] = measure(setup(), repeat, min_time)
+        print(f"{name:<40} {results[name]:>12.1f} ns")
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Print the comparison with the baseline, returning names of the regressed benchmarks."""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>12} {current:>12.1f} {'new':>8}")
+            continue
+
+        change = current / baseline[name] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<40} {baseline[name]:>12.1f} {current:>12.1f} {change:>+8.1%}{' REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main() -> int:
+    """Run the suite, returning the exit code."""
+    parser = make_parser(__doc__, prog="python -m benchmarks")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks matching this regex")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="where to save the results (JSON)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown against the baseline (0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="amount of repetitions (best one is used)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimal duration of a single repetition (s)")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = run(args.filter, args.repeat, args.min_time)
+    pygame.quit()
+
+    data = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results_ns": results,
+    }
+    args.output.write_text(json.dumps(data, indent=2), encoding="utf8")
+    print(f"\nResults saved to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(data, indent=2), encoding="utf8")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline found at {args.baseline}, use --save-baseline to create one.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf8"))["results_ns"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
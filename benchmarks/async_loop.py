@@ -0,0 +1,140 @@
+"""
+Measure the frame timing of the async game loop under concurrent I/O load.
+
+The game runs on the asyncio event loop for a while, first alone, then with other
+tasks doing I/O at the same time: clients streaming data through a local TCP echo
+server and a task writing save files (in a thread, with `asyncio.to_thread`). The
+blocking game loop is measured too, with the same I/O ran from a thread instead.
+The frame times are compared against the target frame duration.
+
+Run with: `python -m benchmarks.async_loop`
+"""
+import asyncio
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.suite import make_parser
+from src.config import Window
+from src.game import Game
+
+CLIENTS = 8
+PAYLOAD = b"x" * 4096
+
+
+class TimedGame(Game):
+    """Game recording the time of every frame, stopping after given duration."""
+
+    def setup(self) -> None:
+        """Reset the measurements."""
+        self.frame_times: list[float] = []
+        self.end_time = time.perf_counter() + self.duration
+        self._last_frame = time.perf_counter()
+
+    def tick(self) -> None:
+        """Record the time since the last frame."""
+        now = time.perf_counter()
+        self.frame_times.append((now - self._last_frame) * 1000)
+        self._last_frame = now
+        if now >= self.end_time:
+            self.running = False
+
+
+async def echo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Send everything received back to the client."""
+    while data := await reader.read(65536):
+        writer.write(data)
+        await writer.drain()
+    writer.close()
+
+
+async def stream(port: int, stop: asyncio.Event) -> None:
+    """Keep sending data through the echo server, until stopped."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    while not stop.is_set():
+        writer.write(PAYLOAD)
+        await writer.drain()
+        await reader.readexactly(len(PAYLOAD))
+    writer.close()
+
+
+async def save_files(directory: Path, stop: asyncio.Event) -> None:
+    """Keep writing save files in a thread, until stopped."""
+    index = 0
+    while not stop.is_set():
+        await asyncio.to_thread((directory / f"save{index % 10}.bin").write_bytes, PAYLOAD * 64)
+        index += 1
+
+
+async def run_async(duration: float, io_load: bool, directory: Path) -> list[float]:
+    """Run the async game loop (with the I/O tasks running alongside it, if requested)."""
+    game = TimedGame(headless=True)
+    game.duration = duration
+    stop = asyncio.Event()
+    tasks = []
+    if io_load:
+        server = await asyncio.start_server(echo, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        tasks = [asyncio.create_task(stream(port, stop)) for _ in range(CLIENTS)]
+        tasks.append(asyncio.create_task(save_files(directory, stop)))
+
+    await game.start_async(manage_pygame=False)
+    stop.set()
+    await asyncio.gather(*tasks)
+    if io_load:
+        server.close()
+        await server.wait_closed()
+    return game.frame_times[1:]
+
+
+def run_blocking(duration: float, directory: Path) -> list[float]:
+    """Run the blocking game loop, with the same I/O load ran on the event loop in a thread."""
+    game = TimedGame(headless=True)
+    game.duration = duration
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+
+    async def io_load() -> None:
+        server = await asyncio.start_server(echo, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        tasks = [asyncio.create_task(stream(port, stop)) for _ in range(CLIENTS)]
+        tasks.append(asyncio.create_task(save_files(directory, stop)))
+        await asyncio.gather(*tasks)
+        server.close()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(io_load(),))
+    thread.start()
+    game.start(manage_pygame=False)
+    loop.call_soon_threadsafe(stop.set)
+    thread.join()
+    loop.close()
+    return game.frame_times[1:]
+
+
+def describe(name: str, frame_times: list[float]) -> None:
+    """Print the frame time statistics."""
+    target = 1000 / Window.tick_rate
+    quantiles = statistics.quantiles(frame_times, n=100)
+    late = sum(frame_time > target * 1.5 for frame_time in frame_times)
+    print(
+        f"{name:<28} mean {statistics.mean(frame_times):6.2f} ms, stdev {statistics.stdev(frame_times):5.2f} ms, "
+        f"p99 {quantiles[98]:6.2f} ms, {late} late frames (target {target:.2f} ms)"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--duration", type=float, default=5.0, help="Duration of each run (in seconds)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        describe("async, idle", asyncio.run(run_async(args.duration, False, Path(directory))))
+        describe("async, with I/O tasks", asyncio.run(run_async(args.duration, True, Path(directory))))
+        describe("blocking, with I/O thread", run_blocking(args.duration, Path(directory)))
+
+
+if __name__ == "__main__":
+    main()
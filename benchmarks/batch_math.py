@@ -0,0 +1,62 @@
+"""
+Compare the scalar `number_remap` against the batch math functions.
+
+Remaps a whole heightmap-like array of values, with the scalar function called
+for every value, with the batch `remap_array` (using NumPy) and with its pure
+Python fallback (used when NumPy isn't installed). Vector operations are measured
+the same way. Requires NumPy.
+
+Run with: `python -m benchmarks.batch_math`
+"""
+import numpy
+
+import src.util.math
+from benchmarks.suite import make_parser, measure_ms
+from src.util.lazy_numpy import get_numpy
+from src.util.math import distance_matrix, normalize_vectors, number_remap, remap_array, rotate_vectors
+
+
+def run(size: int, points: int, as_lists: bool) -> dict[str, float]:
+    """Measure the batch operations, passing the values as NumPy arrays or as lists (for the fallback)."""
+    rng = numpy.random.default_rng(0)
+    values = rng.random(size) * 10
+    vectors = rng.random((points, 2)) * 100
+    if as_lists:
+        values, vectors = values.tolist(), vectors.tolist()
+
+    return {
+        f"remap {size} values (remap_array)": measure_ms(lambda: remap_array(values, 0, 10, 0, 255)),
+        f"remap {size} values (remap_array, clamp)": measure_ms(lambda: remap_array(values, 0, 10, 0, 255, policy="clamp")),
+        f"normalize {points} vectors": measure_ms(lambda: normalize_vectors(vectors)),
+        f"rotate {points} vectors": measure_ms(lambda: rotate_vectors(vectors, 0.5)),
+        f"distance matrix {points}x{points}": measure_ms(lambda: distance_matrix(vectors)),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--size", type=int, default=100_000, help="Amount of remapped values")
+    parser.add_argument("--points", type=int, default=500, help="Amount of vectors")
+    args = parser.parse_args()
+
+    value_list = (numpy.random.default_rng(0).random(args.size) * 10).tolist()
+    scalar_time = measure_ms(lambda: [number_remap(value, 0, 10, 0, 255) for value in value_list])
+    print(f"{f'remap {args.size} values (number_remap loop)':<48} {scalar_time:>10.3f} ms")
+
+    results = run(args.size, args.points, as_lists=False)
+    for name, milliseconds in results.items():
+        print(f"{name:<48} {milliseconds:>10.3f} ms")
+
+    # Measure the pure Python fallback too, by hiding NumPy from the math module
+    src.util.math.get_numpy = lambda: None
+    try:
+        fallback_results = run(args.size, args.points, as_lists=True)
+    finally:
+        src.util.math.get_numpy = get_numpy
+    for name, milliseconds in fallback_results.items():
+        print(f"{name + ' [fallback]':<48} {milliseconds:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measure allocations and per-pair timings of `RectBody` hitbox and collision checks.
+
+The legacy implementation (building a fresh `pygame.Rect` on every hitbox access)
+is replicated here, so that the improvement can be compared directly.
+
+Run with: `python -m benchmarks.body`
+"""
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import pygame
+
+from benchmarks.suite import BenchBody
+from src.config import Window
+from src.util.body import RectBody
+
+PAIRS = 100_000
+
+
+def legacy_hitbox(body: RectBody) -> pygame.Rect:
+    """Hitbox as it was built before it got cached."""
+    return pygame.Rect(body.x, body.y, body.width, body.height)
+
+
+def legacy_collides(first: RectBody, second: RectBody) -> bool:
+    """Collision check as it was implemented before, reading the hitbox 8 times."""
+    return all([
+        legacy_hitbox(first).left < legacy_hitbox(second).right and legacy_hitbox(first).right > legacy_hitbox(second).left,
+        legacy_hitbox(first).top < legacy_hitbox(second).bottom and legacy_hitbox(first).bottom > legacy_hitbox(second).top,
+    ])
+
+
+def measure_pairs(check: Callable[[RectBody, RectBody], bool], pairs: list[tuple[RectBody, RectBody]]) -> tuple[float, int]:
+    """
+    Get the time per pair (ns) and the peak of traced memory over all pairs.
+
+    Since nothing is retained between the checks, the peak shows how much
+    memory a single check allocates (and frees again) at most.
+    """
+    start = time.perf_counter_ns()
+    for first, second in pairs:
+        check(first, second)
+    per_pair = (time.perf_counter_ns() - start) / len(pairs)
+
+    tracemalloc.start()
+    for first, second in pairs:
+        check(first, second)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_pair, peak
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    rng = random.Random(0)
+    bodies = [BenchBody(rng.uniform(0, Window.width - 20), rng.uniform(0, Window.height - 20), 20, 20) for _ in range(1000)]
+    pairs = [(rng.choice(bodies), rng.choice(bodies)) for _ in range(PAIRS)]
+
+    checks = {
+        "legacy collides": legacy_collides,
+        "RectBody.collides": RectBody.collides,
+        "hitbox.colliderect": lambda first, second: first.hitbox.colliderect(second.hitbox),
+    }
+    print(f"{'check':>24} | {'ns / pair':>10} | {'peak traced (B)':>15}")
+    for name, check in checks.items():
+        per_pair, peak = measure_pairs(check, pairs)
+        print(f"{name:>24} | {per_pair:>10.1f} | {peak:>15}")
+
+    print()
+    body, others = bodies[0], bodies[1:]
+    batches = {
+        "python loop (any)": lambda: any(body.collides(other) for other in others),
+        "collides_any": lambda: body.collides_any(others),
+        "python loop (indices)": lambda: [i for i, other in enumerate(others) if body.collides(other)],
+        "collide_indices": lambda: body.collide_indices(others),
+    }
+    for name, batch in batches.items():
+        start = time.perf_counter_ns()
+        for _ in range(100):
+            batch()
+        per_body = (time.perf_counter_ns() - start) / (100 * len(others))
+        print(f"{name:>24} | {per_body:>10.1f} ns / body (batch of {len(others)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare the `CollisionWorld` broadphase against the naive pairwise collision loop.
+
+Run with: `python -m benchmarks.collision`
+"""
+import random
+import time
+
+from benchmarks.suite import BenchBody, make_parser
+from src.config import Window
+from src.util.collision import CollisionWorld
+
+BODY_COUNTS = (100, 1_000, 10_000)
+# Past this amount of bodies, the naive loop is only measured on a subset of bodies
+# and extrapolated to the full amount of pairs, since it would take minutes otherwise.
+NAIVE_FULL_LIMIT = 2_000
+
+
+def make_bodies(amount: int, size: int, rng: random.Random) -> list[BenchBody]:
+    """Create `amount` bodies of given `size`, randomly placed within the window."""
+    return [
+        BenchBody(rng.uniform(0, Window.width - size), rng.uniform(0, Window.height - size), size, size)
+        for _ in range(amount)
+    ]
+
+
+def naive_pairs(bodies: list[BenchBody], rows: int) -> int:
+    """Run the naive pairwise loop for the first `rows` bodies, returning amount of colliding pairs."""
+    found = 0
+    for i in range(rows):
+        first = bodies[i]
+        for second in bodies[i + 1:]:
+            if first.collides(second):
+                found += 1
+    return found
+
+
+def bench_naive(bodies: list[BenchBody]) -> tuple[float, bool]:
+    """Measure the naive pairwise loop, returns the time taken and whether it was extrapolated."""
+    total_pairs = len(bodies) * (len(bodies) - 1) // 2
+    rows = len(bodies) if len(bodies) <= NAIVE_FULL_LIMIT else NAIVE_FULL_LIMIT // 10
+    measured_pairs = sum(len(bodies) - 1 - i for i in range(rows))
+
+    start = time.perf_counter()
+    naive_pairs(bodies, rows)
+    elapsed = time.perf_counter() - start
+
+    return elapsed * total_pairs / measured_pairs, rows != len(bodies)
+
+
+def bench_world(bodies: list[BenchBody], rounds: int) -> tuple[float, float, int]:
+    """Measure building the world once and querying all pairs (average of `rounds`)."""
+    start = time.perf_counter()
+    world = CollisionWorld()
+    for body in bodies:
+        world.add(body)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        pairs = world.all_colliding_pairs()
+    query_time = (time.perf_counter() - start) / rounds
+
+    for body in bodies:
+        world.remove(body)
+    return build_time, query_time, len(pairs)
+
+
+def main() -> None:
+    """Run the benchmark for each body count and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--size", type=int, default=4, help="width and height of each body (px)")
+    parser.add_argument("--rounds", type=int, default=5, help="amount of world queries to average")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'bodies':>8} | {'naive (ms)':>14} | {'world build (ms)':>16} | {'world pairs (ms)':>16} | {'speedup':>8} | pairs")
+    for amount in BODY_COUNTS:
+        bodies = make_bodies(amount, args.size, random.Random(args.seed))
+        naive_time, estimated = bench_naive(bodies)
+        build_time, query_time, pair_count = bench_world(bodies, args.rounds)
+
+        naive_col = f"{naive_time * 1000:.2f}{'*' if estimated else ''}"
+        print(
+            f"{amount:>8} | {naive_col:>14} | {build_time * 1000:>16.2f} | {query_time * 1000:>16.2f} | "
+            f"{naive_time / query_time:>7.1f}x | {pair_count}"
+        )
+    print("* extrapolated from a subset of the naive loop")
+
+
+if __name__ == "__main__":
+    main()
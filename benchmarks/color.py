@@ -0,0 +1,57 @@
+"""
+Compare per-pixel Python color effects against the batch color operations.
+
+Measures a heat-map (mapping a scalar field to colors through a palette) and a fade
+towards a color, on a whole surface. Requires NumPy.
+
+Run with: `python -m benchmarks.color`
+"""
+import numpy
+import pygame
+
+from benchmarks.suite import measure_ms
+from src.util.color import Color, apply_table, fade_surface, palette_table
+
+SIZE = (200, 150)
+HEAT_COLORS = (Color.BLUE, Color.GREEN, Color.RED)
+
+
+def heatmap_python(surface: pygame.Surface, values: list[list[float]]) -> None:
+    """Heat-map drawn pixel by pixel, interpolating between the palette colors."""
+    last = len(HEAT_COLORS) - 1
+    for x, column in enumerate(values):
+        for y, value in enumerate(column):
+            position = value * last
+            lower = min(int(position), last - 1)
+            surface.set_at((x, y), HEAT_COLORS[lower].lerp(HEAT_COLORS[lower + 1], position - lower))
+
+
+def fade_python(surface: pygame.Surface, amount: float) -> None:
+    """Fade towards white, pixel by pixel."""
+    width, height = surface.get_size()
+    for x in range(width):
+        for y in range(height):
+            surface.set_at((x, y), surface.get_at((x, y)).lerp(Color.WHITE, amount))
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    surface = pygame.Surface(SIZE)
+    values = numpy.random.default_rng(0).random(SIZE)
+    value_lists = values.tolist()
+    table = palette_table(HEAT_COLORS)
+
+    results = {
+        "heat-map (python)": measure_ms(lambda: heatmap_python(surface, value_lists)),
+        "heat-map (apply_table)": measure_ms(lambda: apply_table(surface, values, table)),
+        "fade (python)": measure_ms(lambda: fade_python(surface, 0.1)),
+        "fade (fade_surface)": measure_ms(lambda: fade_surface(surface, Color.WHITE, 0.1)),
+        "palette_table (cached)": measure_ms(lambda: palette_table(HEAT_COLORS)),
+    }
+    print(f"Surface size: {SIZE[0]}x{SIZE[1]}")
+    for name, result in results.items():
+        print(f"{name:>24} | {result:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
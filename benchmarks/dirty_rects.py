@@ -0,0 +1,97 @@
+"""
+Compare full screen updates against dirty rect rendering, in a mostly static scene.
+
+A static background covers the whole screen, while a few small sprites move over it.
+The full mode repaints the whole background and updates the whole screen, the dirty
+mode only restores the background under the sprites and updates the changed areas.
+
+Note that with the SDL dummy video driver (used when no display is available), the
+actual screen updates are almost free, so the difference there comes from painting
+only. Run on a real display to see the full effect.
+
+Run with: `python -m benchmarks.dirty_rects`
+"""
+import os
+import random
+import time
+
+import pygame
+
+from benchmarks.suite import init_display, make_parser
+from src.config import Window
+from src.util.color import Color
+from src.util.dirty_rects import DirtyRectTracker
+
+SPRITE_SIZE = 16
+
+
+def make_background(rng: random.Random) -> pygame.Surface:
+    """Create a complex (expensive to recreate) background surface."""
+    background = pygame.Surface((Window.width, Window.height)).convert()
+    background.fill(Color.GREY)
+    for _ in range(2_000):
+        pygame.draw.circle(
+            background,
+            Color(rng.randrange(256), rng.randrange(256), rng.randrange(256)),
+            (rng.randrange(Window.width), rng.randrange(Window.height)),
+            rng.randrange(2, 20),
+        )
+    return background
+
+
+def run(surface: pygame.Surface, background: pygame.Surface, sprites: int, frames: int, dirty: bool) -> float:
+    """Render given amount of frames, returning the average frame time in ms."""
+    rng = random.Random(0)
+    sprite = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE)).convert()
+    sprite.fill(Color.RED)
+    positions = [[rng.randrange(Window.width - SPRITE_SIZE), rng.randrange(Window.height - SPRITE_SIZE)] for _ in range(sprites)]
+    tracker = DirtyRectTracker()
+
+    surface.blit(background, (0, 0))
+    pygame.display.update()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        if dirty:
+            for x, y in positions:
+                area = pygame.Rect(x, y, SPRITE_SIZE, SPRITE_SIZE)
+                tracker.add(surface.blit(background, area, area))
+        else:
+            surface.blit(background, (0, 0))
+
+        for position in positions:
+            position[0] = (position[0] + 3) % (Window.width - SPRITE_SIZE)
+            position[1] = (position[1] + 2) % (Window.height - SPRITE_SIZE)
+            rect = surface.blit(sprite, position)
+            if dirty:
+                tracker.add(rect)
+
+        if dirty:
+            pygame.display.update(tracker.flush())
+        else:
+            pygame.display.update()
+
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main() -> None:
+    """Run the benchmark for a few sprite counts and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    surface = init_display()
+    print(f"Video driver: {pygame.display.get_driver()} (SDL_VIDEODRIVER={os.environ.get('SDL_VIDEODRIVER', '')})")
+    background = make_background(random.Random(0))
+
+    print(f"{'sprites':>8} | {'full (ms)':>10} | {'dirty (ms)':>10} | {'speedup':>8}")
+    for sprites in (1, 10, 50, 200):
+        full = run(surface, background, sprites, args.frames, dirty=False)
+        dirty = run(surface, background, sprites, args.frames, dirty=True)
+        print(f"{sprites:>8} | {full:>10.3f} | {dirty:>10.3f} | {full / dirty:>7.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
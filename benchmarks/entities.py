@@ -0,0 +1,90 @@
+"""
+Compare updating and drawing every body against the entity manager.
+
+The world holds many bodies, only a small fraction of which keeps moving, and only
+a part of the window is drawn (the viewport). The plain list mode updates and draws
+every body in every frame, the entity manager only updates the awake bodies and only
+draws the ones intersecting the viewport.
+
+Run with: `python -m benchmarks.entities`
+"""
+import random
+
+import pygame
+
+from benchmarks.suite import init_display, make_parser, measure_ms
+from src.config import Window
+from src.util.body import RectBody
+from src.util.entities import EntityManager
+
+VIEWPORT = (0, 0, Window.width // 4, Window.height // 4)
+
+
+class Entity(RectBody):
+    """Body drawn as a small rect, moving by its velocity (if it has any)."""
+
+    def __init__(self, x: float, y: float, dx: float, dy: float):
+        super().__init__(x, y, 6, 6)
+        self.dx = dx
+        self.dy = dy
+
+    def update(self) -> None:
+        """Move the body, wrapping it around the window."""
+        if self.dx or self.dy:
+            self.x = (self.x + self.dx) % (Window.width - self.width)
+            self.y = (self.y + self.dy) % (Window.height - self.height)
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Draw the body as a rect."""
+        surface.fill((200, 80, 80), (self.x, self.y, self.width, self.height))
+
+
+def make_entities(rng: random.Random, count: int, moving: float) -> list[Entity]:
+    """Create the bodies at random positions, with given fraction of them moving."""
+    entities = []
+    for _ in range(count):
+        dx, dy = (rng.uniform(-2, 2), rng.uniform(-2, 2)) if rng.random() < moving else (0.0, 0.0)
+        entities.append(Entity(rng.uniform(0, Window.width - 6), rng.uniform(0, Window.height - 6), dx, dy))
+    return entities
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--moving", type=float, default=0.02, help="Fraction of the bodies which keep moving")
+    args = parser.parse_args()
+
+    screen = init_display()
+
+    for count in (1_000, 10_000, 50_000):
+        entities = make_entities(random.Random(0), count, args.moving)
+
+        def plain_frame(entities: list[Entity] = entities) -> None:
+            for entity in entities:
+                entity.update()
+            for entity in entities:
+                entity.draw(screen)
+
+        plain = measure_ms(plain_frame, min_time=1.0)
+
+        manager = EntityManager()
+        manager.add_all(entities)
+        for _ in range(manager.sleep_after):
+            manager.update()
+
+        def managed_frame(manager: EntityManager = manager) -> None:
+            manager.update()
+            manager.draw(screen, VIEWPORT)
+
+        managed = measure_ms(managed_frame, min_time=1.0)
+        print(
+            f"{count:>6} bodies ({len(manager.awake)} awake, {len(manager.visible(VIEWPORT))} visible): "
+            f"plain list {plain:>8.3f} ms, entity manager {managed:>7.3f} ms per frame ({plain / managed:.1f}x)"
+        )
+        manager.clear()
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
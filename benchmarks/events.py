@@ -0,0 +1,122 @@
+"""
+Measure the event processing throughput of the game loop under synthetic event floods.
+
+Every round posts a flood of events into the pygame event queue (mostly mouse motion,
+with some key presses and events nobody handles) and measures how long it takes to
+process it with `_process_events` (posting the events isn't included).
+The classic if/elif chain in `handle_user_event` is compared with handlers registered
+in the event dispatcher, with the event filtering and with the mouse motion coalescing.
+
+Run with: `python -m benchmarks.events`
+"""
+import random
+import time
+
+import pygame
+from pygame.event import EventType  # type: ignore (see: https://github.com/pygame/pygame/issues/2867)
+
+from benchmarks.suite import make_parser
+from src.game import Game
+
+
+class ChainGame(Game):
+    """Game handling the events with an if/elif chain."""
+
+    def setup(self) -> None:
+        """Reset the counters."""
+        self.handled = 0
+        self.mouse_position = (0, 0)
+
+    def handle_user_event(self, event: EventType) -> None:
+        """Compare the event type against every handled type."""
+        if event.type == pygame.MOUSEMOTION:
+            self.handled += 1
+            self.mouse_position = event.pos
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.handled += 1
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.handled += 1
+        elif event.type == pygame.KEYDOWN:
+            self.handled += 1
+        elif event.type == pygame.KEYUP:
+            self.handled += 1
+
+
+class DispatchGame(Game):
+    """Game handling the events with handlers registered in the dispatcher."""
+
+    def setup(self) -> None:
+        """Register the handlers."""
+        self.handled = 0
+        self.mouse_position = (0, 0)
+        self.events.register(pygame.MOUSEMOTION, self.on_mouse_motion)
+        for event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.KEYDOWN, pygame.KEYUP):
+            self.events.register(event_type, self.count)
+
+    def on_mouse_motion(self, event: EventType) -> None:
+        """Track the mouse position."""
+        self.handled += 1
+        self.mouse_position = event.pos
+
+    def count(self, event: EventType) -> None:
+        """Count the handled event."""
+        self.handled += 1
+
+
+def make_flood(rng: random.Random, size: int) -> list[EventType]:
+    """Create a flood of events, mostly made of bursts of mouse motion."""
+    events = []
+    while len(events) < size:
+        for _ in range(rng.randrange(1, 50)):
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=(rng.randrange(800), rng.randrange(600)), rel=(1, 1), buttons=(0, 0, 0)))
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode="a", scancode=4))
+        events.append(pygame.event.Event(pygame.JOYAXISMOTION, joy=0, instance_id=0, axis=0, value=0.5))
+    return events[:size]
+
+
+def run(game: Game, flood: list[EventType], rounds: int) -> tuple[float, int]:
+    """Get the time spent processing the events and the amount of handled events."""
+    game.setup()
+    game.events.apply_filter()
+    pygame.event.clear()
+
+    elapsed = 0.0
+    for _ in range(rounds):
+        for event in flood:
+            pygame.event.post(event)
+        start = time.perf_counter()
+        game._process_events()
+        elapsed += time.perf_counter() - start
+
+    game.events.filter_events = False
+    game.events.apply_filter()
+    return elapsed, game.handled
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--events", type=int, default=2_000, help="Amount of events in a single flood")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.init()
+    flood = make_flood(random.Random(0), args.events)
+
+    modes = (
+        ("if/elif chain", ChainGame(headless=True)),
+        ("dispatcher", DispatchGame(headless=True)),
+        ("filtered", DispatchGame(headless=True, filter_events=True)),
+        ("coalesced", DispatchGame(headless=True, coalesce_motion=True)),
+        ("filtered+coalesced", DispatchGame(headless=True, filter_events=True, coalesce_motion=True)),
+    )
+    for name, game in modes:
+        elapsed, handled = run(game, flood, args.rounds)
+        per_second = args.events * args.rounds / elapsed
+        print(f"{name:>18} | {elapsed * 1000 / args.rounds:>7.3f} ms per flood | {per_second:>12,.0f} events/s | {handled:>8} handler calls")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare repainting a complex background every frame against a cached static layer.
+
+The scene is made of a static background (many circles over a filled screen), a few
+moving sprites on a dynamic layer and a static HUD. The repaint mode draws everything
+from scratch every frame, the layered mode composes the cached layers instead.
+
+Run with: `python -m benchmarks.layers`
+"""
+import random
+from collections.abc import Callable
+
+import pygame
+
+from benchmarks.suite import init_display, make_parser, measure_ms
+from src.config import Window
+from src.util.color import Color
+from src.util.layers import LayerStack, RenderLayer
+
+CIRCLES = 2_000
+SPRITES = 50
+
+DrawFunction = Callable[[pygame.Surface], None]
+
+
+def make_scene(rng: random.Random) -> tuple[DrawFunction, DrawFunction, DrawFunction]:
+    """Create the functions drawing the background, the moving sprites and the HUD."""
+    circles = [
+        (
+            Color(rng.randrange(256), rng.randrange(256), rng.randrange(256)),
+            (rng.randrange(Window.width), rng.randrange(Window.height)),
+            rng.randrange(2, 20),
+        )
+        for _ in range(CIRCLES)
+    ]
+    sprites = [[rng.uniform(0, Window.width), rng.uniform(0, Window.height)] for _ in range(SPRITES)]
+
+    def draw_background(surface: pygame.Surface) -> None:
+        surface.fill(Color.GREY)
+        for color, center, radius in circles:
+            pygame.draw.circle(surface, color, center, radius)
+
+    def draw_sprites(surface: pygame.Surface) -> None:
+        for position in sprites:
+            position[0] = (position[0] + 1) % Window.width
+            pygame.draw.rect(surface, Color.RED, (*position, 16, 16))
+
+    def draw_hud(surface: pygame.Surface) -> None:
+        pygame.draw.rect(surface, Color.BLACK, (0, 0, Window.width, 30))
+        for i in range(20):
+            pygame.draw.rect(surface, Color.YELLOW, (5 + i * 20, 5, 15, 20))
+
+    return draw_background, draw_sprites, draw_hud
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.parse_args()
+
+    screen = init_display()
+    draw_background, draw_sprites, draw_hud = make_scene(random.Random(0))
+
+    def repaint() -> None:
+        draw_background(screen)
+        draw_sprites(screen)
+        draw_hud(screen)
+
+    layers = LayerStack()
+    layers.add(RenderLayer("background", draw_background, transparent=False))
+    layers.add(RenderLayer("sprites", draw_sprites, static=False))
+    layers.add(RenderLayer("hud", draw_hud, size=(Window.width, 30)))
+
+    # Moving sprites drawn directly over the composed static layers, without a dynamic layer
+    static_layers = LayerStack()
+    static_layers.add(RenderLayer("background", draw_background, transparent=False))
+    static_layers.add(RenderLayer("hud", draw_hud, size=(Window.width, 30)))
+
+    def compose_static() -> None:
+        static_layers.compose(screen)
+        draw_sprites(screen)
+
+    results = {
+        "repaint every frame": measure_ms(repaint, min_time=1.0),
+        "layers (dynamic sprites layer)": measure_ms(lambda: layers.compose(screen), min_time=1.0),
+        "static layers + direct sprites": measure_ms(compose_static, min_time=1.0),
+    }
+    for name, milliseconds in results.items():
+        print(f"{name:<32} {milliseconds:>8.3f} ms per frame")
+
+    for stack in (layers, static_layers):
+        usage = ", ".join(f"{layer.name} {layer.memory / 1024:.0f} KiB ({layer.renders} renders)" for layer in stack)
+        print(f"Layer memory: {usage}, total {stack.memory / 1024:.0f} KiB")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measure the latency of logging calls on the calling (game) thread.
+
+Compares synchronous handlers (a stream and a rotating log file, rolling over often)
+with the queue based logging, where handlers run on a background listener thread.
+
+Run with: `python -m benchmarks.log_latency`
+"""
+import logging
+import logging.handlers
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.suite import make_parser
+from src.util.log import FORMAT_STRING, get_logger, setup_queue_logging, stop_queue_logging
+
+log = get_logger("benchmark")
+
+
+def make_handlers(directory: Path) -> list[logging.Handler]:
+    """Create handlers similar to the ones used by the game (stream + rotating file)."""
+    formatter = logging.Formatter(FORMAT_STRING)
+    stream_handler = logging.StreamHandler(open(directory / "stdout.log", "w", encoding="utf8"))
+    file_handler = logging.handlers.RotatingFileHandler(directory / "game.log", maxBytes=256 * 1024, backupCount=2, encoding="utf8")
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+    return [stream_handler, file_handler]
+
+
+def measure_latencies(calls: int) -> list[int]:
+    """Get the latencies (ns) of given amount of logging calls."""
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter_ns()
+        log.info("Tick %d: player at (%.2f, %.2f), %d enemies alive", i, i * 0.5, i * 0.25, i % 50)
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def report(name: str, latencies: list[int]) -> None:
+    """Print the latency percentiles."""
+    ordered = sorted(latencies)
+    p50, p99 = ordered[len(ordered) // 2], ordered[int(len(ordered) * 0.99)]
+    print(f"{name:>18} | p50 {p50 / 1000:>8.2f} us | p99 {p99 / 1000:>8.2f} us | max {ordered[-1] / 1000:>9.2f} us")
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    root_log = get_logger()
+    for handler in root_log.handlers[:]:
+        root_log.removeHandler(handler)
+    root_log.setLevel(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for handler in make_handlers(Path(directory)):
+            root_log.addHandler(handler)
+        report("synchronous", measure_latencies(args.calls))
+
+        for drop, name in ((False, "queue (blocking)"), (True, "queue (dropping)")):
+            setup_queue_logging(root_log, max_size=10_000, drop=drop)
+            latencies = measure_latencies(args.calls)
+            flush_start = time.perf_counter()
+            stop_queue_logging()
+            report(name, latencies)
+            print(f"{'':>18}   flushed on shutdown in {(time.perf_counter() - flush_start) * 1000:.1f} ms")
+
+        for handler in root_log.handlers[:]:
+            root_log.removeHandler(handler)
+            handler.close()
+
+
+if __name__ == "__main__":
+    main()
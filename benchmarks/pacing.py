@@ -0,0 +1,86 @@
+"""
+Compare the fixed game loop pacing with the adaptive frame pacing under load.
+
+The game simulates a weak machine: every tick and redraw burn some CPU time, and
+during periodic load spikes, the redraws get several times slower, so the frames
+no longer fit the frame budget. Both modes run for the same amount of time, the
+amount of ticks ran, the frame time jitter and the pacer interventions are reported.
+
+Run with: `python -m benchmarks.pacing`
+"""
+import statistics
+import time
+
+from benchmarks.suite import make_parser
+from src.config import Window
+from src.game import Game
+
+
+def burn(milliseconds: float) -> None:
+    """Keep the CPU busy for given amount of time."""
+    end = time.perf_counter() + milliseconds / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+class LoadedGame(Game):
+    """Game with a constant tick cost and redraws which periodically get much slower."""
+
+    tick_cost = 5.0
+    redraw_cost = 15.0
+    spike_factor = 4.0
+
+    def setup(self) -> None:
+        """Reset the measurements."""
+        self.frame_times: list[float] = []
+        self.redraws = 0
+        self._last_tick = time.perf_counter()
+
+    def in_spike(self) -> bool:
+        """Load spikes last a second, every three seconds."""
+        return self.tick_count // Window.tick_rate % 3 == 2
+
+    def redraw_screen(self) -> None:
+        """Burn the redraw time (much longer during the load spikes)."""
+        self.redraws += 1
+        burn(self.redraw_cost * (self.spike_factor if self.in_spike() else 1))
+
+    def tick(self) -> None:
+        """Burn the tick time and measure the time since the last tick."""
+        burn(self.tick_cost)
+        now = time.perf_counter()
+        self.frame_times.append((now - self._last_tick) * 1000)
+        self._last_tick = now
+        if now >= self.end_time:
+            self.running = False
+
+
+def run(adaptive: bool, duration: float) -> LoadedGame:
+    """Run the loaded game for given time."""
+    game = LoadedGame(headless=True, adaptive_pacing=adaptive)
+    game.end_time = time.perf_counter() + duration
+    game.start(manage_pygame=False)
+    return game
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--duration", type=float, default=6.0, help="Duration of each run (in seconds)")
+    args = parser.parse_args()
+
+    for adaptive in (False, True):
+        game = run(adaptive, args.duration)
+        frame_times = game.frame_times[1:]
+        late = sum(frame_time > 1000 / Window.tick_rate * 1.5 for frame_time in frame_times)
+        print(
+            f"{'adaptive' if adaptive else 'fixed':<9} {game.tick_count / args.duration:>6.1f} ticks/s, "
+            f"{game.redraws} redraws, frame time {statistics.mean(frame_times):.1f} ms "
+            f"(stdev {statistics.stdev(frame_times):.1f} ms), {late} late frames"
+        )
+        if game.pacer is not None:
+            print(f"{'':<9} interventions: {game.pacer.report()}, final rate {game.pacer.rate}")
+
+
+if __name__ == "__main__":
+    main()
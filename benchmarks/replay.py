@@ -0,0 +1,93 @@
+"""
+Measure the tick throughput by replaying a recorded input session.
+
+Unless an existing recording is given, a synthetic session is recorded first: a game
+with a few hundred bodies, steered by key presses generated from the seeded RNG. The
+recording is then replayed (uncapped, without rendering) several times, verifying
+that every replay ends in the recorded state, and the tick throughput is reported.
+
+Run with: `python -m benchmarks.replay`
+"""
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import pygame
+from pygame.event import EventType  # type: ignore (see: https://github.com/pygame/pygame/issues/2867)
+
+from benchmarks.suite import BenchBody, make_parser
+from src.config import Window
+from src.game import Game
+
+BODIES = 300
+STEER_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+
+class ReplayGame(Game):
+    """Game with bodies steered by the pressed keys, generating its own synthetic input."""
+
+    def setup(self) -> None:
+        """Create the bodies at random positions."""
+        self.bodies = [BenchBody(random.uniform(0, 780), random.uniform(0, 580), 20, 20) for _ in range(BODIES)]
+        self.velocities = [[random.uniform(-3, 3), random.uniform(-3, 3)] for _ in range(BODIES)]
+        self.steering = [0.0, 0.0]
+
+    def handle_user_event(self, event: EventType) -> None:
+        """Steer all of the bodies with the arrow keys."""
+        if event.type == pygame.KEYDOWN and event.key in STEER_KEYS:
+            dx, dy = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}[event.key]
+            self.steering = [self.steering[0] + dx * 0.1, self.steering[1] + dy * 0.1]
+
+    def tick(self) -> None:
+        """Move the bodies and post some synthetic input (only recorded, replays use the recorded input)."""
+        for body, velocity in zip(self.bodies, self.velocities):
+            velocity[0] += self.steering[0]
+            velocity[1] += self.steering[1]
+            x, y = body.x + velocity[0], body.y + velocity[1]
+            if not 0 <= x <= Window.width - body.width:
+                velocity[0] = -velocity[0]
+                x = min(max(x, 0), Window.width - body.width)
+            if not 0 <= y <= Window.height - body.height:
+                velocity[1] = -velocity[1]
+                y = min(max(y, 0), Window.height - body.height)
+            body.x, body.y = x, y
+
+        if random.random() < 0.2:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=random.choice(STEER_KEYS), mod=0, unicode="", scancode=0))
+
+    def snapshot(self) -> Any:
+        """Positions of all of the bodies."""
+        return [(body.x, body.y) for body in self.bodies]
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--recording", type=Path, help="Recording to replay (it's created, if it doesn't exist)")
+    parser.add_argument("--ticks", type=int, default=2_000, help="Amount of ticks to record")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.recording or Path(directory, "session.rec")
+        if not path.exists():
+            game = ReplayGame(headless=True)
+            game.start_recording(path, seed=args.seed)
+            game.run_headless(max_ticks=args.ticks, manage_pygame=False)
+            print(f"Recorded {game.tick_count} ticks into {path} ({path.stat().st_size} bytes)")
+
+        results = []
+        for _ in range(args.repeat):
+            results.append(ReplayGame(headless=True).replay(path, manage_pygame=False))
+        print(
+            f"Replay (verified): median {statistics.median(results):,.0f} ticks/s, "
+            f"best {max(results):,.0f} ticks/s, worst {min(results):,.0f} ticks/s"
+        )
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure how the parallel headless runner scales with the amount of processes.
+
+The same amount of CPU bound rounds (a few hundred bodies moved every tick) is ran
+with 1, 2, 4, ... processes (up to the amount of CPU cores), the wall time, the
+tick throughput and the speedup against a single process are reported.
+
+Run with: `python -m benchmarks.runner`
+"""
+import os
+import random
+from typing import Any
+
+from benchmarks.suite import make_parser
+from src.game import Game
+from src.util.runner import run_rounds
+
+BODIES = 300
+
+
+class SimulationGame(Game):
+    """Game moving many points around, stopping after a fixed amount of ticks."""
+
+    def setup(self) -> None:
+        """Create the points at random positions, with random velocities."""
+        self.points = [[random.uniform(0, 800), random.uniform(0, 600)] for _ in range(BODIES)]
+        self.velocities = [(random.uniform(-3, 3), random.uniform(-3, 3)) for _ in range(BODIES)]
+
+    def tick(self) -> None:
+        """Move the points, wrapping them around the window."""
+        for point, (dx, dy) in zip(self.points, self.velocities):
+            point[0] = (point[0] + dx) % 800
+            point[1] = (point[1] + dy) % 600
+
+    def round_result(self) -> Any:
+        """Average position of the points."""
+        return sum(x for x, _ in self.points) / BODIES, sum(y for _, y in self.points) / BODIES
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--rounds", type=int, default=16)
+    parser.add_argument("--ticks", type=int, default=500, help="Amount of ticks of each round")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = sorted({min(2**power, cores) for power in range(cores.bit_length() + 1)})
+    baseline = None
+    for processes in counts:
+        summary = run_rounds(SimulationGame, args.rounds, max_ticks=args.ticks, seed=0, processes=processes)
+        baseline = baseline or summary.duration
+        print(
+            f"{processes:>3} processes: {summary.duration:>7.2f}s, {summary.ticks_per_second:>10,.0f} ticks/s, "
+            f"speedup {baseline / summary.duration:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare checking a counter of every pending timer in each tick against the scheduler.
+
+Many repeating timers (f.e. cooldowns) with random intervals are pending at once,
+the counter mode decrements and checks every one of them in every tick (the usual
+approach in `tick`), the scheduler only runs the ones which are due.
+
+Run with: `python -m benchmarks.scheduler`
+"""
+import random
+import time
+
+from benchmarks.suite import make_parser
+from src.util.scheduler import Scheduler
+
+TICKS = 1_000
+
+
+def run_counters(intervals: list[int]) -> tuple[float, int]:
+    """Run the ticks with a countdown per every timer, returning the time per tick (in ms) and the amount of fired timers."""
+    counters = list(intervals)
+    fired = 0
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        for index, counter in enumerate(counters):
+            if counter <= 1:
+                counters[index] = intervals[index]
+                fired += 1
+            else:
+                counters[index] = counter - 1
+    return (time.perf_counter() - start) / TICKS * 1000, fired
+
+
+def run_scheduler(intervals: list[int]) -> tuple[float, int]:
+    """Run the ticks with every timer scheduled in the scheduler, returning the time per tick (in ms) and the amount of fired timers."""
+    scheduler = Scheduler()
+    fired = 0
+
+    def fire() -> None:
+        nonlocal fired
+        fired += 1
+
+    for interval in intervals:
+        scheduler.call_every(interval, fire, delay=interval - 1)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        scheduler.advance()
+    return (time.perf_counter() - start) / TICKS * 1000, fired
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--min-interval", type=int, default=30, help="Shortest timer interval (in ticks)")
+    parser.add_argument("--max-interval", type=int, default=600, help="Longest timer interval (in ticks)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for count in (1_000, 10_000, 50_000):
+        intervals = [rng.randint(args.min_interval, args.max_interval) for _ in range(count)]
+        counters, counters_fired = run_counters(intervals)
+        scheduler, scheduler_fired = run_scheduler(intervals)
+        assert counters_fired == scheduler_fired, "Both modes should fire the same timers"
+        print(
+            f"{count:>6} timers ({scheduler_fired / TICKS:>6.1f} due per tick): "
+            f"counters {counters:>7.3f} ms, scheduler {scheduler:>6.3f} ms per tick ({counters / scheduler:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
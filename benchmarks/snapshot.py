@@ -0,0 +1,58 @@
+"""
+Measure packed body snapshots against rebuilding the bodies in the setup.
+
+For every amount of bodies, the time of creating all of the bodies from scratch (what
+`setup` does when restarting a round), capturing their snapshot, restoring it in place
+and (de)serializing it is measured, along with the snapshot size. A pickle of the
+bodies is included for comparison.
+
+Run with: `python -m benchmarks.snapshot`
+"""
+import pickle
+import random
+
+import pygame
+
+from benchmarks.suite import BenchControlledBody, make_parser, measure_ms
+from src.util.snapshot import BodySnapshot
+
+MOVE_KEYS = {"left": pygame.K_LEFT, "right": pygame.K_RIGHT, "up": pygame.K_UP, "down": pygame.K_DOWN}
+
+
+def make_bodies(amount: int) -> list[BenchControlledBody]:
+    """Create the bodies, the same way a setup would."""
+    rng = random.Random(0)
+    return [BenchControlledBody(rng.uniform(0, 780), rng.uniform(0, 580), 20, 20, rng.uniform(1, 5), MOVE_KEYS) for _ in range(amount)]
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--bodies", type=int, nargs="+", default=[1_000, 10_000])
+    args = parser.parse_args()
+
+    for amount in args.bodies:
+        bodies = make_bodies(amount)
+        snapshot = BodySnapshot.capture(bodies)
+        data = snapshot.to_bytes()
+        pickled = pickle.dumps(bodies)
+
+        # Move the bodies away, so that restoring actually changes them
+        for body in bodies:
+            body.x = body.y = 0
+
+        results = {
+            "rebuild (setup)": measure_ms(lambda amount=amount: make_bodies(amount)),
+            "capture": measure_ms(lambda bodies=bodies: BodySnapshot.capture(bodies)),
+            "restore": measure_ms(snapshot.restore),
+            "to_bytes": measure_ms(snapshot.to_bytes),
+            "from_bytes": measure_ms(lambda bodies=bodies, data=data: BodySnapshot.from_bytes(data, bodies)),
+            "pickle.loads (for comparison)": measure_ms(lambda pickled=pickled: pickle.loads(pickled)),
+        }
+        print(f"{amount} bodies: snapshot {len(data):,} bytes ({len(data) / amount:.0f} per body), pickle {len(pickled):,} bytes")
+        for name, milliseconds in results.items():
+            print(f"  {name:<30} {milliseconds:>9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
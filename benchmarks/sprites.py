@@ -0,0 +1,96 @@
+"""
+Compare drawing many bodies with a blit per body against the sprite batch.
+
+A few small sprite images are shared by all of the bodies. Per body drawing calls
+`Surface.blit` from every body's `draw`, the batch queues the bodies and draws them
+with a single `Surface.blits` call, either from the separate images or from a texture
+atlas holding all of them.
+
+Run with: `python -m benchmarks.sprites`
+"""
+import random
+
+import pygame
+
+from benchmarks.suite import init_display, make_parser, measure_ms
+from src.config import Window
+from src.util.body import RectBody
+from src.util.sprites import SpriteBatch, TextureAtlas
+
+SPRITE_SIZE = 8
+VARIANTS = 16
+
+
+class SpriteBody(RectBody):
+    """Body drawing its sprite with a blit of its own."""
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Blit the sprite image at the position of the body."""
+        surface.blit(self.sprite, (self.x, self.y))
+
+
+def make_images(rng: random.Random) -> list[pygame.Surface]:
+    """Create small sprite images in the display format."""
+    images = []
+    for _ in range(VARIANTS):
+        image = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE), pygame.SRCALPHA)
+        image.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256), 255))
+        images.append(image.convert_alpha())
+    return images
+
+
+def per_body(bodies: list[SpriteBody], screen: pygame.Surface) -> None:
+    """Draw every body on its own."""
+    for body in bodies:
+        body.draw(screen)
+
+
+def batched(batch: SpriteBatch, bodies: list[SpriteBody], screen: pygame.Surface) -> None:
+    """Draw all of the bodies through the sprite batch."""
+    batch.draw_bodies(bodies)
+    batch.flush(screen)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--bodies", type=int, nargs="+", default=[100, 1_000, 10_000])
+    args = parser.parse_args()
+
+    screen = init_display()
+    rng = random.Random(0)
+    images = make_images(rng)
+
+    atlas = TextureAtlas(256, 256)
+    for index, image in enumerate(images):
+        atlas.add(index, image)
+    batch = SpriteBatch()
+    atlas_batch = SpriteBatch(atlas)
+
+    for amount in args.bodies:
+        bodies = []
+        atlas_bodies = []
+        for _ in range(amount):
+            x, y = rng.uniform(0, Window.width - SPRITE_SIZE), rng.uniform(0, Window.height - SPRITE_SIZE)
+            variant = rng.randrange(VARIANTS)
+            body = SpriteBody(x, y, SPRITE_SIZE, SPRITE_SIZE)
+            body.sprite = images[variant]
+            bodies.append(body)
+            atlas_body = SpriteBody(x, y, SPRITE_SIZE, SPRITE_SIZE)
+            atlas_body.sprite = variant
+            atlas_bodies.append(atlas_body)
+
+        modes = (
+            ("blit per body", lambda bodies=bodies: per_body(bodies, screen)),
+            ("batch", lambda bodies=bodies: batched(batch, bodies, screen)),
+            ("batch + atlas", lambda bodies=atlas_bodies: batched(atlas_batch, bodies, screen)),
+        )
+        for name, func in modes:
+            milliseconds = measure_ms(func)
+            print(f"{amount:>6} bodies | {name:>14} | {milliseconds:>8.3f} ms per frame | {amount / milliseconds * 1000:>12,.0f} sprites/s")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
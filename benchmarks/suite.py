@@ -0,0 +1,289 @@
+import argparse
+import random
+import time
+import timeit
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any, Optional
+
+import pygame
+
+from src.config import Window
+from src.game import Game
+from src.util.body import ControlledRectBody, RectBody
+from src.util.color import Color, apply_table, palette_table, random_colors
+from src.util.descriptor import Coordinate, DescriptorOwner, NumericRange, RadianAngle
+from src.util.events import EventDispatcher, coalesce_motion
+from src.util.input import InputState
+from src.util.lazy_numpy import get_numpy
+from src.util.math import distance_matrix, number_remap, remap_array
+from src.util.sprites import SpriteBatch
+
+# Every registered benchmark is a setup function, returning the function to be measured
+BENCHMARKS: dict[str, Callable[[], Callable[[], object]]] = {}
+
+# The NumPy based benchmarks are only registered when it's installed
+numpy = get_numpy()
+
+
+def benchmark(name: str) -> Callable[[Callable[[], Callable[[], object]]], Callable[[], Callable[[], object]]]:
+    """Register decorated setup function as a benchmark with given name."""
+    def decorator(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name} is already registered.")
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> float:
+    """Get the time of a single call of `func` in nanoseconds (best of `repeat` runs)."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(int(number * min_time / 0.2), 1)
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def measure_ms(func: Callable[[], object], min_time: float = 0.5) -> float:
+    """Get the average time of a single call of `func` in milliseconds, calling it for at least `min_time` seconds."""
+    rounds = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time:
+        func()
+        rounds += 1
+    return elapsed / rounds * 1000
+
+
+def make_parser(description: Optional[str], **kwargs: Any) -> argparse.ArgumentParser:
+    """Create the argument parser of a benchmark script, showing given description (its docstring) in the help."""
+    return argparse.ArgumentParser(description=description, formatter_class=argparse.RawDescriptionHelpFormatter, **kwargs)
+
+
+def init_display() -> pygame.Surface:
+    """Initialize pygame and open a window of the configured size, for the benchmarks which draw."""
+    pygame.init()
+    return pygame.display.set_mode((Window.width, Window.height))
+
+
+class Holder(DescriptorOwner):
+    """Class holding all of the measured descriptors."""
+
+    coordinate = Coordinate(window_border=Window.width)
+    numeric_range = NumericRange(min=0, max=100)
+    radian_angle = RadianAngle()
+
+    def __init__(self):
+        self.coordinate = 10
+        self.numeric_range = 10
+        self.radian_angle = 1
+
+
+class TrustedHolder(Holder):
+    """Class holding all of the measured descriptors, with validation turned off."""
+
+    trusted_descriptors = True
+
+
+class BenchBody(RectBody):
+    """Minimal concrete body."""
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Benchmark bodies are never drawn."""
+        pass
+
+
+class BenchControlledBody(ControlledRectBody):
+    """Minimal concrete controlled body."""
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Benchmark bodies are never drawn."""
+        pass
+
+
+class BenchGame(Game):
+    """Game with a bit of drawing, to measure full iterations of the game loop."""
+
+    def setup(self) -> None:
+        """Create a few bodies to draw."""
+        rng = random.Random(0)
+        self.bodies = [BenchBody(rng.uniform(0, 700), rng.uniform(0, 500), 20, 20) for _ in range(50)]
+
+    def redraw_screen(self) -> None:
+        """Draw all of the bodies as rects."""
+        super().redraw_screen()
+        for body in self.bodies:
+            pygame.draw.rect(self.surface, Color.RED, body.hitbox)
+
+
+def _descriptor_setter(holder_cls: type[Holder], attribute: str, value: float) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        holder = holder_cls()
+        return lambda: setattr(holder, attribute, value)
+    return setup
+
+
+def _descriptor_getter(holder_cls: type[Holder], attribute: str) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        holder = holder_cls()
+        return lambda: getattr(holder, attribute)
+    return setup
+
+
+for _holder_cls, _suffix in ((Holder, ""), (TrustedHolder, ".trusted")):
+    for _attribute, _value in (("coordinate", 50), ("numeric_range", 50), ("radian_angle", 7)):
+        benchmark(f"descriptor.{_attribute}.set{_suffix}")(_descriptor_setter(_holder_cls, _attribute, _value))
+        benchmark(f"descriptor.{_attribute}.get{_suffix}")(_descriptor_getter(_holder_cls, _attribute))
+
+
+@benchmark("body.hitbox.cached")
+def _body_hitbox_cached() -> Callable[[], object]:
+    body = BenchBody(10, 10, 20, 20)
+    return lambda: body.hitbox
+
+
+@benchmark("body.hitbox.rebuilt")
+def _body_hitbox_rebuilt() -> Callable[[], object]:
+    body = BenchBody(10, 10, 20, 20)
+
+    def func() -> pygame.Rect:
+        body.x = 10
+        return body.hitbox
+    return func
+
+
+@benchmark("body.collides")
+def _body_collides() -> Callable[[], object]:
+    first, second = BenchBody(10, 10, 20, 20), BenchBody(25, 25, 20, 20)
+    return lambda: first.collides(second)
+
+
+@benchmark("body.collides_any.100")
+def _body_collides_any() -> Callable[[], object]:
+    rng = random.Random(0)
+    body = BenchBody(400, 300, 20, 20)
+    others = [BenchBody(rng.uniform(0, 700), rng.uniform(0, 500), 20, 20) for _ in range(100)]
+    return lambda: body.collides_any(others)
+
+
+@benchmark("body.controlled.move")
+def _controlled_move() -> Callable[[], object]:
+    keys = {"left": pygame.K_LEFT, "right": pygame.K_RIGHT, "up": pygame.K_UP, "down": pygame.K_DOWN}
+    body = BenchControlledBody(400, 300, 20, 20, 2, keys)
+    return body.move
+
+
+@benchmark("body.controlled.move.input_state")
+def _controlled_move_input_state() -> Callable[[], object]:
+    keys = {"left": pygame.K_LEFT, "right": pygame.K_RIGHT, "up": pygame.K_UP, "down": pygame.K_DOWN}
+    body = BenchControlledBody(400, 300, 20, 20, 2, keys)
+    input_state = InputState.capture()
+    return lambda: body.move(input_state)
+
+
+@benchmark("body.controlled.move_all.100")
+def _controlled_move_all() -> Callable[[], object]:
+    keys = {"left": pygame.K_LEFT, "right": pygame.K_RIGHT, "up": pygame.K_UP, "down": pygame.K_DOWN}
+    bodies = [BenchControlledBody(400, 300, 20, 20, 2, keys, clamp=True) for _ in range(100)]
+    # Keep the bodies moving, so that the whole movement (not only the key lookups) gets measured
+    pressed = defaultdict(bool, {pygame.K_RIGHT: True, pygame.K_DOWN: True})
+    input_state = InputState(pressed, (0, 0), (False, False, False))  # type: ignore
+    return lambda: ControlledRectBody.move_all(bodies, input_state)
+
+
+@benchmark("sprites.batch.1000")
+def _sprites_batch() -> Callable[[], object]:
+    rng = random.Random(0)
+    target = pygame.Surface((Window.width, Window.height))
+    image = pygame.Surface((8, 8))
+    bodies = [BenchBody(rng.uniform(0, 790), rng.uniform(0, 590), 8, 8) for _ in range(1000)]
+    for body in bodies:
+        body.sprite = image
+    batch = SpriteBatch()
+
+    def func() -> None:
+        batch.draw_bodies(bodies)
+        batch.flush(target)
+    return func
+
+
+@benchmark("color.random")
+def _color_random() -> Callable[[], object]:
+    return Color.random
+
+
+@benchmark("color.random.alpha")
+def _color_random_alpha() -> Callable[[], object]:
+    return lambda: Color.random(random_alpha=True)
+
+
+if numpy is not None:
+    @benchmark("color.random_colors.1000")
+    def _random_colors() -> Callable[[], object]:
+        return lambda: random_colors(1000)
+
+    @benchmark("color.apply_table.800x600")
+    def _apply_table() -> Callable[[], object]:
+        surface = pygame.Surface((Window.width, Window.height))
+        values = numpy.random.default_rng(0).random((Window.width, Window.height))
+        table = palette_table((Color.BLUE, Color.GREEN, Color.RED))
+        return lambda: apply_table(surface, values, table)
+
+
+def _event_flood(size: int) -> list[pygame.event.Event]:
+    """Create a flood of events, made of bursts of mouse motion, separated by key presses."""
+    events = []
+    for i in range(size):
+        if i % 20 == 19:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode="a", scancode=4))
+        else:
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=(i % 800, i % 600), rel=(1, 1), buttons=(0, 0, 0)))
+    return events
+
+
+@benchmark("events.dispatch_all.1000")
+def _events_dispatch_all() -> Callable[[], object]:
+    dispatcher = EventDispatcher(lambda event: None)
+    dispatcher.register(pygame.MOUSEMOTION, lambda event: None)
+    dispatcher.register(pygame.KEYDOWN, lambda event: None)
+    events = _event_flood(1000)
+    return lambda: dispatcher.dispatch_all(events)
+
+
+@benchmark("events.dispatch_all.1000.coalesced")
+def _events_dispatch_all_coalesced() -> Callable[[], object]:
+    dispatcher = EventDispatcher(lambda event: None, coalesce_motion=True)
+    dispatcher.register(pygame.MOUSEMOTION, lambda event: None)
+    dispatcher.register(pygame.KEYDOWN, lambda event: None)
+    events = _event_flood(1000)
+    return lambda: dispatcher.dispatch_all(events)
+
+
+@benchmark("events.coalesce_motion.1000")
+def _events_coalesce_motion() -> Callable[[], object]:
+    events = _event_flood(1000)
+    return lambda: coalesce_motion(events)
+
+
+@benchmark("math.number_remap")
+def _number_remap() -> Callable[[], object]:
+    return lambda: number_remap(5, 0, 10, 0, 100)
+
+
+if numpy is not None:
+    @benchmark("math.remap_array.10000")
+    def _remap_array() -> Callable[[], object]:
+        values = numpy.random.default_rng(0).random(10_000)
+        return lambda: remap_array(values, 0, 1, 0, 255, policy="clamp")
+
+    @benchmark("math.distance_matrix.100")
+    def _distance_matrix() -> Callable[[], object]:
+        points = numpy.random.default_rng(0).random((100, 2))
+        return lambda: distance_matrix(points)
+
+
+@benchmark("game.loop.iteration")
+def _game_loop_iteration() -> Callable[[], object]:
+    game = BenchGame(headless=True)
+    game.setup()
+    # Keep the game running forever, only a single iteration is ran per call
+    return lambda: game._run_uncapped_loop(max_ticks=game.tick_count + 1, render=True)
@@ -0,0 +1,96 @@
+"""
+Measure the frame pacing of the game loop while the cost of the ticks varies.
+
+Every tick burns a random amount of CPU time (pure Python), the intervals between the
+rendered frames are compared for ticks running in the main loop (fixed timestep),
+on a worker thread and in a worker process.
+
+Run with: `python -m benchmarks.worker`
+"""
+import random
+import time
+from typing import Any, Optional
+
+from pygame.event import EventType  # type: ignore (see: https://github.com/pygame/pygame/issues/2867)
+
+from benchmarks.suite import make_parser
+from src.config import Window
+from src.util.base_game import BaseGame
+
+MODES = {"main": None, "thread": "thread", "process": "process"}
+
+
+class VariableTickGame(BaseGame):
+    """Game with ticks taking a random amount of time, recording the time of every rendered frame."""
+
+    def __init__(self, tick_worker: Optional[str], duration: float, max_tick_cost: float):
+        super().__init__(fixed_timestep=True, headless=True, tick_worker=tick_worker)
+        self.duration = duration
+        self.max_tick_cost = max_tick_cost
+        self.frame_times: list[float] = []
+        self.deadline = 0.0
+        self.counter = 0
+
+    def setup(self) -> None:
+        """Start the timer."""
+        self.deadline = time.perf_counter() + self.duration
+
+    def tick(self) -> None:
+        """Keep the CPU busy for a random amount of time."""
+        end = time.perf_counter() + random.random() * self.max_tick_cost
+        while time.perf_counter() < end:
+            self.counter += 1
+        if time.perf_counter() > self.deadline:
+            self.running = False
+
+    def snapshot(self) -> Any:
+        """Only the counter is needed to render the frame."""
+        return self.counter
+
+    def redraw_screen(self) -> None:
+        """Record the frame time."""
+        self.frame_times.append(time.perf_counter())
+        self.surface.fill((self.tick_count % 256, 0, 0))
+
+    def handle_user_event(self, event: EventType) -> None:
+        """No events are used."""
+
+    def cleanup(self) -> None:
+        """Nothing to clean up."""
+
+    def continuous_setup(self) -> None:
+        """Not ran continually."""
+
+
+def report(name: str, game: VariableTickGame) -> None:
+    """Print the frame interval percentiles."""
+    ordered = sorted((end - start) * 1000 for start, end in zip(game.frame_times, game.frame_times[1:]))
+    if not ordered:
+        print(f"{name:>8} | no frames rendered")
+        return
+    p50, p99 = ordered[len(ordered) // 2], ordered[int(len(ordered) * 0.99)]
+    print(
+        f"{name:>8} | {len(ordered) + 1:>5} frames | {game.tick_count:>4} ticks | "
+        f"frame interval p50 {p50:>6.2f} ms | p99 {p99:>6.2f} ms | max {ordered[-1]:>6.2f} ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = make_parser(__doc__)
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds to run every mode for")
+    parser.add_argument("--max-tick-cost", type=float, default=0.03, help="Maximum CPU time of a single tick (seconds)")
+    parser.add_argument("--render-rate", type=int, default=60)
+    parser.add_argument("--mode", choices=list(MODES), action="append", help="Only run given mode(s)")
+    args = parser.parse_args()
+
+    Window.render_rate = args.render_rate
+    for name in args.mode or MODES:
+        random.seed(0)
+        game = VariableTickGame(MODES[name], args.duration, args.max_tick_cost)
+        game.start(manage_pygame=False)
+        report(name, game)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
 import src.util.log
+import src.util.startup
 
-src.util.log.setup()
+src.util.log.setup(lazy=True)
+src.util.startup.mark("src imported")
@@ -19,6 +19,12 @@ def get_env_bool(env_name: str) -> bool:
 DEBUG = get_env_bool("DEBUG")
 FILE_LOG = get_env_bool("FILE_LOG")
 TRACE_LOGGERS = os.getenv("GAME_TRACE_LOGGERS", None)
+QUEUE_LOG = get_env_bool("QUEUE_LOG")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10_000))
+LOG_QUEUE_DROP = get_env_bool("LOG_QUEUE_DROP")
+TRUSTED_DESCRIPTORS = get_env_bool("TRUSTED_DESCRIPTORS")
+PROFILE_FRAMES = get_env_bool("PROFILE_FRAMES")
+PROFILE_FRAMES_DUMP = os.getenv("PROFILE_FRAMES_DUMP", None)
 
 
 class Window:
@@ -27,3 +33,13 @@ class Window:
     tick_rate = 30
     height = 600
     width = 800
+
+    # Only used by games running with a fixed timestep or a tick worker (see `BaseGame`)
+    render_rate = 60  # Maximum amount of rendered frames per second, 0 means uncapped (keeps a CPU core busy)
+    max_catchup_ticks = 5  # Maximum amount of ticks ran in a single frame to catch up with real time
+
+    # Only used by games running with adaptive frame pacing (see `FramePacer`)
+    min_tick_rate = 15  # Lowest rate the pacer can lower the tick rate to under load
+    max_tick_rate = 30  # Highest rate the pacer can raise the tick rate to
+    max_frame_skip = 2  # Maximum amount of redraws skipped in a row on overloaded frames
+    max_oversleep = 2.0  # Average oversleep of the clock (in milliseconds) above which busy loop pacing is used
@@ -21,8 +21,28 @@ class Game(BaseGame):
         because it already after this function is called from `self.start` method and
         since you're not expected to add some heavy time-taking logic here (that
         belongs in `self.tick`), there is generally no need to update the screen from here.
+
+        Layers added into `self.layers` are drawn with `self.layers.compose(self.surface)`,
+        only the dynamic (or invalidated) ones get rendered again, the rest is just blitted.
+        Pass a `background` color to clear the surface first, unless an opaque layer covers it.
+
+        When using dirty rect rendering, every changed area of `self.surface` needs to be
+        reported to `self.dirty_rects` (f.e. `self.dirty_rects.add(self.surface.blit(...))`),
+        only these areas will be updated on the screen.
+
+        Bodies in `self.entities` are drawn with `self.entities.draw(self.surface)`, which
+        skips the ones outside of the window (or a given viewport).
+
+        Sprites can also be queued into `self.sprites` (f.e. `body.queue_draw(self.sprites)`),
+        they're all drawn in a single call after this function returns.
+
+        When running with a fixed timestep, `self.interpolation_alpha` (0 to 1) holds the
+        fraction of a tick elapsed since the last tick, which can be used to interpolate
+        between the previous and the current state of moving objects.
         """
-        self.surface.fill(Color.GREY)
+        # Clears the surface with the background color, unless an opaque layer covers all of it
+        self.layers.compose(self.surface, background=Color.GREY)
+        self.entities.draw(self.surface)
 
     def cleanup(self) -> None:
         """
@@ -60,6 +80,9 @@ class Game(BaseGame):
         the continuous loop starts. This means that this function won't hang the game because it may have
         some complex time-intensive initialization tasks between each game reset.
 
+        This is a good place to start preloading assets (`self.assets.preload(manifest)`),
+        they're loaded in the background and waited for once `setup` finishes.
+
         Note: This function won't be ran at all if the game isn't started with `run_continually`.
         """
         pass
@@ -71,5 +94,8 @@ class Game(BaseGame):
         All heavy game logic is expected to go here, however you shouldn't draw anything
         to the screen from here, instead you should override the `redraw_screen` function,
         which is called before each tick.
+
+        The amount of time (in seconds) simulated by this tick is available in `self.delta_time`,
+        when running with a fixed timestep, this is always exactly `1 / Window.tick_rate`.
         """
         pass
@@ -0,0 +1,223 @@
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pygame
+
+from src.util.log import get_logger
+
+log = get_logger(__name__)
+
+PathType = Union[str, Path]
+# Key of a cached asset: (kind, path, *parameters), f.e. ("image", "player.png", True)
+AssetKey = tuple[Any, ...]
+
+# Fonts don't expose their memory usage, this is a rough estimate for the budget
+FONT_SIZE_ESTIMATE = 256 * 1024
+
+
+class AssetManager:
+    """
+    Cache of loaded images, fonts and sounds.
+
+    Assets are cached by their path and loading parameters, so every asset is only ever
+    loaded once (as long as it wasn't evicted). Once the estimated memory of all cached
+    assets exceeds `memory_budget` bytes, the least recently used ones are evicted.
+
+    Images are automatically converted to the display pixel format (`convert` or
+    `convert_alpha`), as long as the display mode was already set, which makes
+    blitting them considerably faster.
+
+    Whole manifests of assets can be preloaded on a thread pool with `preload`, so that
+    they're already available once the game loop starts. Manifest entries use the same
+    format as the cache keys: `("image", path, alpha)` (alpha can be left out, it's
+    `False` by default), `("font", path, size)` (path can be `None` for the default font)
+    and `("sound", path)`. Paths can be strings or `Path` objects, the entries are turned
+    into the same keys as the ones `image`, `font` and `sound` use, malformed entries
+    raise `ValueError`.
+    """
+
+    def __init__(self, assets_dir: PathType = "assets", memory_budget: int = 256 * 1024 * 1024, workers: Optional[int] = None):
+        self.assets_dir = Path(assets_dir)
+        self.memory_budget = memory_budget
+        self.workers = workers
+
+        self._cache: OrderedDict[AssetKey, tuple[Any, int]] = OrderedDict()
+        self._pending: dict[AssetKey, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.memory_used = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_times: dict[AssetKey, float] = {}
+
+    def _resolve(self, path: Optional[PathType]) -> Optional[str]:
+        """Get the path of the asset file, relative to the assets directory."""
+        if path is None:
+            return None
+        return os.fspath(self.assets_dir / path)
+
+    def _load(self, key: AssetKey) -> Any:
+        """Load the asset from the disk (this is thread-safe and can run in the preload workers)."""
+        kind, path, *params = key
+        start = time.perf_counter()
+        if kind == "image":
+            asset = pygame.image.load(self._resolve(path))
+        elif kind == "font":
+            asset = pygame.font.Font(self._resolve(path), *params)
+        elif kind == "sound":
+            asset = pygame.mixer.Sound(self._resolve(path))
+        else:
+            raise ValueError(f"Unknown asset kind: {kind}")
+        self.load_times[key] = time.perf_counter() - start
+        return asset
+
+    def _finalize(self, key: AssetKey, asset: Any) -> Any:
+        """Prepare a loaded asset for use (on the main thread) and store it in the cache."""
+        if key[0] == "image" and pygame.display.get_surface() is not None:
+            asset = asset.convert_alpha() if key[2] else asset.convert()
+
+        self._store(key, asset)
+        return asset
+
+    @staticmethod
+    def _asset_size(asset: Any) -> int:
+        """Get the (estimated) amount of memory used by given asset."""
+        if isinstance(asset, pygame.Surface):
+            return asset.get_pitch() * asset.get_height()
+        if isinstance(asset, pygame.mixer.Sound):
+            mixer_settings = pygame.mixer.get_init()
+            if mixer_settings is None:
+                return 0
+            frequency, sample_format, channels = mixer_settings
+            return int(asset.get_length() * frequency * channels * abs(sample_format) // 8)
+        return FONT_SIZE_ESTIMATE
+
+    def _store(self, key: AssetKey, asset: Any) -> None:
+        """Add the asset to the cache, evicting the least recently used assets if over budget."""
+        size = self._asset_size(asset)
+        self._cache[key] = (asset, size)
+        self.memory_used += size
+
+        # Never evict the asset which was just added, even if it doesn't fit on its own
+        while self.memory_used > self.memory_budget and len(self._cache) > 1:
+            evicted_key, (_, evicted_size) = self._cache.popitem(last=False)
+            self.memory_used -= evicted_size
+            self.evictions += 1
+            log.trace(f"Evicted asset {evicted_key} ({evicted_size} bytes)")
+
+    def get(self, key: AssetKey) -> Any:
+        """Get the asset with given key, loading it if it isn't cached yet."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        pending = self._pending.pop(key, None)
+        asset = pending.result() if pending is not None else self._load(key)
+        return self._finalize(key, asset)
+
+    @staticmethod
+    def image_key(path: PathType, alpha: bool = False) -> AssetKey:
+        """Get the cache key of an image."""
+        return ("image", os.fspath(path), bool(alpha))
+
+    @staticmethod
+    def font_key(path: Optional[PathType], size: int) -> AssetKey:
+        """Get the cache key of a font."""
+        return ("font", None if path is None else os.fspath(path), int(size))
+
+    @staticmethod
+    def sound_key(path: PathType) -> AssetKey:
+        """Get the cache key of a sound."""
+        return ("sound", os.fspath(path))
+
+    def manifest_key(self, entry: Iterable[Any]) -> AssetKey:
+        """Get the cache key of given manifest entry, f.e. `("image", Path("player.png"))` (see `preload`)."""
+        if isinstance(entry, str) or not isinstance(entry, Iterable) or not tuple(entry):
+            raise ValueError(f"Manifest entries have to be non-empty (kind, path, *parameters) tuples, got {entry!r}")
+        kind, *params = entry
+        builders = {"image": self.image_key, "font": self.font_key, "sound": self.sound_key}
+        if kind not in builders:
+            raise ValueError(f"Unknown asset kind in manifest entry {entry!r}, expected one of: {', '.join(builders)}")
+        try:
+            return builders[kind](*params)
+        except TypeError as exc:
+            raise ValueError(f"Malformed {kind} manifest entry {entry!r}: {exc}") from None
+
+    def image(self, path: PathType, alpha: bool = False) -> pygame.Surface:
+        """Get an image, converted to the display format (with per-pixel alpha, if `alpha` is set)."""
+        return self.get(self.image_key(path, alpha))
+
+    def font(self, path: Optional[PathType], size: int) -> pygame.font.Font:
+        """Get a font of given size, `path` can be `None` for the default pygame font."""
+        return self.get(self.font_key(path, size))
+
+    def sound(self, path: PathType) -> pygame.mixer.Sound:
+        """Get a sound."""
+        return self.get(self.sound_key(path))
+
+    def preload(self, manifest: Iterable[Iterable[Any]]) -> None:
+        """
+        Start loading all of the assets from given manifest in the background.
+
+        The assets are loaded on a thread pool, they get finalized (converted) and
+        cached either once they're requested, or by `wait_for_preload`.
+        """
+        # Validate the whole manifest first, so that a malformed entry doesn't leave it half preloaded
+        keys = [self.manifest_key(entry) for entry in manifest]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="asset-loader")
+
+        for key in keys:
+            if key not in self._cache and key not in self._pending:
+                self._pending[key] = self._executor.submit(self._load, key)
+
+    def wait_for_preload(self) -> None:
+        """Wait until all of the preloaded assets are loaded, and cache them."""
+        if not self._pending:
+            return
+
+        start = time.perf_counter()
+        count = len(self._pending)
+        for key, future in list(self._pending.items()):
+            del self._pending[key]
+            self._finalize(key, future.result())
+        log.debug(f"Preloaded {count} assets (waited {(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    def clear(self) -> None:
+        """Remove all of the cached assets."""
+        self._cache.clear()
+        self.memory_used = 0
+
+    def shutdown(self) -> None:
+        """Stop the preloading thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+    def reset_after_fork(self) -> None:
+        """Drop the preloading thread pool inherited by a forked child process, its threads only exist in the parent."""
+        self._executor = None
+        self._pending.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Get the cache statistics (hit/miss/eviction counters, memory usage and load times)."""
+        return {
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory_used": self.memory_used,
+            "memory_budget": self.memory_budget,
+            "total_load_time": sum(self.load_times.values()),
+            "slowest_loads": sorted(self.load_times.items(), key=lambda item: item[1], reverse=True)[:5],
+        }
@@ -1,13 +1,36 @@
+import os
+import random
+import time
 from abc import abstractmethod
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
 
 import pygame
 from pygame.event import EventType  # type: ignore (see: https://github.com/pygame/pygame/issues/2867)
 
+import src.config
 from src.config import Window
+from src.util import startup
+from src.util.assets import AssetManager
+from src.util.body import RectBody
+from src.util.dirty_rects import DirtyRectTracker
+from src.util.entities import EntityManager, Membership
+from src.util.events import EventDispatcher
+from src.util.input import InputState
+from src.util.layers import LayerStack
 from src.util.log import get_logger
+from src.util.pacing import FramePacer
+from src.util.profiler import FrameProfiler, Phase
+from src.util.replay import InputRecorder, PathType, Replay, seed_rngs
+from src.util.scheduler import Schedule, Scheduler
+from src.util.snapshot import BodySnapshot
+from src.util.sprites import SpriteBatch
 
 log = get_logger(__name__)
 
+# Part of the frame sleep (in seconds) waited out in short steps by the async game loop, for precise frame timing
+ASYNC_SLEEP_MARGIN = 0.002
+
 
 class BaseGame:
     """
@@ -16,17 +39,162 @@ class BaseGame:
     You are expected to subclass this class and add the functionality needed
     for your specific game. This class only contains some default functions
     and parameters which are useful for every game.
+
+    By default, the game loop runs a single tick per every rendered frame, at
+    `Window.tick_rate`. With `fixed_timestep`, ticks are ran at a fixed rate
+    of `Window.tick_rate` instead, independently of how often the screen gets
+    rendered (at most `Window.render_rate` times per second, uncapped if it's
+    set to 0, which keeps a whole CPU core busy with redraws). In this mode,
+    `self.interpolation_alpha` tells `redraw_screen` how far between the last
+    and the next tick the rendered frame is, which can be used to interpolate
+    the positions of moving objects.
+
+    With `dirty_rect_rendering`, only the areas reported to `self.dirty_rects`
+    during `redraw_screen` get pushed to the screen, instead of the whole surface.
+
+    Parts of the frame can be rendered into cached offscreen layers in `self.layers`,
+    static layers (f.e. complex backgrounds) are only re-rendered once they're
+    invalidated, `redraw_screen` then composes them with `self.layers.compose(self.surface)`.
+
+    Bodies added into `self.entities` are owned by the game world: after every tick,
+    the awake ones get updated (bodies which stop moving fall asleep) and the template
+    `redraw_screen` draws the ones intersecting the window (see `EntityManager`).
+
+    Delayed and repeating actions (f.e. spawns, cooldowns or animations) can be scheduled
+    in `self.scheduler` (`self.scheduler.call_later(ticks, callback)`, `call_every` or
+    coroutines with `start`), the due ones run at the beginning of every tick.
+
+    Sprites queued into `self.sprites` during `redraw_screen` (f.e. with
+    `self.sprites.draw_bodies(bodies)`) are drawn all at once after it, on top
+    of everything drawn directly onto `self.surface`.
+
+    With `adaptive_pacing`, the default game loop is paced by the `FramePacer` in
+    `self.pacer`, which watches the recent frame times: overloaded frames make the
+    next redraws get skipped (the ticks keep running), the tick rate is lowered or
+    raised within `Window.min_tick_rate` and `Window.max_tick_rate` depending on the
+    load, and the clock switches to a busy loop when its sleeps are too imprecise.
+    The amount of these interventions is logged at the end of the game loop.
+
+    When the `PROFILE_FRAMES` environment variable is set (or when `self.profiler` is
+    set manually), the duration of each phase of every frame gets measured by the
+    `FrameProfiler` in `self.profiler`, and dumped to `PROFILE_FRAMES_DUMP` (if set)
+    at the end of the game loop.
+
+    With `headless`, the SDL dummy video driver is used, so that no window is opened
+    and the game can run without any display (f.e. on servers or in CI). Such games
+    are usually ran through `run_headless`, which runs the ticks as fast as possible.
+
+    Events are dispatched by `self.events`, handlers can be registered for specific
+    event types there (`self.events.register(pygame.KEYDOWN, self.on_key_down)`),
+    events of types without a registered handler go to `handle_user_event`. With
+    `filter_events`, only the event types with registered handlers (or allowed with
+    `self.events.allow`) get into the pygame event queue at all, and with
+    `coalesce_motion`, consecutive MOUSEMOTION events are merged into a single one.
+    Quit events always reach `handle_user_event`, after stopping the game. The keyboard
+    and mouse state is captured once per frame into `self.input`, which should be
+    shared by everything reading it (f.e. `ControlledRectBody.move_all(bodies, self.input)`).
+
+    With `tick_worker` set to "thread" or "process", the ticks run at `Window.tick_rate`
+    on a worker thread (or a forked worker process), while the main loop only handles
+    the events (forwarding them to the worker) and renders the frames, so that slow
+    ticks don't stall the rendering. After each tick, the state returned by `snapshot`
+    is published and the latest complete one is available to `redraw_screen` in
+    `self.latest_snapshot`. In the process mode, the ticks change the state of the
+    game in the worker process only, so `redraw_screen` should only draw from the
+    snapshot (which has to be picklable).
+
+    When running continually, rounds are restarted by running `setup` again, unless
+    `snapshot_bodies` returns the bodies of the game, in which case the rounds are
+    restarted by restoring a packed snapshot of the bodies (see `BodySnapshot`)
+    captured after the first setup, and calling `reset_round`.
+
+    Many independent headless rounds of the game can be ran in parallel, across a
+    process pool, with `src.util.runner` (`python -m src.util.runner src.game:Game`),
+    collecting the result of every round from `round_result`.
+
+    The game loop can also run as a coroutine on an asyncio event loop, with `start_async`
+    or `run_continually_async` (f.e. `asyncio.run(game.run_continually_async())`), in which
+    case the sleep between the frames lets other tasks run and `between_frames` can await
+    I/O after every frame.
+
+    By default, all pygame subsystems are initialized when the game starts, to speed
+    up the startup, set `pygame_subsystems` to the names of the needed ones only
+    (f.e. `("display", "font")`).
     """
 
-    def __init__(self) -> None:
+    # Names of pygame subsystems to initialize (f.e. "display", "font", "mixer"), `None` means all of them
+    pygame_subsystems: Optional[tuple[str, ...]] = None
+
+    def __init__(
+        self,
+        fixed_timestep: bool = False,
+        dirty_rect_rendering: bool = False,
+        headless: bool = False,
+        tick_worker: Optional[str] = None,
+        filter_events: bool = False,
+        coalesce_motion: bool = False,
+        adaptive_pacing: bool = False,
+    ) -> None:
         size = Window.width, Window.height
 
+        self.headless = headless
+        if headless:
+            if pygame.display.get_init() and pygame.display.get_driver() != "dummy":
+                log.warning("Display was already initialized, headless game will use the existing video driver.")
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
         self.surface = pygame.display.set_mode(size)
         self.fps_clock = pygame.time.Clock()
+        self.dirty_rects = DirtyRectTracker(*size) if dirty_rect_rendering else None
+        self.sprites = SpriteBatch(dirty_rects=self.dirty_rects)
+        self.layers = LayerStack()
+        self.entities = EntityManager()
+        self.scheduler = Scheduler()
+        self.assets = AssetManager()
+        self.events = EventDispatcher(self.handle_user_event, filter_events, coalesce_motion)
+        self.events.register(pygame.QUIT, self._on_quit_event)
+        # Keyboard and mouse state, captured once per frame (after the events are received)
+        self.input = InputState.empty()
+
+        self.fixed_timestep = fixed_timestep
+        # Time (in seconds) simulated by the current tick
+        self.delta_time = 1 / Window.tick_rate
+        # Fraction of a tick elapsed since the last tick, when the screen is redrawn
+        self.interpolation_alpha = 1.0
+        # Amount of ticks ran since the game loop was started
+        self.tick_count = 0
+
+        self.tick_worker = tick_worker
+        # Latest complete state snapshot published by the tick worker
+        self.latest_snapshot: Any = None
+
+        # Adjusts the pacing of the default game loop to the load, when adaptive pacing is enabled
+        self.pacer = FramePacer() if adaptive_pacing else None
+        if adaptive_pacing and (fixed_timestep or tick_worker is not None):
+            log.warning("Adaptive pacing is only used by the default game loop, it will be ignored.")
+
+        self.profiler: Optional[FrameProfiler] = None
+        if src.config.PROFILE_FRAMES:
+            self.profiler = FrameProfiler(dump_path=src.config.PROFILE_FRAMES_DUMP)
+
+        # Set by `start_recording`, records the input of the next run of the game
+        self.recorder: Optional[InputRecorder] = None
 
         self.running = True
         self.ended = False
 
+        # Snapshot of the bodies after the first setup, used to restart the rounds when running continually
+        self._setup_snapshot: Optional[BodySnapshot] = None
+        # Callbacks scheduled by the first setup, rescheduled whenever the round is restarted from the snapshot
+        self._setup_schedule: Schedule = []
+        # Bodies owned by `self.entities` after the first setup, restored along with the snapshot
+        self._setup_entities: Membership = ([], frozenset())
+        self._continual = False
+
+        self._startup_reported = False
+        startup.mark("game created")
+
     @property
     def running(self) -> bool:
         """The game can only be running if it hasn't already been ended."""
@@ -43,19 +211,26 @@ class BaseGame:
     def run_continually(self) -> None:
         """Keep resetting the game until `self.ended` is `True`."""
         log.trace("Starting pygame")
-        pygame.init()
+        self._init_pygame()
+        self.continuous_setup()
 
         # Continuous loop
         log.debug("Starting continuous game")
-        while self.ended is False:
-            self.running = True
-            self.start(manage_pygame=False)
-            if self.ended is False:  # Only print this if `self.ended` wasn't already set to `False`
-                log.debug("Restarting game loop (continual run)")
+        self._continual = True
+        try:
+            while self.ended is False:
+                self.running = True
+                self.start(manage_pygame=False)
+                if self.ended is False:  # Only print this if `self.ended` wasn't already set to `False`
+                    log.debug("Restarting game loop (continual run)")
+        finally:
+            self._continual = False
+            self._setup_snapshot = None
+            self._setup_schedule = []
+            self._setup_entities = ([], frozenset())
 
         log.debug("Stopping continuous game")
-        log.trace("Stopping pygame")
-        pygame.quit()
+        self._quit_pygame()
 
     def start(self, manage_pygame: bool = True) -> None:
         """
@@ -67,21 +242,278 @@ class BaseGame:
         to continually run a game which could be useful for full game restarts
         without having to restart the whole program.
         """
-        # Initialization
+        if self.tick_worker is not None:
+            self._start(self._run_worker_loop, manage_pygame)
+        elif self.fixed_timestep:
+            self._start(self._run_fixed_timestep_loop, manage_pygame)
+        else:
+            self._start(self._run_loop, manage_pygame)
+
+    def run_headless(self, max_ticks: Optional[int] = None, render: bool = False, manage_pygame: bool = True) -> float:
+        """
+        Run the game once, running ticks as fast as possible, without waiting for the clock.
+
+        The game runs until `self.running` is set to `False`, or until `max_ticks` ticks
+        were ran (if specified). Events are still processed between the ticks, however
+        `redraw_screen` and the display updates are skipped, unless `render` is set.
+
+        This is mostly useful for simulating many rounds of the game faster than real time
+        (f.e. for balancing or regression tests), in which case the game is usually also
+        created with `headless=True`.
+
+        The amount of ticks simulated per second is logged and returned.
+        """
+        loop_time = 0.0
+
+        def loop() -> None:
+            nonlocal loop_time
+            start_time = time.perf_counter()
+            self._run_uncapped_loop(max_ticks, render)
+            loop_time = time.perf_counter() - start_time
+
+        self._start(loop, manage_pygame)
+
+        ticks_per_second = self.tick_count / loop_time if loop_time > 0 else 0.0
+        log.info(f"Ran {self.tick_count} ticks in {loop_time:.3f}s ({ticks_per_second:.1f} ticks per second)")
+        return ticks_per_second
+
+    def start_recording(self, path: PathType, seed: Optional[int] = None, strict: bool = False) -> int:
+        """
+        Record the input of the next run of the game into given file, which can be replayed by `replay`.
+
+        The global RNGs (`random` and NumPy) are seeded with given seed (random, if not
+        specified), the seed is stored in the recording and returned. At the end of
+        the run, the digest of the final state (from `snapshot`) gets stored too.
+
+        For the replay to be deterministic, the game state has to be created in `setup`
+        (after the RNGs are seeded) and ticks should only rely on the fixed tick duration
+        (f.e. use `fixed_timestep`), rather than on the measured real time. Recording
+        isn't supported when the ticks run on a tick worker.
+
+        Event attributes which can't be serialized are dropped from the recording (with
+        a warning), with `strict`, `ReplayError` is raised instead.
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.recorder = InputRecorder(path, seed, Window.tick_rate, strict)
+        seed_rngs(seed)
+        return seed
+
+    def replay(self, path: PathType, verify: bool = True, manage_pygame: bool = True) -> float:
+        """
+        Replay the recorded input from given file, running ticks as fast as possible.
+
+        The recorded events (and input states) are dispatched before the same ticks
+        as they were during the recording, the live input is ignored and nothing is
+        rendered. With `verify`, the final state of the game (from `snapshot`) is
+        compared with the recorded one, raising `ReplayMismatchError` on a mismatch.
+
+        This makes recordings usable as repeatable workloads for measuring the tick
+        throughput, which is logged and returned (in ticks per second).
+        """
+        recording = Replay.load(path)
+        seed_rngs(recording.seed)
+        loop_time = 0.0
+        final_state = None
+
+        def loop() -> None:
+            nonlocal loop_time, final_state
+            start_time = time.perf_counter()
+            self._run_replay_loop(recording)
+            loop_time = time.perf_counter() - start_time
+            # Final state is taken before the cleanup, which might reset it
+            final_state = self.snapshot()
+
+        self._start(loop, manage_pygame)
+        if verify:
+            recording.verify(self.tick_count, final_state)
+
+        ticks_per_second = self.tick_count / loop_time if loop_time > 0 else 0.0
+        log.info(f"Replayed {self.tick_count} ticks in {loop_time:.3f}s ({ticks_per_second:.1f} ticks per second)")
+        return ticks_per_second
+
+    async def run_continually_async(self) -> None:
+        """
+        Keep resetting the game until `self.ended` is `True`, running the game loop on the asyncio event loop.
+
+        This is the asynchronous variant of `run_continually` (see `start_async`), it can be
+        ran with `asyncio.run(game.run_continually_async())`.
+        """
+        log.trace("Starting pygame")
+        self._init_pygame()
+        self.continuous_setup()
+
+        # Continuous loop
+        log.debug("Starting continuous game (async)")
+        self._continual = True
+        try:
+            while self.ended is False:
+                self.running = True
+                await self.start_async(manage_pygame=False)
+                if self.ended is False:  # Only print this if `self.ended` wasn't already set to `False`
+                    log.debug("Restarting game loop (continual run)")
+        finally:
+            self._continual = False
+            self._setup_snapshot = None
+            self._setup_schedule = []
+            self._setup_entities = ([], frozenset())
+
+        log.debug("Stopping continuous game")
+        self._quit_pygame()
+
+    async def start_async(self, manage_pygame: bool = True) -> None:
+        """
+        Run the game once, with the game loop running as a coroutine on the asyncio event loop.
+
+        Instead of blocking in `Clock.tick`, the sleep between the frames is awaited, so
+        other tasks (f.e. saving files, uploading telemetry or talking to a launcher) run
+        while the game waits for the next frame. After every frame, `between_frames` is
+        awaited, which is the place to await any I/O tied to the game loop.
+
+        The frames are paced by absolute deadlines, so that a late frame (f.e. delayed
+        by another task) doesn't shift all of the following ones. The async loop always
+        runs a single tick per frame, at `Window.tick_rate`.
+        """
+        if self.fixed_timestep or self.tick_worker is not None:
+            log.warning("The async game loop runs a single tick per frame, fixed timestep and tick workers are ignored.")
+        self._begin(manage_pygame)
+        await self._run_async_loop()
+        self._finish(manage_pygame)
+
+    def _start(self, loop: Callable[[], None], manage_pygame: bool) -> None:
+        """Run the game once, using given game loop."""
+        self._begin(manage_pygame)
+        loop()
+        self._finish(manage_pygame)
+
+    def _begin(self, manage_pygame: bool) -> None:
+        """Initialize the game before the game loop starts."""
         if manage_pygame:
             log.trace("Starting pygame")
-            pygame.init()
+            self._init_pygame()
         log.debug("Starting the game loop")
-        self.setup()
+        self.tick_count = 0
+        if self._setup_snapshot is not None:
+            self._setup_snapshot.restore()
+            # Bodies spawned during the previous round are dropped, the removed ones are added back
+            self.entities.restore(self._setup_entities)
+            # Callbacks of the previous round are dropped, the ones scheduled by the setup start over
+            self.scheduler.restore(self._setup_schedule)
+            self.reset_round()
+        else:
+            # Entities and callbacks of the previous round would be added again by the setup
+            self.entities.clear()
+            self.scheduler.clear()
+            self.setup()
+            self._capture_setup_snapshot()
+        # Assets preloaded during the setup are loaded in the background, make sure they're ready
+        self.assets.wait_for_preload()
+        # Handlers are usually registered during the setup, only filter the events afterwards
+        self.events.apply_filter()
+        startup.mark("game set up")
+
+    def _finish(self, manage_pygame: bool) -> None:
+        """Clean up after the game loop has stopped."""
+        if self.recorder is not None:
+            # Final state is taken before the cleanup, which might reset it
+            self.recorder.finish(self.tick_count, self.snapshot())
+            self.recorder = None
+        self.cleanup()
+        if self.profiler is not None and self.profiler.dump_path is not None:
+            self.profiler.dump()
+        log.debug("Stopping the game loop")
+        if manage_pygame:
+            self._quit_pygame()
+
+    def _capture_setup_snapshot(self) -> None:
+        """Capture the snapshot of the bodies after the setup, if the rounds should be restarted from it."""
+        if not self._continual:
+            return
+        bodies = self.snapshot_bodies()
+        if bodies is not None:
+            start_time = time.perf_counter()
+            self._setup_snapshot = BodySnapshot.capture(bodies)
+            self._setup_schedule = self.scheduler.capture()
+            self._setup_entities = self.entities.capture()
+            log.debug(
+                f"Captured setup snapshot of {len(self._setup_snapshot)} bodies "
+                f"({self._setup_snapshot.nbytes} bytes, {(time.perf_counter() - start_time) * 1000:.2f} ms)"
+            )
+
+    def _init_pygame(self) -> None:
+        """Initialize pygame, or only its subsystems listed in `self.pygame_subsystems`."""
+        if self.pygame_subsystems is None:
+            pygame.init()
+        else:
+            for name in self.pygame_subsystems:
+                subsystem = getattr(pygame, name, None)
+                if not hasattr(subsystem, "init"):
+                    raise ValueError(f"Unknown pygame subsystem: {name}")
+                subsystem.init()  # type: ignore
+        startup.mark("pygame initialized")
+
+    def _quit_pygame(self) -> None:
+        """Quit pygame, dropping all of the assets and layer surfaces, which are no longer usable after that."""
+        self.assets.shutdown()
+        self.assets.clear()
+        for layer in self.layers:
+            layer.release()
+        log.trace("Stopping pygame")
+        pygame.quit()
+
+    def _report_startup(self) -> None:
+        """Log the startup timings, once the first frame is done."""
+        self._startup_reported = True
+        startup.mark("first frame")
+        startup.report()
+
+    def _run_tick(self) -> None:
+        """Run a single tick of the game."""
+        self.scheduler.advance()
+        self.tick()
+        self.entities.update()
+        self.tick_count += 1
+        if not self._startup_reported:
+            self._report_startup()
+
+    def _process_events(self) -> None:
+        """Handle all pending pygame events and capture the input state of this frame."""
+        events = pygame.event.get()
+        self.input = InputState.capture()
+        if self.recorder is not None:
+            self.recorder.record(self.tick_count, events, self.input)
+        self.events.dispatch_all(events)
+
+    def _on_quit_event(self, event: EventType) -> None:
+        """Stop the game on quit events, before passing them to `handle_user_event`."""
+        self._handle_quit_event()
+        self.handle_user_event(event)
+
+    def _update_display(self) -> None:
+        """Draw the queued sprites and push the redrawn surface to the screen, limited to the dirty rects when they're tracked."""
+        self.sprites.flush(self.surface)
+        if not self._startup_reported:
+            self._report_startup()
+
+        if self.dirty_rects is None:
+            pygame.display.update()
+            return
+
+        rects = self.dirty_rects.flush()
+        if rects:
+            pygame.display.update(rects)
 
-        # Continual game loop
+    def _run_loop(self) -> None:
+        """Run the game loop, with a single tick per every rendered frame."""
+        profiler = self.profiler
+        pacer = self.pacer
         while self.running:
-            # Event handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self._handle_quit_event()
+            if profiler is not None:
+                profiler.start_frame()
 
-                self.handle_user_event(event)
+            self._process_events()
+            if profiler is not None:
+                profiler.mark(Phase.EVENTS)
 
             # _handle_quit_event could've already stopped the game,
             # we don't want to run the tick logic here since it could
@@ -89,18 +521,228 @@ class BaseGame:
             if not self.running:
                 break
 
+            # Under load, the pacer skips some redraws, so that the ticks can catch up
+            if pacer is None or pacer.should_render():
+                self.redraw_screen()
+                if profiler is not None:
+                    profiler.mark(Phase.REDRAW)
+                self._update_display()
+                if profiler is not None:
+                    profiler.mark(Phase.DISPLAY_UPDATE)
+
+            self._run_tick()
+            if profiler is not None:
+                profiler.mark(Phase.TICK)
+            if pacer is None:
+                self.delta_time = self.fps_clock.tick(Window.tick_rate) / 1000
+            else:
+                self.delta_time = pacer.wait(self.fps_clock) / 1000
+            if profiler is not None:
+                profiler.mark(Phase.SLEEP)
+                profiler.end_frame()
+
+        if pacer is not None:
+            pacer.log_report()
+
+    def _run_fixed_timestep_loop(self) -> None:
+        """
+        Run the game loop, with ticks running at a fixed rate, independently of rendering.
+
+        Elapsed real time is accumulated and consumed by running as many ticks as it
+        fits, each simulating exactly `1 / Window.tick_rate` seconds. If rendering is
+        so slow that more than `Window.max_catchup_ticks` ticks would be needed within
+        a single frame, the remaining time is dropped (the game slows down) instead
+        of spending even more time on catching up.
+        """
+        self.delta_time = tick_duration = 1 / Window.tick_rate
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        profiler = self.profiler
+
+        while self.running:
+            if profiler is not None:
+                profiler.start_frame()
+
+            current_time = time.perf_counter()
+            accumulator += current_time - previous_time
+            previous_time = current_time
+
+            self._process_events()
+            if profiler is not None:
+                profiler.mark(Phase.EVENTS)
+            if not self.running:
+                break
+
+            ticks = 0
+            while accumulator >= tick_duration and ticks < Window.max_catchup_ticks:
+                self._run_tick()
+                accumulator -= tick_duration
+                ticks += 1
+            if profiler is not None:
+                profiler.mark(Phase.TICK)
+
+            if accumulator >= tick_duration:
+                log.trace(f"Game loop fell behind, dropping {accumulator // tick_duration:.0f} ticks")
+                accumulator %= tick_duration
+
+            self.interpolation_alpha = accumulator / tick_duration
             self.redraw_screen()
-            pygame.display.update()
+            if profiler is not None:
+                profiler.mark(Phase.REDRAW)
+            self._update_display()
+            if profiler is not None:
+                profiler.mark(Phase.DISPLAY_UPDATE)
+
+            self.fps_clock.tick(Window.render_rate)
+            if profiler is not None:
+                profiler.mark(Phase.SLEEP)
+                profiler.end_frame()
+
+    def _run_uncapped_loop(self, max_ticks: Optional[int], render: bool) -> None:
+        """Run the game loop without any frame rate limits, optionally stopping after `max_ticks` ticks."""
+        self.delta_time = 1 / Window.tick_rate
+        profiler = self.profiler
+
+        while self.running and (max_ticks is None or self.tick_count < max_ticks):
+            if profiler is not None:
+                profiler.start_frame()
+
+            self._process_events()
+            if profiler is not None:
+                profiler.mark(Phase.EVENTS)
+            if not self.running:
+                break
 
-            self.tick()
-            self.fps_clock.tick(Window.tick_rate)
+            if render:
+                self.redraw_screen()
+                if profiler is not None:
+                    profiler.mark(Phase.REDRAW)
+                self._update_display()
+                if profiler is not None:
+                    profiler.mark(Phase.DISPLAY_UPDATE)
 
-        # Final cleanup
-        self.cleanup()
-        log.debug("Stopping the game loop")
-        if manage_pygame:
-            log.trace("Stopping pygame")
-            pygame.quit()
+            self._run_tick()
+            if profiler is not None:
+                profiler.mark(Phase.TICK)
+                profiler.end_frame()
+
+    def _run_replay_loop(self, recording: Replay) -> None:
+        """Run the ticks as fast as possible, dispatching the recorded input (instead of the live one) before them."""
+        self.delta_time = 1 / recording.tick_rate
+        frames = recording.frames
+
+        while self.running:
+            for events, input_state in frames.get(self.tick_count, ()):
+                if input_state is not None:
+                    self.input = input_state
+                self.events.dispatch_all(events)
+            if not self.running or self.tick_count >= recording.ticks:
+                break
+            self._run_tick()
+
+    async def _run_async_loop(self) -> None:
+        """Run the game loop as a coroutine, awaiting the sleep between the frames (and `between_frames`)."""
+        # Imported here, since it's relatively slow to import and most games never use the async loop
+        import asyncio
+
+        frame_duration = 1 / Window.tick_rate
+        self.delta_time = frame_duration
+        profiler = self.profiler
+        previous_time = next_frame = time.perf_counter()
+
+        while self.running:
+            if profiler is not None:
+                profiler.start_frame()
+
+            self._process_events()
+            if profiler is not None:
+                profiler.mark(Phase.EVENTS)
+            if not self.running:
+                break
+
+            self.redraw_screen()
+            if profiler is not None:
+                profiler.mark(Phase.REDRAW)
+            self._update_display()
+            if profiler is not None:
+                profiler.mark(Phase.DISPLAY_UPDATE)
+
+            self._run_tick()
+            if profiler is not None:
+                profiler.mark(Phase.TICK)
+
+            await self.between_frames()
+
+            # Sleep until the deadline of the next frame, if it's already missed by more than
+            # a whole frame, start counting from now, rather than rushing to catch up
+            next_frame += frame_duration
+            current_time = time.perf_counter()
+            if current_time > next_frame + frame_duration:
+                next_frame = current_time
+            # The event loop can wake up a bit late, the rest of the frame is waited out
+            # in short steps, which still let the other tasks run
+            if next_frame - current_time > ASYNC_SLEEP_MARGIN:
+                await asyncio.sleep(next_frame - current_time - ASYNC_SLEEP_MARGIN)
+            while time.perf_counter() < next_frame:
+                await asyncio.sleep(0)
+
+            current_time = time.perf_counter()
+            self.delta_time = current_time - previous_time
+            previous_time = current_time
+            if profiler is not None:
+                profiler.mark(Phase.SLEEP)
+                profiler.end_frame()
+
+    def _run_worker_loop(self) -> None:
+        """
+        Run the rendering loop, with the ticks running on a tick worker (see `src.util.worker`).
+
+        Quit events are handled right away, all events (and the input state captured
+        after them) are then forwarded to the worker, where they're dispatched by
+        `self.events` (and the input state set to `self.input`) before the next tick.
+        Once the worker stops, exceptions raised by the ticks are re-raised here, just
+        like with the other game loops (see `TickWorker.stop`).
+        """
+        # Imported here, since multiprocessing is only needed once the ticks run on a worker
+        from src.util.worker import make_tick_worker
+
+        worker = make_tick_worker(self.tick_worker, self)  # type: ignore
+        self.latest_snapshot = None
+        profiler = self.profiler
+        worker.start()
+
+        try:
+            while self.running:
+                if profiler is not None:
+                    profiler.start_frame()
+
+                events = pygame.event.get()
+                self.input = InputState.capture()
+                for event in self.events.prepare(events):
+                    if event.type == pygame.QUIT:
+                        self._handle_quit_event()
+                    worker.forward_event(event)
+                worker.forward_input(self.input)
+                if profiler is not None:
+                    profiler.mark(Phase.EVENTS)
+                if not self.running or not worker.poll():
+                    break
+
+                self.latest_snapshot = worker.latest_snapshot
+                self.redraw_screen()
+                if profiler is not None:
+                    profiler.mark(Phase.REDRAW)
+                self._update_display()
+                if profiler is not None:
+                    profiler.mark(Phase.DISPLAY_UPDATE)
+
+                self.fps_clock.tick(Window.render_rate)
+                if profiler is not None:
+                    profiler.mark(Phase.SLEEP)
+                    profiler.end_frame()
+        finally:
+            worker.stop()
+            self.latest_snapshot = worker.latest_snapshot
 
     def _handle_quit_event(self) -> None:
         """
@@ -116,6 +758,63 @@ class BaseGame:
         self.running = False
         self.ended = True
 
+    async def between_frames(self) -> None:
+        """
+        Await any I/O between the frames, when the game loop runs on the asyncio event loop.
+
+        This is awaited after every tick of the async game loop (see `start_async`), before
+        the sleep until the next frame. Anything awaited here delays the next frame, so
+        longer I/O should rather be started as a separate task (`asyncio.create_task`),
+        which then runs while the game loop sleeps.
+        """
+        pass
+
+    def snapshot(self) -> Any:
+        """
+        Get a snapshot of the game state, for rendering it while the next tick runs.
+
+        This is used when the ticks run on a tick worker, the returned snapshot
+        must not be modified afterwards (build a new one for every tick), in the
+        process mode, it also has to be picklable. Input recordings also store
+        the digest of the final snapshot, to verify the replays against it.
+        """
+        return None
+
+    def snapshot_bodies(self) -> Optional[Sequence[RectBody]]:
+        """
+        Get the bodies which should be restored from a snapshot when the round restarts.
+
+        When running continually and this returns the bodies (after `setup`), their state
+        is captured right after the first setup. Every next round then restores this
+        snapshot in place (and calls `reset_round`), instead of running `setup` again,
+        which is much faster for large worlds. The bodies owned by `self.entities` are
+        restored too, bodies spawned during the round are removed and the removed ones
+        are added back. By default, `None` is returned and `setup` runs before every round.
+        """
+        return None
+
+    def round_result(self) -> Any:
+        """
+        Get the result of the finished round (f.e. the score), reported by the parallel runner.
+
+        Many headless rounds can be ran in parallel with `src.util.runner`, which collects
+        this result from every round once it stops (it has to be picklable). By default,
+        the final state from `snapshot` is returned.
+        """
+        return self.snapshot()
+
+    def reset_round(self) -> None:
+        """
+        Reset the state of the game which isn't restored from the body snapshot (f.e. score).
+
+        This is called instead of `setup` when the round is restarted by restoring
+        the snapshot of the bodies from `snapshot_bodies`. The callbacks which were
+        pending in `self.scheduler` after the first setup are rescheduled with their
+        original delays, however coroutines started by the setup can't be restarted,
+        they (and anything else the round needs scheduled) have to be started here.
+        """
+        pass
+
     @abstractmethod
     def handle_user_event(self, event: EventType) -> None:
         """Handle pygame events (f.e.: click, keydown)."""
@@ -132,6 +831,21 @@ class BaseGame:
         because it already after this function is called from `self.start` method and
         since you're not expected to add some heavy time-taking logic here (that
         belongs in `self.tick`), there is generally no need to update the screen from here.
+
+        Layers added into `self.layers` are drawn with `self.layers.compose(self.surface)`,
+        only the dynamic (or invalidated) ones get rendered again, the rest is just blitted.
+        Pass a `background` color to clear the surface first, unless an opaque layer covers it.
+
+        When using dirty rect rendering, every changed area of `self.surface` needs to be
+        reported to `self.dirty_rects` (f.e. `self.dirty_rects.add(self.surface.blit(...))`),
+        only these areas will be updated on the screen.
+
+        Sprites can also be queued into `self.sprites` (f.e. `body.queue_draw(self.sprites)`),
+        they're all drawn in a single call after this function returns.
+
+        When running with a fixed timestep, `self.interpolation_alpha` (0 to 1) holds the
+        fraction of a tick elapsed since the last tick, which can be used to interpolate
+        between the previous and the current state of moving objects.
         """
         pass
 
@@ -186,5 +900,8 @@ class BaseGame:
         All heavy game logic is expected to go here, however you shouldn't draw anything
         to the screen from here, instead you should override the `redraw_screen` function,
         which is called before each tick.
+
+        The amount of time (in seconds) simulated by this tick is available in `self.delta_time`,
+        when running with a fixed timestep, this is always exactly `1 / Window.tick_rate`.
         """
         pass
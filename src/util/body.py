@@ -1,13 +1,22 @@
+import math
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
+from typing import Optional, TYPE_CHECKING
 
 import pygame
 
 from src.config import Window
-from src.util.descriptor import Coordinate
+from src.util.descriptor import Coordinate, DescriptorOwner, Numeric
+from src.util.input import InputState
 from src.util.typing import NumericType
 
+if TYPE_CHECKING:
+    from src.util.collision import CollisionWorld
+    from src.util.entities import EntityManager
+    from src.util.sprites import SpriteBatch, SpriteSource
 
-class RectBody(ABC):
+
+class RectBody(DescriptorOwner, ABC):
     """
     This is an abstract default class for a rectangle body in pygame.
 
@@ -15,8 +24,24 @@ class RectBody(ABC):
     which will include the needed specific functionality.
     """
 
-    x = Coordinate(window_border=Window.width)
-    y = Coordinate(window_border=Window.height)
+    x = Coordinate(window_border=Window.width, on_change="_hitbox_changed")
+    y = Coordinate(window_border=Window.height, on_change="_hitbox_changed")
+    width = Numeric(on_change="_hitbox_changed")
+    height = Numeric(on_change="_hitbox_changed")
+
+    # Set by `CollisionWorld` once this body gets registered into it
+    _collision_world: Optional["CollisionWorld"] = None
+    # Set by `EntityManager` once this body gets added into it
+    _entity_manager: Optional["EntityManager"] = None
+    # Lazily built hitbox rect, reset whenever position or size changes
+    _hitbox: Optional[pygame.Rect] = None
+
+    # Image (surface or texture atlas key) drawn at the body position by `queue_draw`
+    sprite: Optional["SpriteSource"] = None
+    # Sprites of bodies in lower layers are drawn first
+    layer = 0
+    # Whether the entity manager can put this body to sleep once it stops moving
+    can_sleep = True
 
     def __init__(self, x: NumericType, y: NumericType, width: NumericType, height: NumericType):
         self.x = x
@@ -29,17 +54,94 @@ class RectBody(ABC):
         """Draw the Body object at a pygame surface."""
         raise NotImplementedError("`draw` is an abstract method, it must be implemented in the child class first.")
 
+    def update(self) -> None:
+        """
+        Update the body in a tick (f.e. move it), this is called by `EntityManager` for awake bodies.
+
+        Bodies which don't move for a while are put to sleep and no longer updated,
+        until they move again. Moving is detected by the writes to the position or
+        the size of the body (`x`, `y`, `width`, `height`), so a body which didn't
+        write any of them for `EntityManager.sleep_after` ticks falls asleep, even if
+        this method did other work. If the body needs to be updated even while it
+        stands still (f.e. it waits for a timer or for the input), set `can_sleep`
+        to `False`.
+        """
+        return None
+
+    def queue_draw(self, batch: "SpriteBatch") -> None:
+        """
+        Hand the visuals of this body over to given sprite batch, instead of drawing them right away.
+
+        By default, `self.sprite` is queued at the position of the body, this can be overridden
+        for bodies made of multiple sprites. To queue many bodies at once, use `batch.draw_bodies`.
+        """
+        batch.draw(self.sprite, (self.x, self.y), self.layer)
+
+    def _hitbox_changed(self) -> None:
+        """Invalidate the cached hitbox and keep the collision world and the entity manager (if any) in sync."""
+        self._hitbox = None
+        if self._collision_world is not None:
+            self._collision_world.update(self)
+        if self._entity_manager is not None:
+            self._entity_manager.mark_moved(self)
+
     @property
     def hitbox(self) -> pygame.Rect:
-        """Get the rect hitbox of this body."""
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+        """
+        Get the rect hitbox of this body.
+
+        The rect is cached and only rebuilt after `x`, `y`, `width` or `height` changes,
+        which means the same instance is returned on repeated access. You shouldn't modify
+        it in place, if you need to, make a copy first (`body.hitbox.copy()`).
+        """
+        if self._hitbox is None:
+            self._hitbox = pygame.Rect(self.x, self.y, self.width, self.height)
+        return self._hitbox
+
+    def _set_rect(self, value: pygame.Rect) -> None:
+        """Move and resize the body to given rect (the usual `self.rect = pygame.Rect(...)` pygame idiom)."""
+        x, y, width, height = pygame.Rect(value)
+        self.x = x
+        self.y = y
+        self.width = float(width)
+        self.height = float(height)
+
+    # Pygame treats any object with a `rect` attribute as rect-like, this allows passing
+    # bodies directly to `pygame.Rect` collision methods, without building any rects.
+    # The getter is shared with `hitbox` (rather than calling it), to keep these lookups cheap.
+    rect = property(hitbox.fget, _set_rect)
 
     def collides(self, other: "RectBody") -> bool:
-        """Check if 2 bodies in collision with each other."""
-        return all([
-            self.hitbox.left < other.hitbox.right and self.hitbox.right > other.hitbox.left,  # X axis collision
-            self.hitbox.top < other.hitbox.bottom and self.hitbox.bottom > other.hitbox.top,  # Y axis collision
-        ])
+        """
+        Check if 2 bodies in collision with each other.
+
+        This compares the stored coordinates directly, so it doesn't allocate anything
+        and it isn't affected by the integer rounding of `pygame.Rect`.
+        """
+        x, y = self.x, self.y
+        other_x, other_y = other.x, other.y
+        return (
+            x < other_x + other.width and x + self.width > other_x  # X axis collision
+            and y < other_y + other.height and y + self.height > other_y  # Y axis collision
+        )
+
+    def collides_any(self, others: Sequence["RectBody"]) -> bool:
+        """
+        Check if this body is in collision with any of the given bodies.
+
+        Unlike `collides`, this works with the (integer) hitbox rects, but the whole
+        check runs in a single `pygame.Rect.collidelist` call.
+        """
+        return self.hitbox.collidelist(others) != -1
+
+    def collide_indices(self, others: Sequence["RectBody"]) -> list[int]:
+        """
+        Get indices of all given bodies which are in collision with this body.
+
+        Unlike `collides`, this works with the (integer) hitbox rects, but the whole
+        check runs in a single `pygame.Rect.collidelistall` call.
+        """
+        return self.hitbox.collidelistall(others)
 
 
 class ControlledRectBody(RectBody):
@@ -48,9 +150,17 @@ class ControlledRectBody(RectBody):
 
     This class is expected to be subclassed by a specific type of body
     which will include the needed specific functionality.
+
+    With `normalize_diagonal`, moving diagonally is as fast as moving along a single
+    axis (otherwise it's faster by sqrt(2)). With `clamp`, the body is kept within
+    the window instead of raising `ValueError` when it would move out of it.
     """
 
     REQUIRED_MOVE_KEYS = ("left", "right", "up", "down")
+    # Unit movement vector of each of the move keys
+    MOVE_DIRECTIONS: dict[str, tuple[int, int]] = {"left": (-1, 0), "right": (1, 0), "up": (0, -1), "down": (0, 1)}
+    # Controlled bodies stand still until a key is pressed, the input alone wouldn't wake them up
+    can_sleep = False
 
     def __init__(
         self,
@@ -59,33 +169,64 @@ class ControlledRectBody(RectBody):
         width: NumericType,
         height: NumericType,
         velocity: NumericType,
-        move_keys: dict[str, int]
+        move_keys: dict[str, int],
+        *,
+        normalize_diagonal: bool = False,
+        clamp: bool = False,
     ):
         super().__init__(x, y, width, height)
         self.velocity = velocity
         self.move_keys = move_keys
+        self.normalize_diagonal = normalize_diagonal
+        self.clamp = clamp
 
-    def move(self) -> None:
+    def move(self, input_state: Optional[InputState] = None) -> None:
         """
         Move the object based on user's input accordingly to `self.move_keys`.
 
-        If the user goes out of screen bounds ValueError will be raised,
-        describing the out of bounds error and the coordinates will not be changed.
+        The pressed keys are read from given input state (usually `BaseGame.input`, which
+        is captured once per frame), if it's not specified, pygame is queried directly.
+
+        If the user goes out of screen bounds (and `self.clamp` isn't set) ValueError
+        will be raised, describing the out of bounds error.
 
         You will most likely want to override this class to suppress this exception.
         """
-        keys_pressed = pygame.key.get_pressed()
+        keys_pressed = input_state.keys if input_state is not None else pygame.key.get_pressed()
+        self._move(keys_pressed)
 
-        for movement, key in self.move_keys.items():
+    @classmethod
+    def move_all(cls, bodies: Iterable["ControlledRectBody"], input_state: Optional[InputState] = None) -> None:
+        """Move all of given bodies, reading the pressed keys only once for all of them."""
+        keys_pressed = input_state.keys if input_state is not None else pygame.key.get_pressed()
+        for body in bodies:
+            body._move(keys_pressed)
+
+    def _move(self, keys_pressed: Sequence[bool]) -> None:
+        """Move the object based on given state of the keys."""
+        dx = dy = 0
+        for key, direction_x, direction_y in self._key_vectors:
             if keys_pressed[key]:
-                if movement == "left":
-                    self.x -= self.velocity
-                elif movement == "right":
-                    self.x += self.velocity
-                elif movement == "up":
-                    self.y -= self.velocity
-                elif movement == "down":
-                    self.y += self.velocity
+                dx += direction_x
+                dy += direction_y
+        if not dx and not dy:
+            return
+
+        velocity = self.velocity
+        if dx and dy and self.normalize_diagonal:
+            velocity /= math.hypot(dx, dy)
+
+        x = self.x + dx * velocity
+        y = self.y + dy * velocity
+        if self.clamp:
+            x_bounds, y_bounds = type(self).x, type(self).y  # type: ignore
+            x = max(x_bounds.min, min(x, x_bounds.max - self.width))
+            y = max(y_bounds.min, min(y, y_bounds.max - self.height))
+
+        if dx:
+            self.x = x
+        if dy:
+            self.y = y
 
     @property
     def move_keys(self) -> dict[str, int]:
@@ -94,7 +235,7 @@ class ControlledRectBody(RectBody):
 
     @move_keys.setter
     def move_keys(self, value: dict[str, int]) -> None:
-        """Ensure that move_keys dictionary contains all needed move_keys."""
+        """Ensure that move_keys dictionary contains all needed move_keys and precompute the movement vectors."""
         if not isinstance(value, dict):
             raise TypeError(f"move_keys must be a dict, got {value.__class__.__qualname__}")
 
@@ -109,3 +250,7 @@ class ControlledRectBody(RectBody):
                 raise ValueError(f"move_keys[{required_key}] parameter must be a pygame key, got {obtained_type}")
 
         self._move_keys = value
+        # (key, dx, dy) for every movement, so that moving doesn't need to compare the movement names
+        self._key_vectors = tuple(
+            (key, *self.MOVE_DIRECTIONS[movement]) for movement, key in value.items() if movement in self.MOVE_DIRECTIONS
+        )
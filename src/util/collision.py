@@ -0,0 +1,181 @@
+from collections.abc import Iterable
+from typing import Optional, TYPE_CHECKING, Union
+
+import pygame
+
+from src.config import Window
+from src.util.typing import NumericType
+
+if TYPE_CHECKING:
+    from src.util.body import RectBody
+
+RectLike = Union[pygame.Rect, tuple[NumericType, NumericType, NumericType, NumericType]]
+CellRange = tuple[int, int, int, int]
+
+
+class CollisionWorld:
+    """
+    Broadphase collision index for `RectBody` instances, implemented as a uniform grid.
+
+    The game window is split into `columns` x `rows` cells (cell size is derived from
+    `Window.width` and `Window.height`) and every registered body is stored in each of
+    the cells its hitbox overlaps. Collision queries then only need to compare bodies
+    sharing a cell, instead of comparing every pair of bodies in the game.
+
+    Bodies are kept in sync automatically, whenever `x`, `y`, `width` or `height` of a
+    registered body is changed through its descriptors, the body is moved to the new cells.
+    """
+
+    def __init__(self, columns: int = 32, rows: int = 24, width: NumericType = Window.width, height: NumericType = Window.height):
+        if columns < 1 or rows < 1:
+            raise ValueError(f"CollisionWorld needs at least 1 column and 1 row, got {columns}x{rows}")
+
+        self.columns = columns
+        self.rows = rows
+        self.cell_width = width / columns
+        self.cell_height = height / rows
+
+        self._cells: list[set["RectBody"]] = [set() for _ in range(columns * rows)]
+        self._body_cells: dict["RectBody", CellRange] = {}
+
+    def __len__(self) -> int:
+        """Get the amount of registered bodies."""
+        return len(self._body_cells)
+
+    def __contains__(self, body: "RectBody") -> bool:
+        """Check whether given body is registered in this world."""
+        return body in self._body_cells
+
+    def __iter__(self) -> "Iterable[RectBody]":
+        """Iterate over all registered bodies."""
+        return iter(self._body_cells)
+
+    def _cell_range(self, x: float, y: float, width: float, height: float) -> CellRange:
+        """Get the (inclusive) range of cell indices overlapped by given rectangle, clamped to the grid."""
+        max_column = self.columns - 1
+        max_row = self.rows - 1
+        # Rectangles are half-open (right/bottom edges aren't a part of them), subtracting a tiny
+        # bit from the far edge prevents adding bodies to cells they only touch with their edge.
+        right = x + width - 1e-9 if width > 0 else x
+        bottom = y + height - 1e-9 if height > 0 else y
+        return (
+            min(max(int(x // self.cell_width), 0), max_column),
+            min(max(int(y // self.cell_height), 0), max_row),
+            min(max(int(right // self.cell_width), 0), max_column),
+            min(max(int(bottom // self.cell_height), 0), max_row),
+        )
+
+    def _cells_in_range(self, cell_range: CellRange) -> "Iterable[set[RectBody]]":
+        """Yield all cells within given cell range."""
+        col_start, row_start, col_end, row_end = cell_range
+        cells = self._cells
+        for row in range(row_start, row_end + 1):
+            offset = row * self.columns
+            for column in range(col_start, col_end + 1):
+                yield cells[offset + column]
+
+    def add(self, body: "RectBody") -> None:
+        """Register a new body, making it a part of this world."""
+        if body._collision_world is not None:
+            raise ValueError(f"{body!r} is already registered in a collision world.")
+
+        cell_range = self._cell_range(body.x, body.y, body.width, body.height)
+        for cell in self._cells_in_range(cell_range):
+            cell.add(body)
+        self._body_cells[body] = cell_range
+        body._collision_world = self
+
+    def remove(self, body: "RectBody") -> None:
+        """Unregister given body from this world."""
+        try:
+            cell_range = self._body_cells.pop(body)
+        except KeyError:
+            raise ValueError(f"{body!r} isn't registered in this collision world.")
+
+        for cell in self._cells_in_range(cell_range):
+            cell.discard(body)
+        body._collision_world = None
+
+    def update(self, body: "RectBody") -> None:
+        """
+        Move given body to the cells matching its current hitbox.
+
+        This is called automatically whenever the hitbox of the body changes, as long as
+        the body only moves within the same cells, this is just a cheap comparison.
+        """
+        old_range = self._body_cells[body]
+        # Descriptors store the values in the instance dict, reading them from there skips the Python level getters
+        state = body.__dict__
+        new_range = self._cell_range(state["x"], state["y"], state["width"], state["height"])
+        if new_range == old_range:
+            return
+
+        for cell in self._cells_in_range(old_range):
+            cell.discard(body)
+        for cell in self._cells_in_range(new_range):
+            cell.add(body)
+        self._body_cells[body] = new_range
+
+    def query_rect(self, rect: RectLike, exclude: Optional["RectBody"] = None) -> set["RectBody"]:
+        """Get all bodies colliding with given rectangle, optionally excluding a single body (usually the asking one)."""
+        left, top, width, height = rect
+        right = left + width
+        bottom = top + height
+
+        found = set()
+        for cell in self._cells_in_range(self._cell_range(left, top, width, height)):
+            for body in cell:
+                state = body.__dict__
+                x, y = state["x"], state["y"]
+                if x < right and x + state["width"] > left and y < bottom and y + state["height"] > top:
+                    found.add(body)
+
+        found.discard(exclude)
+        return found
+
+    def query_point(self, x: NumericType, y: NumericType) -> set["RectBody"]:
+        """Get all bodies containing given point (following `pygame.Rect.collidepoint` edge semantics)."""
+        column = min(max(int(x // self.cell_width), 0), self.columns - 1)
+        row = min(max(int(y // self.cell_height), 0), self.rows - 1)
+
+        return {
+            body for body in self._cells[row * self.columns + column]
+            if body.x <= x < body.x + body.width and body.y <= y < body.y + body.height
+        }
+
+    def all_colliding_pairs(self) -> list[tuple["RectBody", "RectBody"]]:
+        """
+        Get all pairs of registered bodies which are in collision with each other.
+
+        Since a pair of bodies can share multiple cells, each pair is only reported
+        from the cell containing the top-left corner of their intersection, which
+        makes sure every pair is only present once, without any extra bookkeeping.
+        """
+        pairs = []
+        cell_width = self.cell_width
+        cell_height = self.cell_height
+        columns = self.columns
+        max_column = columns - 1
+        max_row = self.rows - 1
+
+        for index, cell in enumerate(self._cells):
+            if len(cell) < 2:
+                continue
+
+            row, column = divmod(index, columns)
+            bodies = list(cell)
+            for i, first in enumerate(bodies):
+                x1, y1 = first.x, first.y
+                right1, bottom1 = x1 + first.width, y1 + first.height
+                for second in bodies[i + 1:]:
+                    x2, y2 = second.x, second.y
+                    if not (x1 < x2 + second.width and right1 > x2 and y1 < y2 + second.height and bottom1 > y2):
+                        continue
+
+                    # Only report the pair from the cell owning the intersection's top-left corner
+                    owner_column = min(max(int(max(x1, x2) // cell_width), 0), max_column)
+                    owner_row = min(max(int(max(y1, y2) // cell_height), 0), max_row)
+                    if owner_column == column and owner_row == row:
+                        pairs.append((first, second))
+
+        return pairs
@@ -1,7 +1,18 @@
 import random
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Optional, TYPE_CHECKING, Union
 
 import pygame
 
+# Batch color operations need NumPy (an optional dependency), it's only imported once they're used
+from src.util.lazy_numpy import require_numpy
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+ColorType = Union[pygame.Color, tuple[int, int, int], tuple[int, int, int, int]]
+
 
 class MetaColor(type):
     """
@@ -45,9 +56,142 @@ class Color(pygame.Color, metaclass=MetaColor):
         By default, this random color will not be transparent (alpha value of 255),
         if random transparency is also desired, use `random_alpha=True`.
         """
-        return cls(
-            random.randint(0, 255),
-            random.randint(0, 255),
-            random.randint(0, 255),
-            random.randint(0, 255) if random_alpha else 255
-        )
+        # A single call for all of the channels, packed as 0xRRGGBBAA
+        if random_alpha:
+            return cls(random.getrandbits(32))
+        return cls(random.getrandbits(24) << 8 | 0xFF)
+
+
+def _rgba(color: ColorType) -> tuple[int, int, int, int]:
+    """Get a hashable RGBA tuple from given color."""
+    return tuple(pygame.Color(color))  # type: ignore
+
+
+def random_colors(amount: int, random_alpha: bool = False, seed: Optional[int] = None) -> "NDArray":
+    """
+    Generate `amount` random colors at once, as an `(amount, 4)` array of RGBA values (uint8).
+
+    Same as with `Color.random`, the colors aren't transparent (alpha value of 255),
+    unless `random_alpha=True` is used. Unless a `seed` is given, the colors come from
+    the global NumPy RNG, so they're reproducible once it's seeded (f.e. by `seed_rngs`
+    when recording or replaying a game).
+    """
+    numpy = require_numpy("Batch color operations")
+    if seed is None:
+        colors = numpy.random.randint(0, 256, size=(amount, 4), dtype=numpy.uint8)
+    else:
+        colors = numpy.random.default_rng(seed).integers(0, 256, size=(amount, 4), dtype=numpy.uint8)
+    if not random_alpha:
+        colors[:, 3] = 255
+    return colors
+
+
+def lerp_colors(start: "ArrayLike", end: "ArrayLike", t: "ArrayLike") -> "NDArray":
+    """
+    Linearly interpolate between `start` and `end` colors by `t` (0 = start, 1 = end).
+
+    All of the arguments can be arrays (broadcast against each other), colors are expected
+    in the last axis (RGB or RGBA). To interpolate N colors by N different amounts, pass `t`
+    with a shape of `(N, 1)`. The result is an array of uint8 values.
+    """
+    numpy = require_numpy("Batch color operations")
+    start = numpy.asarray(start, dtype=numpy.float32)
+    end = numpy.asarray(end, dtype=numpy.float32)
+    t = numpy.asarray(t, dtype=numpy.float32)
+    return numpy.rint(start + (end - start) * t).astype(numpy.uint8)
+
+
+def blend_colors(source: "ArrayLike", destination: "ArrayLike", alpha: "ArrayLike") -> "NDArray":
+    """
+    Blend `source` colors over `destination` colors, with given opacity `alpha` (0-255).
+
+    This is the standard "over" alpha blending, done in integer arithmetic, all of the
+    arguments can be arrays (broadcast against each other). Result is an array of uint8 values.
+    """
+    numpy = require_numpy("Batch color operations")
+    source = numpy.asarray(source, dtype=numpy.uint16)
+    destination = numpy.asarray(destination, dtype=numpy.uint16)
+    alpha = numpy.asarray(alpha, dtype=numpy.uint16)
+    return ((source * alpha + destination * (255 - alpha) + 127) // 255).astype(numpy.uint8)
+
+
+@lru_cache(maxsize=128)
+def _gradient_table(start: tuple[int, ...], end: tuple[int, ...], steps: int) -> "NDArray":
+    """Build the gradient lookup table (cached)."""
+    numpy = require_numpy("Batch color operations")
+    t = numpy.linspace(0, 1, steps, dtype=numpy.float32)[:, None]
+    table = lerp_colors(start, end, t)
+    table.setflags(write=False)  # Cached tables are shared, make sure they can't be altered
+    return table
+
+
+@lru_cache(maxsize=128)
+def _palette_table(colors: tuple[tuple[int, ...], ...], steps: int) -> "NDArray":
+    """Build the palette lookup table (cached)."""
+    numpy = require_numpy("Batch color operations")
+    stops = numpy.asarray(colors, dtype=numpy.float32)
+    positions = numpy.linspace(0, len(colors) - 1, steps, dtype=numpy.float32)
+    lower = numpy.minimum(positions.astype(numpy.intp), len(colors) - 2)
+    table = lerp_colors(stops[lower], stops[lower + 1], (positions - lower)[:, None])
+    table.setflags(write=False)
+    return table
+
+
+def gradient_table(start: ColorType, end: ColorType, steps: int = 256) -> "NDArray":
+    """
+    Get a lookup table of `steps` RGBA colors, gradually going from `start` to `end` color.
+
+    Tables are cached by their endpoints and step count, so repeated calls are almost free.
+    The returned array (`(steps, 4)` uint8) is shared, and therefore read-only.
+    """
+    require_numpy("Batch color operations")
+    if steps < 2:
+        raise ValueError(f"Gradient table needs at least 2 steps, got {steps}")
+    return _gradient_table(_rgba(start), _rgba(end), steps)
+
+
+def palette_table(colors: Sequence[ColorType], steps: int = 256) -> "NDArray":
+    """
+    Get a lookup table of `steps` RGBA colors, evenly going through all of the given `colors`.
+
+    This is useful for multi-color gradients, such as heat-maps (f.e. blue -> green -> red).
+    Tables are cached by their colors and step count, the returned array is read-only.
+    """
+    require_numpy("Batch color operations")
+    if len(colors) < 2 or steps < 2:
+        raise ValueError(f"Palette table needs at least 2 colors and 2 steps, got {len(colors)} colors and {steps} steps")
+    return _palette_table(tuple(_rgba(color) for color in colors), steps)
+
+
+def apply_table(surface: pygame.Surface, values: "ArrayLike", table: "NDArray") -> None:
+    """
+    Color the whole `surface` by looking up each of the given `values` in the color `table`.
+
+    `values` is a 2D array of the same size as the surface (indexed as `[x, y]`, the same way
+    as `pygame.surfarray`), holding numbers between 0 and 1, which are mapped to the entries of
+    the table (f.e. from `gradient_table` or `palette_table`). This is useful for heat-maps.
+    """
+    numpy = require_numpy("Batch color operations")
+    values = numpy.asarray(values)
+    if values.shape != surface.get_size():
+        raise ValueError(f"Values shape {values.shape} doesn't match the surface size {surface.get_size()}")
+
+    last = len(table) - 1
+    scaled = values * last
+    numpy.clip(scaled, 0, last, out=scaled)
+    # Smaller index type means less memory to go through, which makes a big difference here
+    indices = scaled.astype(numpy.uint8 if last <= 255 else numpy.intp)
+    pygame.surfarray.blit_array(surface, numpy.take(table[:, :3], indices, axis=0))
+
+
+def fade_surface(surface: pygame.Surface, color: ColorType, amount: float) -> None:
+    """
+    Fade the whole `surface` towards given `color`, in place.
+
+    `amount` is the strength of the fade, going from 0 (no change) to 1 (filled with `color`).
+    """
+    require_numpy("Batch color operations")
+    alpha = round(min(max(amount, 0), 1) * 255)
+    pixels = pygame.surfarray.pixels3d(surface)
+    pixels[...] = blend_colors(_rgba(color)[:3], pixels, alpha)
+    del pixels  # Unlock the surface
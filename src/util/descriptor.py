@@ -1,6 +1,9 @@
+import copy
 import math
-from typing import Any, Generic, TypeVar
+from collections.abc import Callable
+from typing import Any, Generic, Optional, TypeVar
 
+import src.config
 from src.util.typing import NumericType
 
 T = TypeVar("T")
@@ -13,8 +16,31 @@ class Descriptor(Generic[T]):
     It doesn't really do much but it provides us with a basis for all other
     descriptors, which can then override these methods (most notably the
     setter method) in order to impose restrictions.
+
+    Optionally, `on_change` keyword argument can be passed, holding a name of a method
+    on the owner instance, which will get called (without arguments) after every
+    successful assignment. This allows the owner to react to the change, for example
+    by invalidating cached values derived from the held value.
+
+    Since descriptors are commonly used in very hot code (such as movement), the setter
+    isn't implemented by chaining the checks of all parent classes with `super()` calls.
+    Instead, each class only provides the source code of its checks (`_setter_source`)
+    and a single specialized setter function is generated for every descriptor, once
+    its name is known. Whenever the values the setter was generated from change (f.e.
+    `NumericRange.min`), it gets generated again. Subclasses can still override `__set__`
+    (f.e. to adjust the value), calling `super().__set__` runs the generated setter.
+
+    Validation can be turned off for trusted code (f.e. in release builds), either
+    globally, with the `TRUSTED_DESCRIPTORS` environment variable, or for descriptors
+    of a single class (and its subclasses), by setting `trusted_descriptors = True` class
+    variable on it. Trusted descriptors only perform the assignment (and any required
+    value adjustments), the API stays the same. Inherited descriptors are only trusted
+    if the class defining them is, unless the class holding them is a `DescriptorOwner`.
     """
 
+    def __init__(self, *, on_change: Optional[str] = None) -> None:
+        self.on_change = on_change
+
     def __set_name__(self, owner_cls: type[T], name: str) -> None:
         """
         Get the name of the descriptor variable.
@@ -24,12 +50,60 @@ class Descriptor(Generic[T]):
         later use as a key for the class dictionary, in which we will be storing
         the held values by the descriptor. (See PEP 487 for more details.)
 
-        It also stores the owner class, which isn't used in the default
-        implementation here, but it might be useful to have in some classes
-        which build upon this one.
+        It also stores the owner class, which decides whether the descriptor is
+        trusted, and generates the specialized setter (see `_build_setter`).
         """
         self.name = name
         self.cls = owner_cls
+        self.trusted = _is_trusted(owner_cls)
+        self._setter = self._build_setter()
+
+    def _setter_source(self) -> list[str]:
+        """
+        Get the lines of code to run before the value is stored, in the generated setter.
+
+        The code works with the assigned `value` (which it can also adjust) and it can
+        use any names provided by `_setter_namespace`. When `self.trusted` is set, this
+        should skip all of the validation.
+        """
+        return []
+
+    def _setter_namespace(self) -> dict[str, Any]:
+        """Get the names available to the code from `_setter_source`."""
+        return {"descriptor": self, "name": self.name, "on_change": self.on_change}
+
+    def _build_setter(self) -> Callable[[T, Any], None]:
+        """Generate the specialized setter function for this descriptor."""
+        namespace = self._setter_namespace()
+        body = self._setter_source() + ["instance.__dict__[name] = value"]
+        if self.on_change is not None:
+            body.append("getattr(instance, on_change)()")
+
+        source = "\n".join([
+            f"def make_setter({', '.join(namespace)}):",
+            "    def setter(instance, value):",
+            *(f"        {line}" for line in body),
+            "    return setter",
+        ])
+        scope: dict[str, Any] = {}
+        exec(compile(source, f"<{self.__class__.__qualname__} setter for {self.name}>", "exec"), scope)
+        return scope["make_setter"](**namespace)
+
+    def _rebuild_setter(self) -> None:
+        """Generate the setter again, after the values it was generated from changed (unless it wasn't generated yet)."""
+        if "name" in self.__dict__:
+            self._setter = self._build_setter()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state for pickling (and copying), without the generated setter, which can't be pickled."""
+        state = self.__dict__.copy()
+        state.pop("_setter", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the pickled (or copied) state, generating the setter again."""
+        self.__dict__.update(state)
+        self._rebuild_setter()
 
     def __get__(self, instance: T, owner_cls: type[T]) -> Any:
         """
@@ -51,7 +125,8 @@ class Descriptor(Generic[T]):
         """
         # This will not override the descriptor itself, because it is stored
         #  in class dictionary, not in instance dict.
-        instance.__dict__[self.name] = value
+        # The actual assignment is done by the generated setter (see `_build_setter`).
+        self._setter(instance, value)
 
     def __delete__(self, instance: T) -> None:
         """
@@ -63,6 +138,37 @@ class Descriptor(Generic[T]):
         del instance.__dict__[self.name]
 
 
+def _is_trusted(owner_cls: type) -> bool:
+    """Check whether the descriptors held by given class should skip the validation."""
+    return src.config.TRUSTED_DESCRIPTORS or getattr(owner_cls, "trusted_descriptors", False)
+
+
+class DescriptorOwner:
+    """
+    Base class for classes holding descriptors, which their subclasses can trust.
+
+    Descriptors are generated for the class defining them, so setting `trusted_descriptors`
+    on a subclass wouldn't affect the inherited ones. Subclasses of this class get their
+    own copies of the inherited descriptors, whenever their trust differs from the class
+    which defined them.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Copy the inherited descriptors which should be (or shouldn't be) trusted in this subclass."""
+        super().__init_subclass__(**kwargs)
+        trusted = _is_trusted(cls)
+        seen = set(vars(cls))
+        for base in cls.__mro__[1:]:
+            for name, attribute in vars(base).items():
+                if name in seen:
+                    continue
+                seen.add(name)
+                if isinstance(attribute, Descriptor) and attribute.trusted != trusted:
+                    descriptor = copy.copy(attribute)
+                    setattr(cls, name, descriptor)
+                    descriptor.__set_name__(cls, name)
+
+
 class TypedDescriptor(Descriptor[T]):
     """
     Decorator which only accepts values of given type(s).
@@ -84,10 +190,23 @@ class TypedDescriptor(Descriptor[T]):
 
             raise TypeError(f"{self.name} {types_msg}, got `{value.__class__.__qualname__}`")
 
-    def __set__(self, instance: T, value: Any) -> None:
+    def _setter_source(self) -> list[str]:
         """Only allow setting values which mach the expected types."""
-        self.check(value)
-        return super().__set__(instance, value)
+        if self.trusted:
+            return super()._setter_source()
+        # Subclasses overriding `check` (without providing their own source) use the generic check
+        if type(self).check not in _GENERATED_CHECKS:
+            return super()._setter_source() + ["descriptor.check(value)"]
+
+        # The check is only called to raise the properly formatted exception
+        return super()._setter_source() + [
+            "if not isinstance(value, allowed_types):",
+            "    descriptor.check(value)",
+        ]
+
+    def _setter_namespace(self) -> dict[str, Any]:
+        """Provide the allowed types to the generated setter."""
+        return {**super()._setter_namespace(), "allowed_types": self.allowed_types}
 
 
 class Numeric(TypedDescriptor[T]):
@@ -116,8 +235,30 @@ class NumericRange(Numeric[T]):
 
     def __init__(self, *args, min: NumericType, max: NumericType, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.min = min
-        self.max = max
+        self._min = min
+        self._max = max
+
+    @property
+    def min(self) -> NumericType:
+        """Get the lowest allowed value."""
+        return self._min
+
+    @min.setter
+    def min(self, value: NumericType) -> None:
+        """Change the lowest allowed value, the generated setter is updated to use it."""
+        self._min = value
+        self._rebuild_setter()
+
+    @property
+    def max(self) -> NumericType:
+        """Get the highest allowed value."""
+        return self._max
+
+    @max.setter
+    def max(self, value: NumericType) -> None:
+        """Change the highest allowed value, the generated setter is updated to use it."""
+        self._max = value
+        self._rebuild_setter()
 
     def check(self, value: Any) -> None:
         """Ensure given `value` meets the requirements."""
@@ -125,13 +266,27 @@ class NumericRange(Numeric[T]):
         if value < self.min or value > self.max:
             raise ValueError(f"Given value ({value}) is outside the allowed range <{self.min}-{self.max}>.")
 
+    def _setter_source(self) -> list[str]:
+        """Only allow setting values within the range."""
+        if self.trusted or type(self).check not in _GENERATED_CHECKS:
+            return super()._setter_source()
+
+        return super()._setter_source() + [
+            "if value < min_value or value > max_value:",
+            "    descriptor.check(value)",
+        ]
+
+    def _setter_namespace(self) -> dict[str, Any]:
+        """Provide the range boundaries to the generated setter."""
+        return {**super()._setter_namespace(), "min_value": self.min, "max_value": self.max}
+
 
 class RadianAngle(NumericRange[T]):
     """
     Angle represented as a number in radians.
 
     If a number is outside of the allowed range, it is automatically
-    adjusted (value % 2 * pi) to always represent a valid basic radian angle.
+    adjusted (value % (2 * pi)) to always represent a valid basic radian angle.
 
     The setter will raise an exception if user will try to set the parameter to
     a non-numeric value (TypeError).
@@ -140,16 +295,15 @@ class RadianAngle(NumericRange[T]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, min=0, max=(2 * math.pi), **kwargs)
 
-    def __set__(self, instance: T, value: Any) -> None:
+    def _setter_source(self) -> list[str]:
         """Automatically adjust value to fit within the base radian range."""
-        # We don't adjust the number first because it may not even be of
-        # numeric type, running the checks first ensures that it is numeric
-        # and will fail with ValueError only if it's outside of specified range.
-        try:
-            self.check(value)
-        except ValueError:
-            value = value % 2 * math.pi
-        return super().__set__(instance, value)
+        # We don't adjust the number before the type checks, because it may not
+        # even be of numeric type. Since the value always gets adjusted to fit
+        # the range, the range check from `NumericRange` is skipped entirely.
+        return Numeric._setter_source(self) + [
+            "if value < min_value or value > max_value:",
+            "    value = value % max_value",
+        ]
 
 
 class Coordinate(NumericRange[T]):
@@ -167,3 +321,7 @@ class Coordinate(NumericRange[T]):
     def __init__(self, *args, window_border: NumericType, **kwargs):
         self.window_border = window_border
         super().__init__(*args, min=0, max=self.window_border, **kwargs)
+
+
+# Checks which are mirrored by the generated setter code, overriding these requires a fallback
+_GENERATED_CHECKS = (TypedDescriptor.check, NumericRange.check)
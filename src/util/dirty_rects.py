@@ -0,0 +1,105 @@
+from collections.abc import Iterable
+
+import pygame
+
+from src.config import Window
+
+
+class DirtyRectTracker:
+    """
+    Collect areas of the screen which have changed during a frame.
+
+    Anything drawing onto the game surface can opt into dirty rect rendering by
+    reporting the areas it has changed here (conveniently, `Surface.blit` and all
+    of the `pygame.draw` functions already return the affected rect). At the end
+    of the frame, the game loop merges overlapping rects and only pushes those
+    areas to the screen with `pygame.display.update(rects)`, rather than updating
+    the whole screen.
+
+    If the merged rects would cover more than `full_update_ratio` of the screen,
+    a full screen update is used instead, since it's cheaper at that point.
+    Merging costs about a microsecond per rect (in Python), which only pays off while
+    there are few of them, so with more than `merge_limit` rects, they're only clipped
+    to the screen and passed to pygame as they are.
+    """
+
+    def __init__(
+        self,
+        width: int = Window.width,
+        height: int = Window.height,
+        full_update_ratio: float = 0.5,
+        merge_limit: int = 32,
+    ):
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self.full_update_ratio = full_update_ratio
+        self.merge_limit = merge_limit
+
+        self._rects: list[pygame.Rect] = []
+        self._full_update = True  # The first frame always needs to be drawn whole
+
+    def __len__(self) -> int:
+        """Get the amount of (not yet merged) dirty rects."""
+        return len(self._rects)
+
+    def add(self, rect: pygame.Rect) -> None:
+        """Mark given area of the screen as changed."""
+        if rect.width > 0 and rect.height > 0:
+            self._rects.append(rect)
+
+    def add_all(self, rects: Iterable[pygame.Rect]) -> None:
+        """Mark all given areas of the screen as changed."""
+        for rect in rects:
+            self.add(rect)
+
+    def mark_full(self) -> None:
+        """Mark the whole screen as changed (f.e. after filling the whole background)."""
+        self._full_update = True
+
+    @staticmethod
+    def merge(rects: Iterable[pygame.Rect]) -> list[pygame.Rect]:
+        """
+        Merge overlapping (or touching) rects into their unions, in a single pass.
+
+        Every rect is joined with all of the already merged rects it overlaps. The
+        grown union isn't checked against the other merged rects again, so a few of
+        the results can still overlap, which only means a bit of the screen gets
+        updated twice, but it keeps the merging close to linear for scattered rects.
+        """
+        merged: list[pygame.Rect] = []
+        # Inflating by 1 px also joins rects which only touch each other, the margin is removed at the end
+        for rect in rects:
+            rect = rect.inflate(2, 2)
+            overlapping = rect.collidelistall(merged)
+            if overlapping:
+                for index in reversed(overlapping):
+                    rect.union_ip(merged[index])
+                    merged[index] = merged[-1]
+                    merged.pop()
+            merged.append(rect)
+        for rect in merged:
+            rect.inflate_ip(-2, -2)
+        return merged
+
+    def flush(self) -> list[pygame.Rect]:
+        """
+        Get the merged list of areas which need to be updated and start tracking a new frame.
+
+        The returned list is clipped to the screen, if a full screen update is needed,
+        it only contains the rect of the whole screen.
+        """
+        rects = self._rects
+        self._rects = []
+
+        if not self._full_update:
+            if len(rects) <= self.merge_limit:
+                rects = self.merge(rects)
+            if rects and self.screen_rect.contains(rects[0].unionall(rects)):
+                merged = rects
+            else:
+                merged = [clipped for rect in rects if (clipped := rect.clip(self.screen_rect))]
+            dirty_area = sum(rect.width * rect.height for rect in merged)
+            if dirty_area <= self.screen_rect.width * self.screen_rect.height * self.full_update_ratio:
+                return merged
+
+        self._full_update = False
+        return [self.screen_rect.copy()]
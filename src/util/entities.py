@@ -0,0 +1,223 @@
+from collections.abc import Iterable, Iterator, KeysView
+from typing import Optional, TYPE_CHECKING, TypeVar
+
+import pygame
+
+from src.config import Window
+from src.util.collision import CollisionWorld, RectLike
+
+if TYPE_CHECKING:
+    from src.util.body import RectBody
+    from src.util.sprites import SpriteBatch
+
+BodyT = TypeVar("BodyT", bound="RectBody")
+# Bodies of an entity manager in the order they were added, with the sleeping ones (see `EntityManager.capture`)
+Membership = tuple[list["RectBody"], frozenset["RectBody"]]
+
+
+class EntityManager:
+    """
+    Owner of the bodies of a game world, only doing work for the awake and visible ones.
+
+    Bodies are stored per type, in insertion ordered dicts, so that adding and removing
+    (even in bulk) never scans any lists. Every added body is also registered into the
+    collision world of the manager (`self.world`, a new one unless given), which is kept
+    in sync as the bodies move, so it can be used for collision queries too.
+
+    Every tick, `update` calls `RectBody.update` of the awake bodies only. Bodies which
+    haven't moved (their position or size wasn't written) for `sleep_after` ticks are put
+    to sleep (unless their `can_sleep` is `False`) and woken up again as soon as they move
+    (f.e. when something else pushes them) or when `wake` is called. Nothing else wakes
+    them up, so bodies reacting to the input should either keep `can_sleep` off (as
+    `ControlledRectBody` does) or get woken up by the game when the input arrives.
+
+    Drawing is culled by the viewport: the visible bodies are looked up in the collision
+    world, so only the cells overlapping the viewport get checked. This keeps the work
+    per frame proportional to the amount of the awake (or visible) bodies, rather than
+    to the amount of all of the bodies.
+    """
+
+    def __init__(self, world: Optional[CollisionWorld] = None, sleep_after: int = 30):
+        if sleep_after < 1:
+            raise ValueError(f"Bodies need to be idle for at least a single tick to fall asleep, got {sleep_after}")
+
+        self.world = world if world is not None else CollisionWorld()
+        self.sleep_after = sleep_after
+
+        # Bodies of each type, ordered by insertion (dicts are used as ordered sets)
+        self._types: dict[type, dict["RectBody", None]] = {}
+        # Insertion sequence number of every body, used to keep the draw order stable
+        self._order: dict["RectBody", int] = {}
+        self._sequence = 0
+        # Awake bodies with the amount of ticks they didn't move for
+        self._awake: dict["RectBody", int] = {}
+        self._sleeping: set["RectBody"] = set()
+        # Bodies moved since the last update
+        self._moved: set["RectBody"] = set()
+
+    def __len__(self) -> int:
+        """Get the amount of bodies."""
+        return len(self._order)
+
+    def __contains__(self, body: "RectBody") -> bool:
+        """Check whether given body is owned by this manager."""
+        return body in self._order
+
+    def __iter__(self) -> Iterator["RectBody"]:
+        """Iterate over all of the bodies, in the order they were added."""
+        return iter(self._order)
+
+    @property
+    def awake(self) -> KeysView["RectBody"]:
+        """Get the bodies which are awake, these are updated every tick."""
+        return self._awake.keys()
+
+    @property
+    def sleeping(self) -> frozenset["RectBody"]:
+        """Get the bodies which are sleeping, these aren't updated until they move or get woken up."""
+        return frozenset(self._sleeping)
+
+    def add(self, body: "RectBody") -> None:
+        """Add a new (awake) body."""
+        if body._entity_manager is not None:
+            raise ValueError(f"{body!r} is already owned by an entity manager.")
+
+        self.world.add(body)
+        self._types.setdefault(type(body), {})[body] = None
+        self._order[body] = self._sequence
+        self._sequence += 1
+        self._awake[body] = 0
+        body._entity_manager = self
+
+    def add_all(self, bodies: Iterable["RectBody"]) -> None:
+        """Add all of given bodies."""
+        for body in bodies:
+            self.add(body)
+
+    def remove(self, body: "RectBody") -> None:
+        """Remove given body, unregistering it from the collision world too."""
+        if body._entity_manager is not self:
+            raise ValueError(f"{body!r} isn't owned by this entity manager.")
+
+        self.world.remove(body)
+        store = self._types[type(body)]
+        del store[body]
+        if not store:
+            del self._types[type(body)]
+        del self._order[body]
+        self._awake.pop(body, None)
+        self._sleeping.discard(body)
+        self._moved.discard(body)
+        body._entity_manager = None
+
+    def remove_all(self, bodies: Iterable["RectBody"]) -> None:
+        """Remove all of given bodies."""
+        for body in bodies:
+            self.remove(body)
+
+    def clear(self) -> None:
+        """Remove all of the bodies."""
+        self.remove_all(list(self._order))
+
+    def capture(self) -> Membership:
+        """
+        Get all of the bodies (in the order they were added), along with the ones which are sleeping.
+
+        The membership can be restored later with `restore`, which adds the bodies removed
+        since the capture back and removes the ones added since. Only the membership is
+        captured, the state of the bodies themselves can be captured with `BodySnapshot`.
+        """
+        return list(self._order), frozenset(self._sleeping)
+
+    def restore(self, membership: Membership) -> None:
+        """Remove all of the bodies and add the ones from given captured membership instead, the sleeping ones are put to sleep."""
+        bodies, sleeping = membership
+        self.clear()
+        self.add_all(bodies)
+        for body in sleeping:
+            self.sleep(body)
+
+    def of_type(self, body_type: type[BodyT]) -> list[BodyT]:
+        """Get all of the bodies of given type (including its subclasses), in the order they were added."""
+        if body_type in self._types and not body_type.__subclasses__():
+            return list(self._types[body_type])  # type: ignore
+        return [
+            body  # type: ignore
+            for store_type, store in self._types.items() if issubclass(store_type, body_type)
+            for body in store
+        ]
+
+    def mark_moved(self, body: "RectBody") -> None:
+        """Note that given body moved, this is called automatically when its hitbox changes."""
+        self._moved.add(body)
+
+    def wake(self, body: "RectBody") -> None:
+        """Wake given body up, so that it gets updated again."""
+        if body not in self._order:
+            raise ValueError(f"{body!r} isn't owned by this entity manager.")
+        self._sleeping.discard(body)
+        self._awake[body] = 0
+
+    def sleep(self, body: "RectBody") -> None:
+        """Put given body to sleep right away, it won't get updated until it moves or gets woken up."""
+        if self._awake.pop(body, None) is not None:
+            self._sleeping.add(body)
+
+    def update(self) -> None:
+        """
+        Update all of the awake bodies, putting the idle ones to sleep.
+
+        Sleeping bodies which were moved since the last update (f.e. by other bodies)
+        are woken up, they get updated again from the next tick.
+        """
+        awake = self._awake
+        if not awake and not self._moved:
+            # Nothing is awake (f.e. the game doesn't own any bodies), there's nothing to do
+            return
+        for body in list(awake):
+            # Bodies could've been removed (or put to sleep) by the updates of other bodies
+            if body in awake:
+                body.update()
+
+        moved = self._moved
+        self._moved = set()
+        sleep_after = self.sleep_after
+        falling_asleep = []
+        for body, idle in awake.items():
+            if body in moved:
+                awake[body] = 0
+            elif body.can_sleep:
+                if idle + 1 >= sleep_after:
+                    falling_asleep.append(body)
+                else:
+                    awake[body] = idle + 1
+
+        for body in falling_asleep:
+            del awake[body]
+            self._sleeping.add(body)
+        if self._sleeping:
+            for body in moved & self._sleeping:
+                self.wake(body)
+
+    def visible(self, viewport: Optional[RectLike] = None) -> list["RectBody"]:
+        """Get the bodies intersecting given viewport (the whole window by default), in the order they're drawn."""
+        if viewport is None:
+            viewport = (0, 0, Window.width, Window.height)
+        order = self._order
+        # The collision world could be shared with bodies which aren't owned by this manager
+        bodies = [body for body in self.world.query_rect(viewport) if body in order]
+        bodies.sort(key=lambda body: (body.layer, order[body]))
+        return bodies
+
+    def draw(self, surface: pygame.Surface, viewport: Optional[RectLike] = None) -> int:
+        """Draw the bodies intersecting given viewport (the whole window by default), returning how many were drawn."""
+        bodies = self.visible(viewport)
+        for body in bodies:
+            body.draw(surface)
+        return len(bodies)
+
+    def queue_draw(self, batch: "SpriteBatch", viewport: Optional[RectLike] = None) -> int:
+        """Queue the sprites of the bodies intersecting given viewport into given batch, returning how many were queued."""
+        bodies = self.visible(viewport)
+        batch.draw_bodies(bodies)
+        return len(bodies)
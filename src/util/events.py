@@ -0,0 +1,160 @@
+from collections.abc import Callable, Iterable
+
+import pygame
+from pygame.event import EventType  # type: ignore (see: https://github.com/pygame/pygame/issues/2867)
+
+EventHandler = Callable[[EventType], None]
+
+
+def coalesce_motion(events: Iterable[EventType]) -> list[EventType]:
+    """
+    Merge every run of consecutive MOUSEMOTION events into a single one.
+
+    The merged event has the position and the buttons of the last event of the run,
+    its relative movement is the sum of the relative movements of the whole run.
+    """
+    merged: list[EventType] = []
+    append = merged.append
+    motion = pygame.MOUSEMOTION
+    last_motion = None
+    run_length = rel_x = rel_y = 0
+
+    for event in events:
+        if event.type == motion:
+            last_motion = event
+            run_length += 1
+            event_rel_x, event_rel_y = event.rel
+            rel_x += event_rel_x
+            rel_y += event_rel_y
+            continue
+        if last_motion is not None:
+            append(_merge_motion(last_motion, run_length, rel_x, rel_y))
+            last_motion = None
+            run_length = rel_x = rel_y = 0
+        append(event)
+
+    if last_motion is not None:
+        append(_merge_motion(last_motion, run_length, rel_x, rel_y))
+    return merged
+
+
+def _merge_motion(last: EventType, run_length: int, rel_x: int, rel_y: int) -> EventType:
+    """Create the event replacing a run of MOUSEMOTION events, ending with `last`."""
+    if run_length == 1:
+        return last
+    attributes = dict(last.dict)
+    attributes["rel"] = (rel_x, rel_y)
+    return pygame.event.Event(pygame.MOUSEMOTION, attributes)
+
+
+class EventDispatcher:
+    """
+    Dispatch pygame events to handlers registered for their type.
+
+    Handlers are looked up by the event type in a dict, so that games don't need
+    long if/elif chains comparing the event type. All of the handlers registered for
+    a type are called (in the registration order), events of types without any
+    registered handlers are passed to the `fallback` handler instead.
+
+    With `filter_events`, only the event types with registered handlers (and the ones
+    passed to `allow`, which are handled by the fallback) are allowed into the pygame
+    event queue (`pygame.event.set_allowed`), all other events are dropped by pygame
+    and never reach Python. The filter is applied by `apply_filter` (which the game
+    loop calls after the setup) and then kept in sync when handlers change.
+
+    With `coalesce_motion`, every run of consecutive MOUSEMOTION events in the processed
+    batch is merged into a single event (see `coalesce_motion`), so that a fast mouse
+    movement only results in a single handler call per frame.
+    """
+
+    def __init__(self, fallback: EventHandler, filter_events: bool = False, coalesce_motion: bool = False):
+        self.fallback = fallback
+        self.filter_events = filter_events
+        self.coalesce_motion = coalesce_motion
+
+        self._handlers: dict[int, list[EventHandler]] = {}
+        self._allowed: set[int] = set()
+        self._filter_applied = False
+
+    def register(self, event_type: int, handler: EventHandler) -> None:
+        """Call given handler for every event of given type (instead of the fallback)."""
+        self._handlers.setdefault(event_type, []).append(handler)
+        self._sync_filter()
+
+    def unregister(self, event_type: int, handler: EventHandler) -> None:
+        """Stop calling given handler for events of given type."""
+        handlers = self._handlers.get(event_type)
+        if handlers is None or handler not in handlers:
+            raise ValueError(f"Handler {handler!r} isn't registered for event type {pygame.event.event_name(event_type)}")
+
+        handlers.remove(handler)
+        if not handlers:
+            del self._handlers[event_type]
+        self._sync_filter()
+
+    def handler(self, event_type: int) -> Callable[[EventHandler], EventHandler]:
+        """Register decorated function as a handler of given event type."""
+        def decorator(handler: EventHandler) -> EventHandler:
+            self.register(event_type, handler)
+            return handler
+        return decorator
+
+    def allow(self, *event_types: int) -> None:
+        """Let events of given types through the filter, even without registered handlers (for the fallback)."""
+        self._allowed.update(event_types)
+        self._sync_filter()
+
+    @property
+    def allowed_types(self) -> set[int]:
+        """Get all event types which are let through the filter."""
+        return self._allowed | self._handlers.keys()
+
+    def apply_filter(self) -> None:
+        """Only allow the handled event types into the pygame event queue (if `filter_events` is set)."""
+        if not self.filter_events:
+            if self._filter_applied:
+                pygame.event.set_allowed(None)
+                self._filter_applied = False
+            return
+
+        # Blocking an event type also drops the pending events of that type, keep the allowed ones
+        allowed = self.allowed_types
+        pending = [event for event in pygame.event.get() if event.type in allowed]
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(allowed))
+        for event in pending:
+            pygame.event.post(event)
+        self._filter_applied = True
+
+    def _sync_filter(self) -> None:
+        """Update the already applied filter after the handled event types changed."""
+        # The filter is reset once pygame quits, it gets applied again on the next start
+        if self._filter_applied and pygame.display.get_init():
+            self.apply_filter()
+
+    def dispatch(self, event: EventType) -> None:
+        """Pass given event to its handlers."""
+        handlers = self._handlers.get(event.type)
+        if handlers is None:
+            self.fallback(event)
+            return
+        for handler in handlers:
+            handler(event)
+
+    def prepare(self, events: list[EventType]) -> list[EventType]:
+        """Get the events which should be dispatched from a batch of events (coalescing the mouse motion)."""
+        if self.coalesce_motion:
+            return coalesce_motion(events)
+        return events
+
+    def dispatch_all(self, events: list[EventType]) -> None:
+        """Pass every event from given batch to its handlers."""
+        get_handlers = self._handlers.get
+        fallback = self.fallback
+        for event in self.prepare(events):
+            handlers = get_handlers(event.type)
+            if handlers is None:
+                fallback(event)
+                continue
+            for handler in handlers:
+                handler(event)
@@ -0,0 +1,54 @@
+from collections.abc import Iterator, Sequence
+
+import pygame
+
+
+class InputState:
+    """
+    Snapshot of the keyboard and mouse state, captured once per frame.
+
+    The game loop captures a new snapshot after processing the events of each frame
+    (available in `BaseGame.input`), everything reading the input state during that
+    frame (f.e. `ControlledRectBody.move`) can then share it, instead of querying
+    pygame over and over again.
+    """
+
+    __slots__ = ("keys", "mouse_position", "mouse_buttons")
+
+    def __init__(self, keys: Sequence[bool], mouse_position: tuple[int, int], mouse_buttons: Sequence[bool]):
+        self.keys = keys
+        self.mouse_position = mouse_position
+        self.mouse_buttons = mouse_buttons
+
+    @classmethod
+    def capture(cls) -> "InputState":
+        """Capture the current state of the keyboard and the mouse."""
+        return cls(pygame.key.get_pressed(), pygame.mouse.get_pos(), pygame.mouse.get_pressed())
+
+    @classmethod
+    def empty(cls) -> "InputState":
+        """Get a state without any keys or mouse buttons pressed."""
+        return cls(_NO_KEYS, (0, 0), (False, False, False))
+
+    def pressed(self, key: int) -> bool:
+        """Check whether given key is pressed."""
+        return bool(self.keys[key])
+
+
+class _NoKeys(Sequence[bool]):
+    """Sequence reporting every key as released, for any key code."""
+
+    def __getitem__(self, key: int) -> bool:  # type: ignore[override]
+        """No key is pressed."""
+        return False
+
+    def __len__(self) -> int:
+        """The amount of key codes isn't limited."""
+        return 0
+
+    def __iter__(self) -> Iterator[bool]:
+        """Nothing to iterate over (without this, iteration would go through `__getitem__` forever)."""
+        return iter(())
+
+
+_NO_KEYS = _NoKeys()
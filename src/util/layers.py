@@ -0,0 +1,171 @@
+from collections.abc import Callable, Iterator
+from typing import Optional, Union
+
+import pygame
+
+from src.config import Window
+from src.util.log import get_logger
+
+log = get_logger(__name__)
+
+LayerDrawFunction = Callable[[pygame.Surface], None]
+ColorLike = Union[pygame.Color, tuple[int, int, int], tuple[int, int, int, int]]
+
+
+class RenderLayer:
+    """
+    Part of the frame, rendered into its own offscreen surface.
+
+    The `draw` function renders the layer contents onto the layer surface (its
+    coordinates are relative to the layer). Static layers are only rendered once and
+    then reused, until they're invalidated (f.e. when the background changes), while
+    dynamic layers are rendered again in every frame.
+
+    Transparent layers use per-pixel alpha (and are cleared before every render),
+    opaque layers are faster to blit, but they cover everything underneath them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        draw: LayerDrawFunction,
+        static: bool = True,
+        transparent: bool = True,
+        size: tuple[int, int] = (Window.width, Window.height),
+        position: tuple[int, int] = (0, 0),
+    ):
+        self.name = name
+        self.draw = draw
+        self.static = static
+        self.transparent = transparent
+        self.size = size
+        self.position = position
+
+        self.surface: Optional[pygame.Surface] = None
+        self.valid = False
+        self.renders = 0
+
+    def __repr__(self) -> str:
+        """Get the name, mode and memory of the layer."""
+        return f"<RenderLayer {self.name!r} ({'static' if self.static else 'dynamic'}, {self.memory} bytes)>"
+
+    @property
+    def memory(self) -> int:
+        """Get the amount of memory used by the layer surface (in bytes)."""
+        if self.surface is None:
+            return 0
+        return self.surface.get_pitch() * self.surface.get_height()
+
+    def _create_surface(self) -> pygame.Surface:
+        """Create the offscreen surface, in the display format if possible."""
+        surface = pygame.Surface(self.size, pygame.SRCALPHA if self.transparent else 0)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if self.transparent else surface.convert()
+        return surface
+
+    def invalidate(self) -> None:
+        """Render the layer again, before it's used the next time."""
+        self.valid = False
+
+    def release(self) -> None:
+        """Drop the layer surface, freeing its memory (it's created again on the next render)."""
+        self.surface = None
+        self.valid = False
+
+    def render(self) -> pygame.Surface:
+        """Get the layer surface, rendering it first if it's dynamic or it was invalidated."""
+        surface = self.surface
+        if surface is None:
+            surface = self.surface = self._create_surface()
+            log.debug(f"Created surface of layer {self.name} ({self.size[0]}x{self.size[1]}, {self.memory / 1024:.0f} KiB)")
+        elif self.valid and self.static:
+            return surface
+
+        if self.transparent:
+            surface.fill((0, 0, 0, 0))
+        self.draw(surface)
+        self.valid = True
+        self.renders += 1
+        return surface
+
+
+class LayerStack:
+    """
+    Ordered stack of render layers, composed into the final frame.
+
+    Layers are composed from the bottom (first added) to the top, by blitting their
+    surfaces onto the target, so a scene with a complex static background only costs
+    a single blit per frame, rather than repainting the background from scratch.
+    """
+
+    def __init__(self):
+        self._layers: list[RenderLayer] = []
+
+    def __len__(self) -> int:
+        """Get the amount of layers."""
+        return len(self._layers)
+
+    def __iter__(self) -> Iterator[RenderLayer]:
+        """Iterate over the layers, from the bottom one."""
+        return iter(self._layers)
+
+    def __getitem__(self, name: str) -> RenderLayer:
+        """Get the layer with given name."""
+        for layer in self._layers:
+            if layer.name == name:
+                return layer
+        raise KeyError(name)
+
+    def add(self, layer: RenderLayer, index: Optional[int] = None) -> RenderLayer:
+        """Add given layer on top of the stack (or at given position from the bottom)."""
+        if any(existing.name == layer.name for existing in self._layers):
+            raise ValueError(f"Layer {layer.name} is already in the stack")
+        if index is None:
+            self._layers.append(layer)
+        else:
+            self._layers.insert(index, layer)
+        return layer
+
+    def remove(self, name: str) -> RenderLayer:
+        """Remove the layer with given name, releasing its surface."""
+        layer = self[name]
+        self._layers.remove(layer)
+        layer.release()
+        return layer
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Render given layer again before it's used the next time (all of the layers, if `name` isn't specified)."""
+        layers = self._layers if name is None else [self[name]]
+        for layer in layers:
+            layer.invalidate()
+
+    def covers(self, target: pygame.Surface) -> bool:
+        """Check whether the bottom layer is opaque and covers the whole `target` surface."""
+        if not self._layers:
+            return False
+        base = self._layers[0]
+        return (
+            not base.transparent and base.position == (0, 0)
+            and base.size[0] >= target.get_width() and base.size[1] >= target.get_height()
+        )
+
+    def compose(self, target: pygame.Surface, background: Optional[ColorLike] = None) -> None:
+        """
+        Render all of the layers which need it and blit them onto the `target` surface.
+
+        If `background` is given, the target is filled with it first, unless the bottom
+        layer is opaque and covers the whole target (see `covers`). Otherwise, with only
+        transparent or partial layers, the previous frame would stay visible under them.
+        """
+        if background is not None and not self.covers(target):
+            target.fill(background)
+        target.blits([(layer.render(), layer.position) for layer in self._layers], doreturn=False)
+
+    def memory_usage(self) -> dict[str, int]:
+        """Get the amount of memory used by each of the layers (in bytes)."""
+        return {layer.name: layer.memory for layer in self._layers}
+
+    @property
+    def memory(self) -> int:
+        """Get the amount of memory used by all of the layers (in bytes)."""
+        return sum(layer.memory for layer in self._layers)
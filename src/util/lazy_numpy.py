@@ -0,0 +1,33 @@
+"""
+NumPy is an optional dependency, which is also slow to import (tens of milliseconds).
+
+Modules which can use it therefore don't import it at the module level, they get
+it from here once they actually need it, so that games which never touch NumPy
+don't pay for importing it.
+"""
+from types import ModuleType
+from typing import Optional
+
+_numpy: Optional[ModuleType] = None
+_imported = False
+
+
+def get_numpy() -> Optional[ModuleType]:
+    """Import NumPy on the first use, returning `None` if it isn't installed."""
+    global _numpy, _imported
+    if not _imported:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None  # type: ignore
+        _numpy = numpy
+        _imported = True
+    return _numpy
+
+
+def require_numpy(feature: str) -> ModuleType:
+    """Import NumPy on the first use, making sure it's available for given feature (f.e. "Batch color operations")."""
+    numpy = get_numpy()
+    if numpy is None:
+        raise ModuleNotFoundError(f"{feature} require NumPy, install it with `pip install numpy`.")
+    return numpy
@@ -1,12 +1,13 @@
+import atexit
 import logging
 import logging.handlers
 import os
 import sys
+import threading
 from pathlib import Path
+from queue import Full, Queue
 from typing import Optional, TYPE_CHECKING, cast
 
-import coloredlogs
-
 import src.config
 
 FORMAT_STRING = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
@@ -42,6 +43,9 @@ def get_logger(name: Optional[str] = None) -> CustomLogger:
 
 def setup_coloredlogs(format_string: str, root_log: logging.Logger) -> None:
     """Set up style of coloredlogs."""
+    # Imported here, since it's relatively slow to import and it isn't needed until logging is set up
+    import coloredlogs
+
     if "COLOREDLOGS_LEVEL_STYLES" not in os.environ:
         coloredlogs.DEFAULT_LEVEL_STYLES = {
             **coloredlogs.DEFAULT_LEVEL_STYLES,
@@ -56,6 +60,127 @@ def setup_coloredlogs(format_string: str, root_log: logging.Logger) -> None:
     coloredlogs.install(level=TRACE_LEVEL, logger=root_log, stream=sys.stdout)
 
 
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler which leaves all of the record processing to the listener thread.
+
+    Unlike the default `QueueHandler`, records aren't formatted before they're enqueued,
+    this means the caller only pays for putting the record into the queue, however it
+    also means that mutable objects passed as log arguments shouldn't be changed after
+    the logging call, as they're only formatted later, in the listener thread.
+
+    When the (bounded) queue is full, the record is either dropped (`drop=True`), or the
+    caller is blocked until the listener catches up (backpressure).
+    """
+
+    def __init__(self, queue: "Queue[logging.LogRecord]", drop: bool = False):
+        super().__init__(queue)
+        self.drop = drop
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Keep the record as it is, it gets formatted by the handlers in the listener thread."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record into the queue, dropping it or waiting for free space if the queue is full."""
+        if not self.drop:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """Queue listener which can always be stopped, even if the bounded queue is currently full."""
+
+    def enqueue_sentinel(self) -> None:
+        """Wait for free space for the sentinel, instead of failing on full queue."""
+        self.queue.put(self._sentinel)  # type: ignore
+
+
+_queue_listener: Optional[_QueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+
+
+def setup_queue_logging(root_log: logging.Logger, max_size: int, drop: bool) -> None:
+    """
+    Move all handlers of the root logger to a background thread.
+
+    The root logger is only left with a `BoundedQueueHandler`, so logging calls only enqueue
+    the records, while the formatting and all of the I/O (stdout, log file and its rollover)
+    is handled by a `QueueListener` thread. The listener is stopped (and the remaining records
+    flushed) by `stop_queue_logging`, which also runs automatically on exit.
+    """
+    global _queue_listener, _queue_handler
+    if _queue_listener is not None:
+        return
+
+    handlers = root_log.handlers[:]
+    for handler in handlers:
+        root_log.removeHandler(handler)
+
+    log_queue: "Queue[logging.LogRecord]" = Queue(max_size)
+    _queue_handler = BoundedQueueHandler(log_queue, drop=drop)
+    _queue_listener = _QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    root_log.addHandler(_queue_handler)
+    atexit.register(stop_queue_logging)
+
+
+def stop_queue_logging() -> None:
+    """
+    Flush all of the enqueued records and stop the background logging thread.
+
+    The original handlers are attached back to the root logger, so any further
+    logging is handled synchronously again.
+    """
+    global _queue_listener, _queue_handler
+    if _queue_listener is None or _queue_handler is None:
+        return
+
+    root_log = get_logger()
+    root_log.removeHandler(_queue_handler)
+    _queue_listener.stop()
+    for handler in _queue_listener.handlers:
+        root_log.addHandler(handler)
+
+    if _queue_handler.dropped:
+        root_log.warning(f"{_queue_handler.dropped} log records were dropped, because the log queue was full.")
+
+    _queue_listener = None
+    _queue_handler = None
+
+
+def _reset_queue_logging_in_child() -> None:
+    """
+    Make the logging of a forked child process synchronous again.
+
+    The listener thread isn't inherited by the child, so the records put into the
+    (inherited) log queue would never get handled and once the queue filled up,
+    logging would block forever. The child gets the original handlers attached back
+    to its root logger directly, the listener itself is left to the parent.
+    """
+    global _queue_listener, _queue_handler
+    if _queue_listener is None or _queue_handler is None:
+        return
+
+    root_log = get_logger()
+    root_log.removeHandler(_queue_handler)
+    for handler in _queue_listener.handlers:
+        root_log.addHandler(handler)
+
+    _queue_listener = None
+    _queue_handler = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_queue_logging_in_child)
+
+
 def _set_trace_loggers() -> None:
     """
     Set loggers to the trace level according to the value from the GAME_TRACE_LOGGERS env var.
@@ -90,20 +215,48 @@ def _set_trace_loggers() -> None:
             get_logger(logger_name).setLevel(TRACE_LEVEL)
 
 
-def setup() -> None:
-    """Set up loggers."""
+class _LazySetupHandler(logging.Handler):
+    """
+    Placeholder handler, setting up the real handlers once the first record is emitted.
+
+    This avoids the costs of setting up logging (importing coloredlogs, creating
+    the log file, ...) for processes which never end up logging anything, or at
+    least moves it out of the startup.
+    """
+
+    def __init__(self):
+        super().__init__(TRACE_LEVEL)
+        self._setup_lock = threading.Lock()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Set up the real handlers and pass them the record."""
+        root_log = get_logger()
+        with self._setup_lock:
+            if self in root_log.handlers:
+                # Root logger is currently iterating over its handlers list, replace it with
+                # a new list rather than changing it in place, not to call new handlers twice.
+                root_log.handlers = [handler for handler in root_log.handlers if handler is not self]
+                setup_handlers(root_log)
+
+        for handler in root_log.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Records are passed over by `handle`, nothing is emitted here."""
+        pass
+
+
+def setup_handlers(root_log: logging.Logger) -> None:
+    """Attach the output handlers (coloredlogs stdout handler and log file, if enabled) to the root logger."""
     # Configure global logging format
     log_format = logging.Formatter(FORMAT_STRING)
 
-    # Add global TRACE level
-    logging.TRACE = TRACE_LEVEL  # type: ignore
-    logging.addLevelName(TRACE_LEVEL, "TRACE")
-    logging.setLoggerClass(CustomLogger)
-
-    # Configure the root logger
-    root_log = get_logger()
+    # Coloredlogs lowers the logger level to that of its handler, keep the configured one
+    level = root_log.level
     setup_coloredlogs(FORMAT_STRING, root_log)
-    root_log.setLevel(logging.DEBUG if src.config.DEBUG else logging.INFO)
+    root_log.setLevel(level)
 
     # Configure file handler (if enabled)
     if src.config.FILE_LOG:
@@ -113,8 +266,34 @@ def setup() -> None:
         file_handler.setFormatter(log_format)
         root_log.addHandler(file_handler)
 
+    # Move the handlers to a background thread (if enabled)
+    if src.config.QUEUE_LOG:
+        setup_queue_logging(root_log, src.config.LOG_QUEUE_SIZE, src.config.LOG_QUEUE_DROP)
+
+
+def setup(lazy: bool = False) -> None:
+    """
+    Set up loggers.
+
+    With `lazy`, only the cheap configuration (levels, custom logger class) is done
+    immediately, while the handlers are only set up once the first record gets emitted.
+    """
+    # Add global TRACE level
+    logging.TRACE = TRACE_LEVEL  # type: ignore
+    logging.addLevelName(TRACE_LEVEL, "TRACE")
+    logging.setLoggerClass(CustomLogger)
+
+    # Configure the root logger
+    root_log = get_logger()
+    root_log.setLevel(logging.DEBUG if src.config.DEBUG else logging.INFO)
+
     # Configure log-levels for other loggers
     logging.getLogger("PIL").setLevel(logging.INFO)
 
     # Set TRACE log level for defined loggers
     _set_trace_loggers()
+
+    if lazy:
+        root_log.addHandler(_LazySetupHandler())
+    else:
+        setup_handlers(root_log)
@@ -1,5 +1,19 @@
+import math
+from collections.abc import Sequence
+from typing import Optional, TYPE_CHECKING, Union
+
+from src.util.lazy_numpy import get_numpy, require_numpy
 from src.util.typing import NumericType
 
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+# Batch functions return NumPy arrays, or (nested) lists of floats when NumPy isn't available,
+# NumPy is only imported once a batch function gets used
+ArrayResult = Union["NDArray", list]
+
+REMAP_POLICIES = ("raise", "clamp", "wrap")
+
 
 def number_remap(
     number: NumericType,
@@ -24,3 +38,176 @@ def number_remap(
         raise ValueError(f"Specified number: {number} is not within specified old range: <{old_min}, {old_max}>")
 
     return ((number - old_min) / (old_max - old_min)) * (new_max - new_min) + new_min
+
+
+def _flat(values: "ArrayLike") -> list[float]:
+    """
+    Get given scalar or sequence of numbers as a list of floats (pure Python fallback).
+
+    Only scalars and 1D sequences are supported without NumPy, `TypeError` is raised
+    for anything with more dimensions (f.e. heightmaps).
+    """
+    if isinstance(values, (str, bytes)):
+        raise TypeError(f"Expected a number or a sequence of numbers, got {values!r}")
+    if not isinstance(values, Sequence):
+        return [float(values)]  # type: ignore
+    if any(isinstance(value, Sequence) for value in values):
+        raise TypeError("Batch functions only support scalars and 1D sequences without NumPy, install NumPy for N-D input")
+    return [float(value) for value in values]
+
+
+def _vectors(vectors: "ArrayLike") -> "NDArray":
+    """Get given 2D vectors as a contiguous `(N, 2)` float array."""
+    numpy = require_numpy("Vector arrays")
+    array = numpy.ascontiguousarray(vectors, dtype=numpy.float64)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"Expected an array of 2D vectors with (N, 2) shape, got {array.shape}")
+    return array
+
+
+def remap_array(
+    values: "ArrayLike",
+    old_min: NumericType,
+    old_max: NumericType,
+    new_min: NumericType,
+    new_max: NumericType,
+    policy: str = "raise",
+) -> ArrayResult:
+    """
+    Remap all of the given `values` ranging between given values to range between different values.
+
+    This is a vectorized `number_remap`, `policy` decides what happens with values outside
+    of the old range:
+        * "raise" -> `ValueError` is raised (same as `number_remap`)
+        * "clamp" -> values are clamped to the old range first
+        * "wrap" -> values are wrapped around the old range first (f.e. for angles)
+
+        >>> remap_array([0, 5, 15], 0, 10, 0, 100, policy="clamp")
+        array([  0.,  50., 100.])
+    """
+    if policy not in REMAP_POLICIES:
+        raise ValueError(f"Unknown remap policy: {policy}, expected one of: {', '.join(REMAP_POLICIES)}")
+    scale = (new_max - new_min) / (old_max - old_min)
+
+    numpy = get_numpy()
+    if numpy is None:
+        flat = _flat(values)
+        if policy == "clamp":
+            flat = [min(max(value, old_min), old_max) for value in flat]
+        elif policy == "wrap":
+            flat = [(value - old_min) % (old_max - old_min) + old_min for value in flat]
+        else:
+            for value in flat:
+                if value > old_max or value < old_min:
+                    raise ValueError(f"Specified number: {value} is not within specified old range: <{old_min}, {old_max}>")
+        return [(value - old_min) * scale + new_min for value in flat]
+
+    array = numpy.asarray(values, dtype=numpy.float64)
+    if policy == "clamp":
+        array = numpy.clip(array, old_min, old_max)
+    elif policy == "wrap":
+        array = (array - old_min) % (old_max - old_min) + old_min
+    else:
+        outside = (array > old_max) | (array < old_min)
+        if outside.any():
+            raise ValueError(
+                f"{numpy.count_nonzero(outside)} numbers (f.e. {array[outside].flat[0]}) "
+                f"are not within specified old range: <{old_min}, {old_max}>"
+            )
+    result = array - old_min
+    result *= scale
+    result += new_min
+    return result
+
+
+def lerp(start: "ArrayLike", end: "ArrayLike", t: "ArrayLike") -> ArrayResult:
+    """Linearly interpolate between `start` and `end` by `t` (0 = start, 1 = end), element-wise."""
+    numpy = get_numpy()
+    if numpy is None:
+        starts, ends, ts = _flat(start), _flat(end), _flat(t)
+        size = max(len(starts), len(ends), len(ts))
+        if any(len(items) not in (1, size) for items in (starts, ends, ts)):
+            raise ValueError(f"Can't interpolate sequences of different lengths: {len(starts)}, {len(ends)} and {len(ts)}")
+        starts, ends, ts = (items * size if len(items) == 1 else items for items in (starts, ends, ts))
+        return [a + (b - a) * amount for a, b, amount in zip(starts, ends, ts)]
+
+    start = numpy.asarray(start, dtype=numpy.float64)
+    return start + (numpy.asarray(end, dtype=numpy.float64) - start) * numpy.asarray(t, dtype=numpy.float64)
+
+
+def clamp(values: "ArrayLike", low: NumericType, high: NumericType) -> ArrayResult:
+    """Clamp all of the given values between `low` and `high`."""
+    numpy = get_numpy()
+    if numpy is None:
+        return [min(max(value, low), high) for value in _flat(values)]
+    return numpy.clip(numpy.asarray(values, dtype=numpy.float64), low, high)
+
+
+def smoothstep(edge0: NumericType, edge1: NumericType, values: "ArrayLike") -> ArrayResult:
+    """
+    Smooth Hermite interpolation of given values between `edge0` and `edge1`.
+
+    Results go from 0 (for values at or below `edge0`) to 1 (at or above `edge1`),
+    with zero slope at both of the edges.
+    """
+    numpy = get_numpy()
+    if numpy is None:
+        results = []
+        for value in _flat(values):
+            t = min(max((value - edge0) / (edge1 - edge0), 0.0), 1.0)
+            results.append(t * t * (3 - 2 * t))
+        return results
+
+    t = numpy.asarray(values, dtype=numpy.float64) - edge0
+    t /= edge1 - edge0
+    numpy.clip(t, 0, 1, out=t)
+    return t * t * (3 - 2 * t)
+
+
+def normalize_vectors(vectors: "ArrayLike") -> ArrayResult:
+    """Get unit vectors with the directions of given 2D vectors (`(N, 2)`), zero vectors are kept as they are."""
+    numpy = get_numpy()
+    if numpy is None:
+        results = []
+        for x, y in vectors:  # type: ignore
+            length = math.hypot(x, y)
+            results.append([x / length, y / length] if length else [0.0, 0.0])
+        return results
+
+    array = _vectors(vectors)
+    lengths = numpy.hypot(array[:, 0], array[:, 1])[:, None]
+    return numpy.divide(array, lengths, out=numpy.zeros_like(array), where=lengths != 0)
+
+
+def rotate_vectors(vectors: "ArrayLike", angle: float) -> ArrayResult:
+    """Rotate all of the given 2D vectors (`(N, 2)`) by `angle` radians (counter-clockwise in math orientation)."""
+    cos, sin = math.cos(angle), math.sin(angle)
+    numpy = get_numpy()
+    if numpy is None:
+        return [[x * cos - y * sin, x * sin + y * cos] for x, y in vectors]  # type: ignore
+
+    rotation = numpy.array([[cos, sin], [-sin, cos]])
+    return _vectors(vectors) @ rotation
+
+
+def distance_matrix(first: "ArrayLike", second: Optional["ArrayLike"] = None) -> ArrayResult:
+    """
+    Get the distances between every pair of the given 2D points, as an `(N, M)` matrix.
+
+    `first` holds N points and `second` M points (`(N, 2)` and `(M, 2)` arrays), if
+    `second` isn't specified, distances between all of the points in `first` are computed.
+    """
+    numpy = get_numpy()
+    if numpy is None:
+        others = first if second is None else second
+        return [[math.hypot(x - other_x, y - other_y) for other_x, other_y in others] for x, y in first]  # type: ignore
+
+    points = _vectors(first)
+    others = points if second is None else _vectors(second)
+    # Working with each axis separately keeps all of the intermediate arrays contiguous
+    dx = numpy.subtract.outer(points[:, 0], others[:, 0])
+    dy = numpy.subtract.outer(points[:, 1], others[:, 1])
+    dx *= dx
+    dy *= dy
+    dx += dy
+    return numpy.sqrt(dx, out=dx)
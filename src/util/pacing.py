@@ -0,0 +1,146 @@
+from collections import deque
+from typing import Optional
+
+import pygame
+
+from src.config import Window
+from src.util.log import get_logger
+
+log = get_logger(__name__)
+
+
+class FramePacer:
+    """
+    Adaptive frame pacing, adjusting the game loop to the load of the machine.
+
+    After every frame, `wait` sleeps the rest of the frame (with the pygame clock)
+    and records how long the work of the frame took (without the sleep). Based on
+    the recent frames, the pacer intervenes in three ways:
+
+    - Overloaded frames (the work took longer than the frame budget) make the next
+      redraw get skipped (`should_render` returns `False`), so that the ticks can
+      catch up. At most `max_skipped_frames` redraws are skipped in a row, so the
+      screen keeps updating even under a sustained load.
+    - Every `window` frames, the target rate is lowered (by `rate_step`) if too many
+      of the frames were overloaded, or raised back if the slower frames would still
+      comfortably fit the higher rate, always staying between `min_rate` and `max_rate`.
+    - If the clock keeps oversleeping (the sleep granularity of the system is too
+      coarse for the frame budget), the pacer switches from `Clock.tick` to
+      `Clock.tick_busy_loop`, which is precise, at the cost of some CPU time.
+
+    Every intervention is counted, see `report`.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[int] = None,
+        min_rate: Optional[int] = None,
+        max_rate: Optional[int] = None,
+        window: int = 30,
+        rate_step: int = 5,
+        overload_threshold: float = 0.25,
+        max_skipped_frames: Optional[int] = None,
+        oversleep_threshold: Optional[float] = None,
+    ):
+        self.min_rate = min_rate if min_rate is not None else Window.min_tick_rate
+        self.max_rate = max_rate if max_rate is not None else Window.max_tick_rate
+        if not 0 < self.min_rate <= self.max_rate:
+            raise ValueError(f"Invalid frame rate bounds: {self.min_rate} - {self.max_rate}")
+        if window < 1:
+            raise ValueError(f"Pacing window must hold at least a single frame, got {window}")
+
+        self.rate = min(max(rate if rate is not None else Window.tick_rate, self.min_rate), self.max_rate)
+        self.window = window
+        self.rate_step = rate_step
+        self.overload_threshold = overload_threshold
+        self.max_skipped_frames = max_skipped_frames if max_skipped_frames is not None else Window.max_frame_skip
+        # Average oversleep (in milliseconds) above which the busy loop is used
+        self.oversleep_threshold = oversleep_threshold if oversleep_threshold is not None else Window.max_oversleep
+        self.busy_loop = False
+
+        # Work time (in milliseconds, without the sleep) of the recent frames
+        self._work_times: deque[int] = deque(maxlen=window)
+        self._oversleep = 0.0
+        self._overloaded = False
+        self._skipped_in_row = 0
+
+        self.frames = 0
+        self.skipped_frames = 0
+        self.rate_decreases = 0
+        self.rate_increases = 0
+        self.busy_loop_switches = 0
+
+    @property
+    def budget(self) -> float:
+        """Get the time available for a single frame at the current rate (in milliseconds)."""
+        return 1000 / self.rate
+
+    def should_render(self) -> bool:
+        """Check whether the current frame should be rendered, or skipped because the last one was overloaded."""
+        if self._overloaded and self._skipped_in_row < self.max_skipped_frames:
+            self._skipped_in_row += 1
+            self.skipped_frames += 1
+            return False
+        self._skipped_in_row = 0
+        return True
+
+    def wait(self, clock: pygame.time.Clock) -> int:
+        """Sleep the rest of the current frame, returning the duration of the whole frame (in milliseconds)."""
+        budget = self.budget
+        frame_time = clock.tick_busy_loop(self.rate) if self.busy_loop else clock.tick(self.rate)
+        work_time = clock.get_rawtime()
+
+        self.frames += 1
+        self._overloaded = work_time > budget
+        self._work_times.append(work_time)
+        if not self._overloaded and not self.busy_loop:
+            # Exponential moving average of how much longer the clock slept than it should have
+            self._oversleep += (frame_time - budget - self._oversleep) / self.window
+            if self._oversleep > self.oversleep_threshold:
+                self._switch_to_busy_loop()
+
+        if self.frames % self.window == 0:
+            self._adjust_rate()
+        return frame_time
+
+    def _switch_to_busy_loop(self) -> None:
+        """Start using `Clock.tick_busy_loop`, since the sleep granularity is too coarse."""
+        self.busy_loop = True
+        self.busy_loop_switches += 1
+        log.info(f"Clock oversleeps by {self._oversleep:.1f} ms on average, switching to busy loop pacing")
+
+    def _adjust_rate(self) -> None:
+        """Lower or raise the target rate, based on the work times of the recent frames."""
+        work_times = sorted(self._work_times)
+        budget = self.budget
+        overloaded = sum(work_time > budget for work_time in work_times)
+
+        if overloaded > len(work_times) * self.overload_threshold and self.rate > self.min_rate:
+            self.rate = max(self.rate - self.rate_step, self.min_rate)
+            self.rate_decreases += 1
+            log.debug(f"{overloaded} of the last {len(work_times)} frames were overloaded, lowering rate to {self.rate}")
+        elif self.rate < self.max_rate:
+            raised_rate = min(self.rate + self.rate_step, self.max_rate)
+            # Only raise the rate when even the slower frames leave some headroom at the raised rate
+            if work_times[int(len(work_times) * 0.9)] < 1000 / raised_rate * 0.75:
+                self.rate = raised_rate
+                self.rate_increases += 1
+                log.debug(f"Frames fit the budget with enough headroom, raising rate to {self.rate}")
+
+    def report(self) -> dict[str, int]:
+        """Get the amount of interventions of the pacer (and the amount of frames paced)."""
+        return {
+            "frames": self.frames,
+            "skipped_frames": self.skipped_frames,
+            "rate_decreases": self.rate_decreases,
+            "rate_increases": self.rate_increases,
+            "busy_loop_switches": self.busy_loop_switches,
+        }
+
+    def log_report(self) -> None:
+        """Log the interventions of the pacer."""
+        log.info(
+            f"Frame pacing: skipped {self.skipped_frames} of {self.frames} redraws, "
+            f"lowered the rate {self.rate_decreases} times, raised it {self.rate_increases} times "
+            f"(final rate {self.rate}), {'using' if self.busy_loop else 'not using'} busy loop"
+        )
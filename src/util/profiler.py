@@ -0,0 +1,168 @@
+import csv
+import json
+import math
+import time
+from array import array
+from enum import IntEnum
+from pathlib import Path
+from typing import Optional, Union
+
+from src.config import Window
+from src.util.log import get_logger
+
+log = get_logger(__name__)
+
+
+class Phase(IntEnum):
+    """Phases of a single frame of the game loop."""
+
+    EVENTS = 0
+    TICK = 1
+    REDRAW = 2
+    DISPLAY_UPDATE = 3
+    SLEEP = 4
+
+
+class FrameProfiler:
+    """
+    Measure how much time each phase of the game loop takes.
+
+    The game loop calls `start_frame` at the beginning of each frame, `mark` after
+    every phase (the time since the previous mark is added to given phase) and
+    `end_frame` once the frame is done. Durations are kept (in nanoseconds) for the
+    last `history` frames, in fixed-size arrays used as ring buffers, so profiling
+    doesn't allocate anything while the game runs.
+
+    Frames taking longer than `budget` seconds (by default a single tick at
+    `Window.tick_rate`), not counting the sleep phase, are counted as over budget.
+    Every `log_interval` frames, a summary is logged (set to `None` to disable this)
+    and the full history can be dumped as CSV or JSON with `dump`.
+    """
+
+    def __init__(
+        self,
+        history: int = 600,
+        budget: Optional[float] = None,
+        log_interval: Optional[int] = 300,
+        dump_path: Union[Path, str, None] = None,
+    ):
+        if history < 1:
+            raise ValueError(f"Profiler history must hold at least a single frame, got {history}")
+
+        self.history = history
+        self.budget_ns = int((budget if budget is not None else 1 / Window.tick_rate) * 1e9)
+        self.log_interval = log_interval
+        self.dump_path = Path(dump_path) if dump_path is not None else None
+
+        self._samples = [array("q", bytes(8 * history)) for _ in Phase]
+        self._totals = array("q", bytes(8 * history))
+        self._index = 0
+        self._frame_start = 0
+        self._last_mark = 0
+
+        self.frames = 0
+        self.over_budget = 0
+
+    def start_frame(self) -> None:
+        """Start measuring a new frame."""
+        index = self._index
+        for samples in self._samples:
+            samples[index] = 0
+        self._frame_start = self._last_mark = time.perf_counter_ns()
+
+    def mark(self, phase: Phase) -> None:
+        """Add the time elapsed since the last mark to given phase of the current frame."""
+        now = time.perf_counter_ns()
+        self._samples[phase][self._index] += now - self._last_mark
+        self._last_mark = now
+
+    def end_frame(self) -> None:
+        """Finish measuring the current frame."""
+        index = self._index
+        total = time.perf_counter_ns() - self._frame_start
+        self._totals[index] = total
+        # Sleeping in the clock only fills up the remaining budget, it's not a part of the work
+        if total - self._samples[Phase.SLEEP][index] > self.budget_ns:
+            self.over_budget += 1
+
+        self._index = (self._index + 1) % self.history
+        self.frames += 1
+        if self.log_interval and self.frames % self.log_interval == 0:
+            log.info(self.format_summary())
+
+    def _recorded(self, samples: array) -> list[int]:
+        """Get recorded samples from given ring buffer, ordered from the oldest one."""
+        if self.frames < self.history:
+            return samples[:self._index].tolist()
+        return samples[self._index:].tolist() + samples[:self._index].tolist()
+
+    @staticmethod
+    def _percentile(ordered: list[int], percent: float) -> int:
+        """Get given percentile (nearest-rank) from sorted samples."""
+        if not ordered:
+            return 0
+        rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+        return ordered[rank]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Get p50/p95/p99 and max durations (in milliseconds) of each phase and of the whole frame.
+
+        Only the frames held in the history are taken into account.
+        """
+        stats = {}
+        buffers = [(phase.name.lower(), self._samples[phase]) for phase in Phase] + [("total", self._totals)]
+        for name, samples in buffers:
+            ordered = sorted(self._recorded(samples))
+            stats[name] = {
+                "p50": self._percentile(ordered, 50) / 1e6,
+                "p95": self._percentile(ordered, 95) / 1e6,
+                "p99": self._percentile(ordered, 99) / 1e6,
+                "max": (ordered[-1] if ordered else 0) / 1e6,
+            }
+        return stats
+
+    def format_summary(self) -> str:
+        """Get a human readable summary of the frame timings."""
+        parts = [
+            f"{name} {values['p50']:.2f}/{values['p95']:.2f}/{values['p99']:.2f}/{values['max']:.2f}"
+            for name, values in self.summary().items()
+        ]
+        return (
+            f"Frame timings (p50/p95/p99/max ms) over last {min(self.frames, self.history)} frames: {', '.join(parts)}; "
+            f"{self.over_budget}/{self.frames} frames over budget ({self.budget_ns / 1e6:.2f} ms)"
+        )
+
+    def dump(self, path: Union[Path, str, None] = None) -> None:
+        """
+        Dump the recorded frame timings into a CSV or a JSON file (decided by the file suffix).
+
+        CSV file contains a row with durations (in nanoseconds) of each phase for every frame
+        in the history, JSON file also includes the summary and the over budget frame count.
+        If `path` isn't specified, `self.dump_path` is used.
+        """
+        path = Path(path) if path is not None else self.dump_path
+        if path is None:
+            raise ValueError("No path to dump the frame timings to was specified.")
+
+        header = [phase.name.lower() for phase in Phase] + ["total"]
+        columns = [self._recorded(self._samples[phase]) for phase in Phase] + [self._recorded(self._totals)]
+        rows = list(zip(*columns))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            data = {
+                "frames": self.frames,
+                "over_budget": self.over_budget,
+                "budget_ms": self.budget_ns / 1e6,
+                "summary": self.summary(),
+                "history_ns": [dict(zip(header, row)) for row in rows],
+            }
+            path.write_text(json.dumps(data, indent=2), encoding="utf8")
+        else:
+            with path.open("w", newline="", encoding="utf8") as file:
+                writer = csv.writer(file)
+                writer.writerow(header)
+                writer.writerows(rows)
+
+        log.debug(f"Frame timings dumped to {path}")
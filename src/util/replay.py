@@ -0,0 +1,236 @@
+import hashlib
+import marshal
+import pickle
+import random
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union
+
+import pygame
+from pygame.event import EventType  # type: ignore (see: https://github.com/pygame/pygame/issues/2867)
+
+from src.util.input import InputState
+from src.util.lazy_numpy import get_numpy
+from src.util.log import get_logger
+
+log = get_logger(__name__)
+
+MAGIC = b"PGRP"
+VERSION = 2
+
+# Header: magic, version, RNG seed, tick rate, marshal format version (of the event attributes)
+HEADER = struct.Struct("<4sHQHB")
+# Record kind (b"R" = input record, b"E" = end of the recording)
+KIND = struct.Struct("<c")
+# Input record: tick, amount of events, amount of pressed keys (INPUT_UNCHANGED if the input state didn't change)
+RECORD = struct.Struct("<IHH")
+# Input state: mouse x, mouse y, pressed mouse buttons (bit mask)
+MOUSE = struct.Struct("<hhB")
+# Event: type, length of the marshalled attributes (marshal can read its older format versions, but not
+# newer ones, so recordings can only be replayed on Python versions with the same or newer marshal format)
+EVENT = struct.Struct("<IH")
+# End of the recording: amount of ticks ran, SHA-256 digest of the final state
+FOOTER = struct.Struct("<I32s")
+
+INPUT_UNCHANGED = 0xFFFF
+# Length of the key state tuple returned by `pygame.key.get_pressed` (indexed by scancodes)
+KEY_STATE_SIZE = 512
+
+PathType = Union[str, Path]
+# Events and the input state (`None` if it didn't change) recorded before a tick
+ReplayFrame = tuple[list[EventType], Optional[InputState]]
+
+
+class ReplayError(Exception):
+    """Raised when a recording can't be read."""
+
+
+class ReplayMismatchError(Exception):
+    """Raised when the final state of a replayed game doesn't match the recorded one."""
+
+
+def seed_rngs(seed: int) -> None:
+    """Seed the global random number generators (`random` and NumPy, if available)."""
+    random.seed(seed)
+    # NumPy gets imported here (if it wasn't already), its global RNG has to be seeded even if it's only used later
+    numpy = get_numpy()
+    if numpy is not None:
+        numpy.random.seed(seed % 2**32)
+
+
+def state_digest(state: Any) -> bytes:
+    """Get the SHA-256 digest of given (picklable) game state."""
+    return hashlib.sha256(pickle.dumps(state, protocol=4)).digest()
+
+
+def _marshal_attributes(event: EventType, strict: bool, reported: set[tuple[int, str]]) -> bytes:
+    """
+    Serialize the event attributes.
+
+    Attributes which can't be serialized (f.e. window objects) raise `ReplayError` when
+    `strict` is set, otherwise they're dropped, with a warning logged once per every
+    event type and attribute (tracked in `reported`), since the replay might diverge.
+    """
+    try:
+        return marshal.dumps(event.dict)
+    except ValueError:
+        attributes = {}
+        for name, value in event.dict.items():
+            try:
+                marshal.dumps(value)
+            except ValueError:
+                if strict:
+                    raise ReplayError(f"Attribute {name} of {pygame.event.event_name(event.type)} event can't be recorded: {value!r}")
+                if (event.type, name) not in reported:
+                    reported.add((event.type, name))
+                    log.warning(
+                        f"Dropping attribute {name} of {pygame.event.event_name(event.type)} events from the recording, "
+                        f"it can't be serialized ({type(value).__name__}), replays relying on it will diverge"
+                    )
+                continue
+            attributes[name] = value
+        return marshal.dumps(attributes)
+
+
+class InputRecorder:
+    """
+    Record the input of a game (events and the input state) into a compact binary file.
+
+    Only the frames with any events or with a changed input state are stored, every
+    record holds the number of the tick it came before. The recording also holds
+    the seed of the RNGs, so that the whole run can be replayed deterministically,
+    and at the end, the digest of the final game state, which the replay is checked
+    against.
+
+    Event attributes which can't be serialized are dropped (with a warning), or
+    raise `ReplayError` with `strict`.
+    """
+
+    def __init__(self, path: PathType, seed: int, tick_rate: int, strict: bool = False):
+        self.path = Path(path)
+        self.seed = seed
+        self.strict = strict
+        self.records = 0
+        self._reported: set[tuple[int, str]] = set()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Optional[BinaryIO] = self.path.open("wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, seed, tick_rate, marshal.version))
+        self._last_state: Optional[tuple] = None
+
+    def record(self, tick: int, events: Sequence[EventType], input_state: InputState) -> None:
+        """Record the events and the input state received before given tick."""
+        if self._file is None:
+            raise ValueError("The recording was already finished.")
+
+        buttons = sum(1 << index for index, pressed in enumerate(input_state.mouse_buttons[:8]) if pressed)
+        state = (tuple(input_state.keys), input_state.mouse_position, buttons)
+        state_changed = state != self._last_state
+        if not events and not state_changed:
+            return
+
+        parts = []
+        if state_changed:
+            self._last_state = state
+            pressed = [scancode for scancode, is_pressed in enumerate(state[0]) if is_pressed]
+            parts.append(RECORD.pack(tick, len(events), len(pressed)))
+            parts.append(struct.pack(f"<{len(pressed)}H", *pressed))
+            parts.append(MOUSE.pack(*input_state.mouse_position, buttons))
+        else:
+            parts.append(RECORD.pack(tick, len(events), INPUT_UNCHANGED))
+
+        for event in events:
+            attributes = _marshal_attributes(event, self.strict, self._reported)
+            parts.append(EVENT.pack(event.type, len(attributes)))
+            parts.append(attributes)
+
+        self._file.write(KIND.pack(b"R") + b"".join(parts))
+        self.records += 1
+
+    def finish(self, ticks: int, final_state: Any) -> None:
+        """Finish the recording, storing the amount of ticks ran and the final state digest."""
+        if self._file is None:
+            return
+        self._file.write(KIND.pack(b"E") + FOOTER.pack(ticks, state_digest(final_state)))
+        self._file.close()
+        self._file = None
+        log.debug(f"Recorded {ticks} ticks ({self.records} input records) into {self.path}")
+
+
+class Replay:
+    """Recording loaded by `Replay.load`, holding the recorded input of every tick."""
+
+    def __init__(self, seed: int, tick_rate: int, ticks: int, digest: bytes, frames: dict[int, list[ReplayFrame]]):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.ticks = ticks
+        self.digest = digest
+        self.frames = frames
+
+    @classmethod
+    def load(cls, path: PathType) -> "Replay":
+        """Load the recording from given file."""
+        data = Path(path).read_bytes()
+        try:
+            magic, version, seed, tick_rate, marshal_version = HEADER.unpack_from(data)
+        except struct.error:
+            raise ReplayError(f"{path} is not a recording, it's too short")
+        if magic != MAGIC:
+            raise ReplayError(f"{path} is not a recording")
+        if version != VERSION:
+            raise ReplayError(f"Unsupported recording version {version} (expected {VERSION})")
+        if marshal_version > marshal.version:
+            raise ReplayError(
+                f"Recording uses marshal format {marshal_version}, which this Python version can't read "
+                f"(supports up to {marshal.version}), replay it with the Python version it was recorded with"
+            )
+
+        frames: dict[int, list[ReplayFrame]] = {}
+        offset = HEADER.size
+        try:
+            while True:
+                kind, = KIND.unpack_from(data, offset)
+                offset += KIND.size
+                if kind == b"E":
+                    ticks, digest = FOOTER.unpack_from(data, offset)
+                    break
+
+                tick, event_count, key_count = RECORD.unpack_from(data, offset)
+                offset += RECORD.size
+                input_state = None
+                if key_count != INPUT_UNCHANGED:
+                    keys = [False] * KEY_STATE_SIZE
+                    for scancode in struct.unpack_from(f"<{key_count}H", data, offset):
+                        keys[scancode] = True
+                    offset += 2 * key_count
+                    mouse_x, mouse_y, buttons = MOUSE.unpack_from(data, offset)
+                    offset += MOUSE.size
+                    input_state = InputState(
+                        pygame.key.ScancodeWrapper(keys),
+                        (mouse_x, mouse_y),
+                        tuple(bool(buttons & 1 << index) for index in range(3)),
+                    )
+
+                events = []
+                for _ in range(event_count):
+                    event_type, length = EVENT.unpack_from(data, offset)
+                    offset += EVENT.size
+                    try:
+                        attributes = marshal.loads(data[offset:offset + length])
+                    except (EOFError, ValueError, TypeError):
+                        raise ReplayError(f"Recording {path} holds corrupted event attributes at byte {offset}")
+                    events.append(pygame.event.Event(event_type, attributes))
+                    offset += length
+                frames.setdefault(tick, []).append((events, input_state))
+        except struct.error:
+            raise ReplayError(f"Recording {path} is truncated (the game didn't finish recording it)")
+
+        return cls(seed, tick_rate, ticks, digest, frames)
+
+    def verify(self, ticks: int, final_state: Any) -> None:
+        """Make sure the replayed game ended in the same state as the recorded one."""
+        if ticks != self.ticks:
+            raise ReplayMismatchError(f"Replay ran {ticks} ticks, but the recording has {self.ticks} ticks")
+        if state_digest(final_state) != self.digest:
+            raise ReplayMismatchError(f"Final state after {ticks} ticks doesn't match the recorded state")
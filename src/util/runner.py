@@ -0,0 +1,235 @@
+"""
+Run many independent headless rounds of a game in parallel, across a process pool.
+
+This is an alternative entry point to `src/__main__.py`, meant for balancing and
+testing (f.e. of AI), where many rounds of the same game need to be simulated:
+
+    python -m src.util.runner src.game:Game --rounds 100 --max-ticks 1000 --param difficulty=3
+
+Every round runs in a worker process (one per CPU core by default), with its own
+seed and its own game instance, until the game stops running or the tick limit is
+reached. The results of the rounds (see `BaseGame.round_result`) are aggregated
+into a `RunSummary`.
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+import traceback
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Optional
+
+from src.util.base_game import BaseGame
+from src.util.log import get_logger
+from src.util.replay import seed_rngs
+
+log = get_logger(__name__)
+
+
+class RoundResult:
+    """Outcome of a single round ran by the runner."""
+
+    __slots__ = ("index", "seed", "params", "ticks", "ended", "duration", "result", "error")
+
+    def __init__(
+        self,
+        index: int,
+        seed: int,
+        params: dict[str, Any],
+        ticks: int = 0,
+        ended: bool = False,
+        duration: float = 0.0,
+        result: Any = None,
+        error: Optional[str] = None,
+    ):
+        self.index = index
+        self.seed = seed
+        self.params = params
+        self.ticks = ticks
+        # Whether the game was ended (rather than stopped by the tick limit)
+        self.ended = ended
+        self.duration = duration
+        self.result = result
+        # Formatted traceback, if the round failed
+        self.error = error
+
+    def __repr__(self) -> str:
+        """Get the index, seed and outcome of the round."""
+        outcome = "failed" if self.error is not None else f"{self.ticks} ticks, result={self.result!r}"
+        return f"<RoundResult #{self.index} (seed {self.seed}): {outcome}>"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the result as a dict (f.e. for dumping it as JSON)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RunSummary:
+    """Aggregated results of all of the rounds ran by the runner, ordered by the round index."""
+
+    def __init__(self, results: Sequence[RoundResult], duration: float, processes: int):
+        self.results = sorted(results, key=lambda result: result.index)
+        self.duration = duration
+        self.processes = processes
+
+    @property
+    def failed(self) -> list[RoundResult]:
+        """Get the rounds which failed with an exception."""
+        return [result for result in self.results if result.error is not None]
+
+    @property
+    def ended(self) -> int:
+        """Get the amount of rounds which were ended by the game, before reaching the tick limit."""
+        return sum(result.ended for result in self.results)
+
+    @property
+    def total_ticks(self) -> int:
+        """Get the amount of ticks ran in all of the rounds."""
+        return sum(result.ticks for result in self.results)
+
+    @property
+    def ticks_per_second(self) -> float:
+        """Get the amount of ticks ran per second (of wall time) across all of the processes."""
+        return self.total_ticks / self.duration if self.duration > 0 else 0.0
+
+    def describe(self) -> str:
+        """Get a human readable summary of the run."""
+        return (
+            f"Ran {len(self.results)} rounds ({self.ended} ended, {len(self.failed)} failed) "
+            f"on {self.processes} processes in {self.duration:.2f}s: "
+            f"{self.total_ticks} ticks ({self.ticks_per_second:,.0f} ticks per second)"
+        )
+
+
+def run_round(
+    game_class: type[BaseGame],
+    index: int,
+    seed: int,
+    params: dict[str, Any],
+    max_ticks: Optional[int],
+) -> RoundResult:
+    """
+    Run a single headless round of given game, with given seed and parameters.
+
+    The parameters are passed to the game class as keyword arguments. Exceptions
+    raised by the game are stored in the result, so that a single failing round
+    doesn't abort the whole run.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    start_time = time.perf_counter()
+    try:
+        seed_rngs(seed)
+        game = game_class(headless=True, **params)  # type: ignore
+        game.run_headless(max_ticks=max_ticks)
+        return RoundResult(
+            index,
+            seed,
+            params,
+            ticks=game.tick_count,
+            ended=game.ended,
+            duration=time.perf_counter() - start_time,
+            result=game.round_result(),
+        )
+    except Exception:
+        return RoundResult(index, seed, params, duration=time.perf_counter() - start_time, error=traceback.format_exc())
+
+
+def run_rounds(
+    game_class: type[BaseGame],
+    rounds: int,
+    max_ticks: Optional[int] = None,
+    seed: Optional[int] = None,
+    params: Optional[Sequence[dict[str, Any]]] = None,
+    processes: Optional[int] = None,
+) -> RunSummary:
+    """
+    Run given amount of independent headless rounds of given game in a process pool.
+
+    Every round gets its own seed, derived from `seed` (random, if not specified), and
+    its own parameters: `params` either holds a single dict (used by all of the rounds),
+    or one dict per round. By default, a process is started per every CPU core.
+
+    The game class has to be importable by the worker processes (defined at the top
+    level of a module) and the round results have to be picklable.
+    """
+    if params is None:
+        params = [{}]
+    if len(params) not in (1, rounds):
+        raise ValueError(f"Expected a single set of parameters, or one for each of the {rounds} rounds, got {len(params)}")
+    round_params = list(params) * rounds if len(params) == 1 else list(params)
+
+    seed_rng = random.Random(seed)
+    seeds = [seed_rng.getrandbits(63) for _ in range(rounds)]
+    processes = min(processes or os.cpu_count() or 1, rounds) or 1
+
+    log.info(f"Running {rounds} rounds of {game_class.__name__} on {processes} processes")
+    results = []
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(run_round, game_class, index, seeds[index], round_params[index], max_ticks)
+            for index in range(rounds)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if result.error is not None:
+                log.error(f"Round #{result.index} (seed {result.seed}) failed:\n{result.error}")
+            results.append(result)
+
+    summary = RunSummary(results, time.perf_counter() - start_time, processes)
+    log.info(summary.describe())
+    return summary
+
+
+def _load_game_class(path: str) -> type[BaseGame]:
+    """Import the game class from given "module:Class" path."""
+    module_name, _, class_name = path.partition(":")
+    game_class = getattr(importlib.import_module(module_name), class_name or "Game")
+    if not (isinstance(game_class, type) and issubclass(game_class, BaseGame)):
+        raise TypeError(f"{path} is not a BaseGame subclass")
+    return game_class
+
+
+def _parse_param(param: str) -> tuple[str, Any]:
+    """Parse a "name=value" parameter, the value is parsed as JSON (or kept as a string, if it isn't valid JSON)."""
+    name, separator, value = param.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected a name=value parameter, got {param}")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def main() -> None:
+    """Run the rounds given on the command line and print the summary."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("game", nargs="?", default="src.game:Game", help="Game class to run (module:Class)")
+    parser.add_argument("--rounds", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-ticks", type=int, default=1_000, help="Tick limit of each round (0 for no limit)")
+    parser.add_argument("--seed", type=int, help="Seed used to derive the seeds of the rounds")
+    parser.add_argument("--processes", type=int, help="Amount of worker processes (one per CPU core by default)")
+    parser.add_argument("--param", type=_parse_param, action="append", default=[], help="Game parameter (name=value)")
+    parser.add_argument("--output", help="Write the results of all of the rounds into given JSON file")
+    args = parser.parse_args()
+
+    summary = run_rounds(
+        _load_game_class(args.game),
+        args.rounds,
+        max_ticks=args.max_ticks or None,
+        seed=args.seed,
+        params=[dict(args.param)],
+        processes=args.processes,
+    )
+    print(summary.describe())
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf8") as file:
+            json.dump([result.as_dict() for result in summary.results], file, indent=2, default=repr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+from collections.abc import Callable, Generator
+from typing import Any, Optional
+
+# Callbacks pending in a scheduler with their remaining delays (in ticks), see `Scheduler.capture`
+Schedule = list[tuple["TimerHandle", int]]
+
+# Coroutine scheduled with `Scheduler.start`, yielding the amount of ticks to wait
+TickCoroutine = Generator[Optional[int], None, None]
+
+
+class TimerHandle:
+    """Handle of a callback scheduled by `Scheduler`, which can be used to cancel it."""
+
+    __slots__ = ("scheduler", "callback", "args", "interval", "due", "active")
+
+    def __init__(self, scheduler: "Scheduler", callback: Callable[..., Any], args: tuple, interval: Optional[int]):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.args = args
+        # Amount of ticks between the runs of repeating callbacks, `None` for one-shot ones
+        self.interval = interval
+        # Tick in which the callback runs next
+        self.due = 0
+        # Whether the callback is still pending (it wasn't cancelled or finished yet)
+        self.active = True
+
+    def __repr__(self) -> str:
+        """Get the callback and the state of the handle."""
+        state = f"due at tick {self.due}" if self.active else "inactive"
+        return f"<{self.__class__.__name__} {self.callback!r} ({state})>"
+
+    def cancel(self) -> None:
+        """Cancel the callback, it won't run anymore (cancelling an inactive handle does nothing)."""
+        if self.active:
+            self.active = False
+            self.scheduler._release()
+
+    def _finish(self) -> None:
+        """Mark the handle as no longer pending, once the callback is done."""
+        self.active = False
+        self.scheduler._release()
+
+    def _run(self) -> None:
+        """Run the callback, scheduling the next run first if it's repeating (so that it can cancel itself)."""
+        if self.interval is None:
+            self._finish()
+        else:
+            self.scheduler._schedule(self, self.interval)
+        self.callback(*self.args)
+
+
+class CoroutineHandle(TimerHandle):
+    """Handle of a coroutine (generator) started by `Scheduler.start`, which can be used to cancel it."""
+
+    __slots__ = ()
+
+    def cancel(self) -> None:
+        """Cancel the coroutine, closing the generator (unless it's cancelling itself)."""
+        if not self.active:
+            return
+        super().cancel()
+        try:
+            self.callback.close()  # type: ignore
+        except ValueError:  # The generator is currently running (it's cancelling itself)
+            pass
+
+    def _run(self) -> None:
+        """Resume the coroutine until it yields again, scheduling it after the yielded amount of ticks."""
+        try:
+            delay = next(self.callback)  # type: ignore
+        except StopIteration:
+            self._finish()
+            return
+        if self.active:
+            self.scheduler._schedule(self, delay or 1)
+
+
+class Scheduler:
+    """
+    Run delayed and repeating callbacks (and coroutines) in the ticks they're due.
+
+    Scheduled callbacks are stored in buckets keyed by the number of the tick they're
+    due in, so scheduling a callback, cancelling it (cancelled callbacks are only marked
+    as inactive and dropped once their tick comes) and checking whether anything is due
+    are all constant time operations. Every tick, `advance` only runs the bucket of the
+    current tick, no matter how many other callbacks are pending.
+
+    Delays are in ticks, a delay of 0 runs the callback in the current tick (unless it's
+    scheduled by a callback, which runs in the current tick already, then it runs in the
+    next one). Coroutines are generators yielding the amount of ticks to wait before
+    they should be resumed (yielding `None` or 0 resumes them in the next tick).
+    """
+
+    def __init__(self):
+        self._buckets: dict[int, list[TimerHandle]] = {}
+        self._pending = 0
+        # Bucket of the tick which is currently running, `None` outside of `advance`
+        self._running: Optional[list[TimerHandle]] = None
+        # Number of the tick, the callbacks of which run on the next `advance`
+        self.tick = 0
+
+    def __len__(self) -> int:
+        """Get the amount of pending callbacks and coroutines."""
+        return self._pending
+
+    def _release(self) -> None:
+        """
+        Note that a callback is no longer pending.
+
+        Once nothing is pending, the buckets only hold cancelled callbacks, they're dropped
+        right away, since `advance` isn't needed (and the game loop skips it) until
+        something gets scheduled again.
+        """
+        self._pending -= 1
+        if not self._pending:
+            self._buckets.clear()
+
+    def _schedule(self, handle: TimerHandle, delay: int) -> TimerHandle:
+        """Put given handle into the bucket of the tick it's due in."""
+        if delay < 0:
+            raise ValueError(f"Callbacks can't be scheduled into the past, got a delay of {delay} ticks")
+        due = self.tick + delay
+        if self._running is not None and delay == 0:
+            due += 1
+        handle.due = due
+        bucket = self._buckets.get(due)
+        if bucket is None:
+            self._buckets[due] = [handle]
+        else:
+            bucket.append(handle)
+        return handle
+
+    def call_later(self, delay: int, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """Run given callback (with given arguments) once, after given amount of ticks."""
+        self._pending += 1
+        return self._schedule(TimerHandle(self, callback, args, None), delay)
+
+    def call_every(self, interval: int, callback: Callable[..., Any], *args: Any, delay: Optional[int] = None) -> TimerHandle:
+        """Run given callback every `interval` ticks (the first run is after `delay` ticks, `interval` by default)."""
+        if interval < 1:
+            raise ValueError(f"Repeating callbacks need an interval of at least a single tick, got {interval}")
+        self._pending += 1
+        return self._schedule(TimerHandle(self, callback, args, interval), interval if delay is None else delay)
+
+    def start(self, coroutine: TickCoroutine, delay: int = 0) -> CoroutineHandle:
+        """Start running given coroutine (after given amount of ticks), resuming it whenever it's done waiting."""
+        self._pending += 1
+        return self._schedule(CoroutineHandle(self, coroutine, (), None), delay)  # type: ignore
+
+    def advance(self) -> int:
+        """Run all of the callbacks due in the current tick and move to the next tick, returning how many ran."""
+        tick = self.tick
+        if not self._pending:
+            # Most games don't schedule anything, skip the lookup of the bucket
+            self.tick = tick + 1
+            return 0
+        bucket = self._buckets.pop(tick, None)
+        ran = 0
+        if bucket is not None:
+            self._running = bucket
+            try:
+                for handle in bucket:
+                    if handle.active:
+                        handle._run()
+                        ran += 1
+            finally:
+                self._running = None
+        self.tick = tick + 1
+        return ran
+
+    def capture(self) -> Schedule:
+        """
+        Get the pending callbacks with the amount of ticks remaining until their next run.
+
+        The schedule can be restored later with `restore`, which reactivates the same
+        handles. Coroutines are left out, since a generator can't be rewound to its
+        state at the time of the capture.
+        """
+        return [
+            (handle, handle.due - self.tick)
+            for bucket in self._buckets.values()
+            for handle in bucket
+            if handle.active and not isinstance(handle, CoroutineHandle)
+        ]
+
+    def restore(self, schedule: Schedule) -> None:
+        """Cancel all of the pending callbacks and reschedule the ones from given captured schedule instead."""
+        self.clear()
+        for handle, delay in schedule:
+            handle.active = True
+            self._pending += 1
+            self._schedule(handle, delay)
+
+    def clear(self) -> None:
+        """Cancel all of the pending callbacks and coroutines and start counting the ticks from 0 again."""
+        buckets = list(self._buckets.values())
+        if self._running is not None:
+            buckets.append(self._running)
+        for bucket in buckets:
+            for handle in bucket:
+                handle.cancel()
+        self._buckets.clear()
+        self.tick = 0
@@ -0,0 +1,99 @@
+import math
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.util.body import RectBody
+
+# Fields of every body stored in the snapshot, in this order
+FIELDS = ("x", "y", "width", "height", "velocity")
+# Header of the serialized snapshot: amount of bodies, amount of fields per body
+HEADER = struct.Struct("<II")
+
+
+class BodySnapshot:
+    """
+    Packed snapshot of the state of many `RectBody` instances.
+
+    The position, size and velocity (if the body has any, f.e. `ControlledRectBody`)
+    of every body are stored as doubles in a single flat array, which makes capturing
+    and restoring the state of many bodies cheap: restoring writes the values back into
+    the original bodies in place, nothing gets reallocated. This can be used to quickly
+    restart a round (restoring a snapshot taken right after the setup), or to roll the
+    game back to an earlier tick.
+
+    Snapshots can be serialized into compact bytes with `to_bytes` (8 bytes per field),
+    the bodies aren't serialized, so they have to be given when loading the snapshot.
+    """
+
+    __slots__ = ("bodies", "values")
+
+    def __init__(self, bodies: Sequence["RectBody"], values: array):
+        if len(values) != len(bodies) * len(FIELDS):
+            raise ValueError(f"Snapshot holds {len(values)} values, but {len(bodies)} bodies need {len(bodies) * len(FIELDS)}")
+        self.bodies = bodies
+        self.values = values
+
+    def __len__(self) -> int:
+        """Get the amount of bodies in the snapshot."""
+        return len(self.bodies)
+
+    @classmethod
+    def capture(cls, bodies: Sequence["RectBody"]) -> "BodySnapshot":
+        """Capture the current state of given bodies."""
+        bodies = list(bodies)
+        values = array("d")
+        extend = values.extend
+        nan = math.nan
+        for body in bodies:
+            # Descriptors store the values in the instance dict, reading them from there skips the Python level getters
+            state = body.__dict__
+            extend((state["x"], state["y"], state["width"], state["height"], state.get("velocity", nan)))
+        return cls(bodies, values)
+
+    def restore(self) -> None:
+        """
+        Restore the captured state of all of the bodies, in place.
+
+        The values were already validated when they were captured, so they're written
+        directly, the hitbox of every body is invalidated afterwards (which also keeps
+        the collision world, if the body is registered into one, in sync).
+        """
+        rows = zip(*[iter(self.values)] * len(FIELDS))
+        for body, (x, y, width, height, velocity) in zip(self.bodies, rows):
+            state = body.__dict__
+            state["x"] = x
+            state["y"] = y
+            state["width"] = width
+            state["height"] = height
+            if velocity == velocity:  # NaN marks bodies without velocity
+                state["velocity"] = velocity
+            body._hitbox_changed()
+
+    @property
+    def nbytes(self) -> int:
+        """Get the size of the packed values (in bytes)."""
+        return len(self.values) * self.values.itemsize
+
+    def to_bytes(self) -> bytes:
+        """Serialize the snapshot values (without the bodies), as little-endian doubles."""
+        values = self.values
+        if sys.byteorder == "big":
+            values = array("d", values)
+            values.byteswap()
+        return HEADER.pack(len(self.bodies), len(FIELDS)) + values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, bodies: Sequence["RectBody"]) -> "BodySnapshot":
+        """Load a serialized snapshot of given bodies (in the same order as they were captured)."""
+        count, fields = HEADER.unpack_from(data)
+        if count != len(bodies) or fields != len(FIELDS):
+            raise ValueError(f"Snapshot of {count} bodies ({fields} fields each) can't be loaded into {len(bodies)} bodies")
+        values = array("d")
+        values.frombytes(data[HEADER.size:])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return cls(list(bodies), values)
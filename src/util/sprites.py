@@ -0,0 +1,169 @@
+from collections.abc import Hashable, Iterable
+from typing import Optional, TYPE_CHECKING, Union
+
+import pygame
+
+from src.util.dirty_rects import DirtyRectTracker
+
+if TYPE_CHECKING:
+    from src.util.body import RectBody
+
+# Sprite image, either a surface, or a key of an image stored in a texture atlas
+SpriteSource = Union[pygame.Surface, Hashable]
+
+
+class TextureAtlas:
+    """
+    Single large surface, holding many small images.
+
+    Images are packed into rows ("shelves"), each image is placed into the first
+    shelf it fits into, or into a new shelf if there is no such shelf. Drawing images
+    from a shared atlas means all of the blits use the same source surface, which is
+    cache friendly and lets a `SpriteBatch` send them to pygame all at once.
+    """
+
+    def __init__(self, width: int = 1024, height: int = 1024, padding: int = 1):
+        self.width = width
+        self.height = height
+        self.padding = padding
+
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+        self._areas: dict[Hashable, pygame.Rect] = {}
+        # Every shelf is [y, height, used width]
+        self._shelves: list[list[int]] = []
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether an image with given key is stored in the atlas."""
+        return key in self._areas
+
+    def __len__(self) -> int:
+        """Get the amount of stored images."""
+        return len(self._areas)
+
+    def _place(self, width: int, height: int) -> tuple[int, int]:
+        """Find a free position for an image of given size (including the padding)."""
+        for shelf in self._shelves:
+            y, shelf_height, used = shelf
+            if height <= shelf_height and used + width <= self.width:
+                shelf[2] += width
+                return used, y
+
+        y = self._shelves[-1][0] + self._shelves[-1][1] if self._shelves else 0
+        if y + height > self.height or width > self.width:
+            raise ValueError(f"Texture atlas ({self.width}x{self.height}) is full, can't add an image of {width}x{height}")
+        self._shelves.append([y, height, width])
+        return 0, y
+
+    def add(self, key: Hashable, image: pygame.Surface) -> pygame.Rect:
+        """Copy given image into the atlas, returning its area within the atlas surface."""
+        if key in self._areas:
+            raise ValueError(f"Image {key!r} is already stored in the atlas")
+
+        width, height = image.get_size()
+        x, y = self._place(width + self.padding, height + self.padding)
+        area = pygame.Rect(x, y, width, height)
+        # The area is still fully transparent, taking the maximum copies the pixels (including alpha) as they are
+        self.surface.blit(image, area, special_flags=pygame.BLEND_RGBA_MAX)
+        self._areas[key] = area
+        return area
+
+    def area(self, key: Hashable) -> pygame.Rect:
+        """Get the area of the image with given key, within the atlas surface."""
+        return self._areas[key]
+
+    def image(self, key: Hashable) -> pygame.Surface:
+        """Get the image with given key, as a subsurface of the atlas (sharing its pixels)."""
+        return self.surface.subsurface(self._areas[key])
+
+
+class SpriteBatch:
+    """
+    Collect everything which should be drawn during a frame and draw it all at once.
+
+    Instead of blitting every sprite right away (with a separate `Surface.blit` call
+    each), sprites are queued with `draw` (or `draw_bodies`) and drawn by `flush`,
+    which sends all of them to pygame in a single `Surface.blits` call. Sprites are
+    drawn ordered by their layer (lower layers first), in the order they were queued
+    within a layer.
+
+    Sprite images can be surfaces, or keys of images stored in the `atlas`.
+    When a `dirty_rects` tracker is given, all of the drawn areas are reported to it.
+    """
+
+    def __init__(self, atlas: Optional[TextureAtlas] = None, dirty_rects: Optional[DirtyRectTracker] = None):
+        self.atlas = atlas
+        self.dirty_rects = dirty_rects
+        self._layers: dict[int, list[tuple]] = {}
+
+    def __len__(self) -> int:
+        """Get the amount of queued sprites."""
+        return sum(len(sprites) for sprites in self._layers.values())
+
+    def _queue(self, layer: int) -> list[tuple]:
+        """Get the list of queued sprites of given layer."""
+        sprites = self._layers.get(layer)
+        if sprites is None:
+            sprites = self._layers[layer] = []
+        return sprites
+
+    def _resolve(self, source: SpriteSource) -> tuple[pygame.Surface, Optional[pygame.Rect]]:
+        """Get the source surface and the area within it for given sprite image."""
+        if isinstance(source, pygame.Surface):
+            return source, None
+        if self.atlas is None:
+            raise ValueError(f"Sprite {source!r} isn't a surface and there is no texture atlas to look it up in")
+        return self.atlas.surface, self.atlas.area(source)
+
+    def draw(self, source: SpriteSource, position: tuple[float, float], layer: int = 0) -> None:
+        """Queue given sprite image to be drawn at given position."""
+        surface, area = self._resolve(source)
+        if area is None:
+            self._queue(layer).append((surface, position))
+        else:
+            self._queue(layer).append((surface, position, area))
+
+    def draw_bodies(self, bodies: Iterable["RectBody"]) -> None:
+        """Queue the sprites of all given bodies (see `RectBody.sprite`), drawn at their positions."""
+        resolved: dict[SpriteSource, tuple[pygame.Surface, Optional[pygame.Rect]]] = {}
+        layer = None
+        sprites: list[tuple] = []
+
+        for body in bodies:
+            source = body.sprite
+            entry = resolved.get(source)
+            if entry is None:
+                entry = resolved[source] = self._resolve(source)
+            if body.layer != layer:
+                layer = body.layer
+                sprites = self._queue(layer)
+
+            # Descriptors store the values in the instance dict, reading them from there skips the Python level getter
+            state = body.__dict__
+            surface, area = entry
+            if area is None:
+                sprites.append((surface, (state["x"], state["y"])))
+            else:
+                sprites.append((surface, (state["x"], state["y"]), area))
+
+    def clear(self) -> None:
+        """Drop all of the queued sprites."""
+        self._layers.clear()
+
+    def flush(self, target: pygame.Surface) -> None:
+        """Draw all of the queued sprites onto the `target` surface and empty the queue."""
+        if not self._layers:
+            return
+
+        if len(self._layers) == 1:
+            sprites = next(iter(self._layers.values()))
+        else:
+            sprites = [sprite for layer in sorted(self._layers) for sprite in self._layers[layer]]
+        self._layers = {}
+
+        if self.dirty_rects is not None:
+            self.dirty_rects.add_all(target.blits(sprites))
+        else:
+            target.blits(sprites, doreturn=False)
@@ -0,0 +1,57 @@
+import os
+import time
+from typing import Optional
+
+from src.util.log import get_logger
+
+
+def _process_start() -> Optional[float]:
+    """
+    Get the time when this process was started, in the `time.perf_counter` timescale.
+
+    This is only supported on Linux (using procfs), `None` is returned elsewhere.
+    """
+    try:
+        with open("/proc/self/stat", encoding="utf8") as file:
+            # Process name (2nd field) can contain spaces, the start time is 20th field after it
+            start_ticks = int(file.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="utf8") as file:
+            uptime = float(file.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return time.perf_counter() - (uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+_marks: dict[str, float] = {}
+_reported = False
+
+_start = _process_start()
+if _start is not None:
+    _marks["process start"] = _start
+
+
+def mark(name: str) -> None:
+    """Record the time at which given startup step was reached, only the first mark of each name is kept."""
+    if name not in _marks:
+        _marks[name] = time.perf_counter()
+
+
+def timings() -> list[tuple[str, float]]:
+    """Get the recorded startup steps with the time (in seconds) since the first recorded step."""
+    if not _marks:
+        return []
+    start = min(_marks.values())
+    return sorted(((name, timestamp - start) for name, timestamp in _marks.items()), key=lambda item: item[1])
+
+
+def report() -> None:
+    """Log the startup timings (only the first call does anything)."""
+    global _reported
+    if _reported:
+        return
+    _reported = True
+
+    steps = ", ".join(f"{name} +{elapsed * 1000:.1f}ms" for name, elapsed in timings())
+    # Logger is only obtained here, since this module is imported before logging is set up
+    get_logger(__name__).debug(f"Startup timings: {steps}")
@@ -0,0 +1,317 @@
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+from typing import Any, Optional, TYPE_CHECKING
+
+import pygame
+from pygame.event import EventType  # type: ignore (see: https://github.com/pygame/pygame/issues/2867)
+
+from src.config import Window
+from src.util.input import InputState
+from src.util.log import get_logger
+
+if TYPE_CHECKING:
+    from src.util.base_game import BaseGame
+
+log = get_logger(__name__)
+
+
+class TickWorkerError(Exception):
+    """Raised on the main thread when the ticks running in a worker process failed."""
+
+
+class SnapshotBuffer:
+    """
+    Double buffer of game state snapshots.
+
+    The simulation builds each new snapshot on its own (back buffer) and only
+    publishes it once it's complete, by swapping a single reference, which is
+    atomic. The renderer therefore always sees the latest complete snapshot,
+    without any locking, and never a partially updated one.
+    """
+
+    def __init__(self):
+        self._front: Any = None
+        self.version = 0
+
+    def publish(self, snapshot: Any) -> None:
+        """Make given (complete) snapshot the latest one."""
+        self._front = snapshot
+        self.version += 1
+
+    @property
+    def latest(self) -> Any:
+        """Get the latest complete snapshot (`None` if nothing was published yet)."""
+        return self._front
+
+
+def run_ticks(game: "BaseGame", events: Any, publish: Any, stop: Any) -> None:
+    """
+    Run ticks of given game at `Window.tick_rate`, until it stops running or `stop` is set.
+
+    This is the simulation loop used by the tick workers: before every tick, all of
+    the forwarded events are handled (and the forwarded input states applied, in the
+    order they were sent) and after it, a new snapshot is published.
+    """
+    tick_duration = 1 / Window.tick_rate
+    game.delta_time = tick_duration
+    next_tick = time.perf_counter()
+
+    while game.running and not stop.is_set():
+        while True:
+            try:
+                event_type, event_dict = events.get_nowait()
+            except queue.Empty:
+                break
+            if event_type is None:
+                # Input state captured by the main process (see `ProcessTickWorker.forward_input`)
+                game.input = event_dict
+                continue
+            game.events.dispatch(pygame.event.Event(event_type, event_dict))
+
+        game._run_tick()
+        publish(game.snapshot())
+
+        next_tick += tick_duration
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif -delay > tick_duration * Window.max_catchup_ticks:
+            # Fell too far behind, drop the missed ticks instead of trying to catch up
+            next_tick = time.perf_counter()
+
+
+class TickWorker(ABC):
+    """Base class for running the ticks of a game outside of the main (rendering) loop."""
+
+    def __init__(self, game: "BaseGame"):
+        self.game = game
+        self.snapshots = SnapshotBuffer()
+        # Exception raised by the ticks, re-raised on the main thread by `stop`
+        self.error: Optional[Exception] = None
+
+    @property
+    def latest_snapshot(self) -> Any:
+        """Get the latest complete snapshot published by the simulation."""
+        return self.snapshots.latest
+
+    @abstractmethod
+    def start(self) -> None:
+        """Start running the ticks."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop running the ticks and wait for the worker to finish, re-raising the exception of the ticks (if any)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def forward_event(self, event: EventType) -> None:
+        """Pass given event to the simulation, it's handled before the next tick."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def forward_input(self, input_state: InputState) -> None:
+        """Pass the input state of the current frame to the simulation, it's used from the next tick."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def poll(self) -> bool:
+        """Receive any updates from the worker, returns whether the worker is still running."""
+        raise NotImplementedError
+
+
+class ThreadTickWorker(TickWorker):
+    """
+    Run the ticks on a worker thread, sharing the game object with the main thread.
+
+    This keeps the frame pacing stable whenever the ticks spend time outside of
+    Python code (I/O, sleeping, C extensions releasing the GIL), pure Python logic
+    still competes with the rendering for the GIL, use `ProcessTickWorker` for that.
+    """
+
+    def __init__(self, game: "BaseGame"):
+        super().__init__(game)
+        self._events: "queue.SimpleQueue[tuple[Optional[int], Any]]" = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tick-worker", daemon=True)
+
+    def _run(self) -> None:
+        """Run the ticks, keeping the exception which stopped them for the main thread."""
+        try:
+            run_ticks(self.game, self._events, self.snapshots.publish, self._stop)
+        except Exception as exc:
+            self.error = exc
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker thread, re-raising the exception which stopped the ticks (if any)."""
+        self._stop.set()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def forward_event(self, event: EventType) -> None:
+        """Pass given event to the worker thread."""
+        self._events.put((event.type, event.dict))
+
+    def forward_input(self, input_state: InputState) -> None:
+        """The game object is shared, the worker thread already sees the new `game.input`."""
+        return None
+
+    def poll(self) -> bool:
+        """The game object is shared, only check that the thread is still running."""
+        return self._thread.is_alive()
+
+
+class _ProcessStopped:
+    """Message sent by the worker process once it stops."""
+
+    def __init__(self, running: bool, ended: bool, tick_count: int, error: Optional[str] = None):
+        self.running = running
+        self.ended = ended
+        self.tick_count = tick_count
+        # Formatted traceback, if the ticks failed
+        self.error = error
+
+
+def _run_process(game: "BaseGame", events: Any, snapshots: Any, stop: Any) -> None:
+    """Run the ticks in the worker process, reporting the final state of the game (and the failure, if any) at the end."""
+    # Threads of the parent aren't forked along, the queue logging is reset by `src.util.log` itself
+    game.assets.reset_after_fork()
+    error = None
+    try:
+        run_ticks(game, events, snapshots.put, stop)
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        snapshots.put(_ProcessStopped(game.running, game.ended, game.tick_count, error))
+
+
+class ProcessTickWorker(TickWorker):
+    """
+    Run the ticks in a worker process, which is forked from the main one.
+
+    The worker process gets its own copy of the game object (so `tick` and
+    the event handlers only change the state in the worker), only the snapshots
+    are sent back to the main process, which means they have to be picklable.
+    This avoids the GIL completely, making it a good fit for CPU heavy pure
+    Python logic. Since the game object is inherited by forking, this is only
+    available on platforms supporting the "fork" start method.
+
+    Only the forking thread exists in the worker process. The threads of the main
+    process which the game relies on are replaced there: logging is done directly
+    by the handlers (instead of through the queue listener thread, see
+    `src.util.log`) and assets are no longer preloaded in the background (the
+    preloading thread pool is recreated by the next `AssetManager.preload`).
+    """
+
+    def __init__(self, game: "BaseGame"):
+        super().__init__(game)
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            raise RuntimeError("Running ticks in a process requires the 'fork' start method, which isn't available here.")
+
+        self._events = context.Queue()
+        self._snapshots = context.Queue()
+        self._stop = context.Event()
+        self._process = context.Process(
+            target=_run_process,
+            args=(game, self._events, self._snapshots, self._stop),
+            name="tick-worker",
+            daemon=True,
+        )
+        self._stopped = False
+        # Keys, mouse position and mouse buttons of the last forwarded input state
+        self._last_input: Optional[tuple] = None
+
+    def start(self) -> None:
+        """Fork the worker process."""
+        # Output buffered (f.e. by the logging thread) but not yet written would be written by both of the processes
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self._process.start()
+
+    def stop(self) -> None:
+        """
+        Stop the worker process, collecting the final state of the game.
+
+        If the ticks failed (or the process died), `TickWorkerError` is raised, holding
+        the traceback from the worker process.
+        """
+        self._stop.set()
+        while not self._stopped:
+            self._receive(block=True)
+        self._process.join()
+        # Nothing reads the messages forwarded after the worker stopped, don't wait for them to be sent on exit
+        self._events.cancel_join_thread()
+        self._events.close()
+        if self.error is not None:
+            raise self.error
+
+    def forward_event(self, event: EventType) -> None:
+        """Send given event to the worker process."""
+        self._events.put((event.type, event.dict))
+
+    def forward_input(self, input_state: InputState) -> None:
+        """
+        Send given input state to the worker process, along with the events (marked by `None` event type).
+
+        The state is only sent when it differs from the last one, the frames are usually
+        rendered much more often than the ticks run and the input rarely changes.
+        """
+        state = (input_state.keys, input_state.mouse_position, input_state.mouse_buttons)
+        if state == self._last_input:
+            return
+        self._last_input = state
+        self._events.put((None, input_state))
+
+    def _receive(self, block: bool = False) -> None:
+        """Receive all available messages from the worker process, only keeping the latest snapshot."""
+        while not self._stopped:
+            try:
+                message = self._snapshots.get(block=block, timeout=1 if block else None)
+            except queue.Empty:
+                if block and not self._process.is_alive():
+                    self.error = TickWorkerError(f"Tick worker process died unexpectedly (exit code {self._process.exitcode}).")
+                    self._stopped = True
+                return
+
+            if isinstance(message, _ProcessStopped):
+                self._stopped = True
+                if message.error is not None:
+                    self.error = TickWorkerError(f"Ticks failed in the tick worker process:\n{message.error}")
+                self.game.tick_count = message.tick_count
+                self.game.ended = self.game.ended or message.ended
+                self.game.running = self.game.running and message.running
+            else:
+                self.snapshots.publish(message)
+            block = False
+
+    def poll(self) -> bool:
+        """Receive the new snapshots (and the final state, if the worker stopped)."""
+        self._receive()
+        return not self._stopped
+
+
+TICK_WORKERS: dict[str, type[TickWorker]] = {
+    "thread": ThreadTickWorker,
+    "process": ProcessTickWorker,
+}
+
+
+def make_tick_worker(kind: str, game: "BaseGame") -> TickWorker:
+    """Create a tick worker of given kind ("thread" or "process")."""
+    try:
+        worker_cls = TICK_WORKERS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown tick worker: {kind}, expected one of: {', '.join(TICK_WORKERS)}")
+    return worker_cls(game)